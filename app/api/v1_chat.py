@@ -1,6 +1,9 @@
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 import subprocess, sys, os
 from pathlib import Path
+from app.core.deps import get_chat_service
+from app.models.chat import ChatRequest, ChatResponse
+from app.services.chat_service import ChatService
 
 router = APIRouter(prefix="/problems", tags=["problems"])
 ROOT = Path(__file__).resolve().parents[2]
@@ -12,3 +15,13 @@ def run_pipeline(background_tasks: BackgroundTasks):
                        cwd=str(ROOT), env={**os.environ, "PYTHONPATH": str(ROOT)}, check=False)
     background_tasks.add_task(_task)
     return {"status": "started"}
+
+chat_router = APIRouter(prefix="/api/v1/chat", tags=["Chat"])
+
+@chat_router.post("", response_model=ChatResponse)
+async def chat(req: ChatRequest, svc: ChatService = Depends(get_chat_service)):
+    # async: 동일 질문을 기다리는 요청은 스레드풀을 점유하지 않음(업스트림 호출만 스레드에서)
+    try:
+        return ChatResponse(reply=await svc.areply(req.messages, persona=req.persona))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail={"code": "LLM_UPSTREAM_ERROR", "message": str(e)})
@@ -1,15 +1,32 @@
 # app/api/v1_db_health.py
 from fastapi import APIRouter
+from app.core.admission import run_priority
 from app.db.mongo import _client  # MongoClient 인스턴스
+from app.core.metrics import db_timer
 # _client가 아니라 get_db()만 있다면: from app.db.mongo import get_db as _get_db
 
 router = APIRouter(prefix="/api/health", tags=["health"])
 
+# 헬스체크는 우선 차선(전용 스레드)에서 → LLM 요청이 기본 스레드풀을 다 써도 바로 응답
+def _mongo_ping() -> bool:
+    # 클라이언트 핑이 가장 확실
+    with db_timer("mongo", "ping"):
+        return _client.admin.command("ping").get("ok", 0) == 1
+
+def _neo4j_ping() -> bool:
+    from app.db import neo4j  # Neo4j 설정이 없는 환경에서도 앱 기동은 가능하도록 지연 import
+    return neo4j.ping()
+
 @router.get("/mongo")
-def mongo_health():
+async def mongo_health():
+    try:
+        return {"ok": await run_priority(_mongo_ping)}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+@router.get("/neo4j")
+async def neo4j_health():
     try:
-        # 클라이언트 핑이 가장 확실
-        ok = _client.admin.command("ping").get("ok", 0) == 1
-        return {"ok": ok}
+        return {"ok": await run_priority(_neo4j_ping)}
     except Exception as e:
         return {"ok": False, "error": str(e)}
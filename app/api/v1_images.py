@@ -0,0 +1,47 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from app.core.deps import get_image_store
+from app.services.images import OPT_SUBDIR, ImageStore, pick_variant
+
+router = APIRouter(prefix="/api/v1/images", tags=["Images"])
+
+# 내용 해시가 파일명에 든 변형(opt/<stem>.<hash>.<w>w.webp)은 영구 캐시,
+# 원본 이름으로 요청해 변형을 고른 응답은 원본이 바뀔 수 있으므로 짧게 캐시 + ETag 재검증
+IMMUTABLE = "public, max-age=31536000, immutable"
+NEGOTIATED = "public, max-age=3600"
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+@router.get("/{name:path}")
+def get_image(
+    name: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=4096, description="표시 폭(px). 이 이상인 가장 작은 변형"),
+    store: ImageStore = Depends(get_image_store),
+):
+    headers = {}
+    entry = store.manifest().get(name)
+    if entry is not None:
+        # Accept(image/webp) / ?w= 로 변형 선택
+        v = pick_variant(entry, w, request.headers.get("accept", ""))
+        if v is not None:
+            name = f"{OPT_SUBDIR}/{v['file']}"
+            headers["Vary"] = "Accept"
+    path = store.resolve(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail={
+            "code": "IMAGE_NOT_FOUND",
+            "message": f"image not found: {name}"
+        })
+    etag = store.content_etag(path)
+    headers["ETag"] = etag
+    headers["Cache-Control"] = IMMUTABLE if "Vary" not in headers and store.immutable(path) else NEGOTIATED
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    # FileResponse: Range / If-Range(같은 ETag) 처리, 스레드풀에서 청크 전송
+    return FileResponse(path, headers=headers)
@@ -1,7 +1,62 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.core.deps import get_learning_path_service, get_problem_repository, verify_service_token
+from app.models.learning_path import AnswerBatch
+from app.services.learning_path import LearningPathService
+from app.services.mastery_store import MasteryConflict
+from app.services.problem_repository import ProblemRepository
 
 router = APIRouter(prefix="/api/v1/learning-path", tags=["LearningPath"])
 
 @router.get("/ping")
 def ping():
     return {"learning_path": "pong"}
+
+@router.get("/recommend")
+def recommend(target: str, student_id: Optional[str] = None,
+              svc: LearningPathService = Depends(get_learning_path_service)):
+    path = svc.recommend(target, student_id=student_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail={
+            "code": "CONCEPT_NOT_FOUND",
+            "message": f"unknown concept: {target}"
+        })
+    return {"target": target, "path": path}
+
+@router.post("/answers", dependencies=[Depends(verify_service_token)])
+def record_answers(batch: AnswerBatch,
+                   svc: LearningPathService = Depends(get_learning_path_service),
+                   repo: ProblemRepository = Depends(get_problem_repository)):
+    """풀이 결과 배치 → 숙달도 갱신. concept 이 없으면 problem_id 의 curriculum.소단원 사용."""
+    missing = [a.problem_id for a in batch.answers if not a.concept and a.problem_id]
+    tags = repo.concepts_for(missing) if missing else {}
+    events, unknown = [], []
+    for a in batch.answers:
+        concept = a.concept or tags.get(a.problem_id or "")
+        if concept:
+            events.append((a.student_id, concept, a.correct))
+        else:
+            unknown.append(a.problem_id)
+    try:
+        result = svc.record_answers(events)
+    except MasteryConflict as e:
+        raise HTTPException(status_code=409, detail={
+            "code": "MASTERY_CONFLICT",
+            "message": str(e)
+        })
+    return {**result, "unknown_problems": sorted(set(filter(None, unknown)))}
+
+@router.get("/students/{student_id}/next")
+def next_concepts(student_id: str, k: int = Query(5, ge=1, le=50),
+                  svc: LearningPathService = Depends(get_learning_path_service)):
+    return {"student_id": student_id, "next": svc.next_concepts(student_id, k)}
+
+@router.get("/students/{student_id}/mastery")
+def student_mastery(student_id: str, svc: LearningPathService = Depends(get_learning_path_service)):
+    mastery = svc.mastery(student_id)
+    if mastery is None:
+        raise HTTPException(status_code=404, detail={
+            "code": "STUDENT_NOT_FOUND",
+            "message": f"no answers recorded for student: {student_id}"
+        })
+    return {"student_id": student_id, "mastery": mastery}
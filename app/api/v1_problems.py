@@ -1,7 +1,75 @@
-from fastapi import APIRouter
+from typing import Literal, Optional
+from pydantic import ValidationError
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.core.deps import get_cached_problem_repository, get_problem_repository, verify_service_token
+from app.core.metrics import PROBLEM_SCHEMA_SKIPS
+from app.models.problem import ProblemPage, ProblemSummary, StoredProblem
+from app.services.problem_cache import CachedProblemRepository
+from app.services.problem_repository import InvalidCursor, MAX_LIMIT, ProblemRepository
 
 router = APIRouter(prefix="/api/v1/problems", tags=["Problems"])
 
 @router.get("/ping")
 def ping():
     return {"problems": "pong"}
+
+def _page(repo: ProblemRepository, view: str, **kw) -> ProblemPage:
+    summary = view == "summary"
+    try:
+        docs, next_cursor = repo.list(summary=summary, **kw)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail={"code": "INVALID_CURSOR", "message": str(e)})
+    model = ProblemSummary if summary else StoredProblem
+    items = []
+    for d in docs:
+        # 스키마가 어긋난 문서 하나 때문에 페이지 전체가 500 이 되지 않도록 건너뛰고 /metrics 에 집계
+        try:
+            items.append(model.model_validate(d))
+        except ValidationError:
+            PROBLEM_SCHEMA_SKIPS.inc(view=view)
+    return ProblemPage(items=items, next_cursor=next_cursor)
+
+@router.get("", response_model=ProblemPage, response_model_exclude_none=True)
+def list_problems(
+    major_unit: Optional[str] = Query(None, description="curriculum.대단원"),
+    minor_unit: Optional[str] = Query(None, description="curriculum.소단원"),
+    grade: Optional[str] = Query(None, description="curriculum.학년"),
+    difficulty: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(20, ge=1, le=MAX_LIMIT),
+    view: Literal["summary", "full"] = "summary",
+    repo: ProblemRepository = Depends(get_problem_repository),
+):
+    return _page(repo, view, major_unit=major_unit, minor_unit=minor_unit, grade=grade,
+                 difficulty=difficulty, cursor=cursor, limit=limit)
+
+@router.get("/generated", response_model=ProblemPage, response_model_exclude_none=True)
+def list_generated(
+    origin_problem_id: Optional[str] = None,
+    major_unit: Optional[str] = Query(None, description="curriculum.대단원"),
+    minor_unit: Optional[str] = Query(None, description="curriculum.소단원"),
+    grade: Optional[str] = Query(None, description="curriculum.학년"),
+    difficulty: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(20, ge=1, le=MAX_LIMIT),
+    view: Literal["summary", "full"] = "summary",
+    repo: ProblemRepository = Depends(get_problem_repository),
+):
+    return _page(repo, view, generated=True, origin_problem_id=origin_problem_id,
+                 major_unit=major_unit, minor_unit=minor_unit, grade=grade,
+                 difficulty=difficulty, cursor=cursor, limit=limit)
+
+@router.get("/cache/stats", dependencies=[Depends(verify_service_token)])
+def cache_stats(repo: CachedProblemRepository = Depends(get_cached_problem_repository)):
+    return repo.cache.stats()
+
+@router.get("/{problem_id}", response_model=StoredProblem)
+def get_problem(problem_id: str, repo: CachedProblemRepository = Depends(get_cached_problem_repository)):
+    # 캐시에 직렬화된 bytes를 그대로 응답 → 히트 시 Pydantic/JSON 인코딩 생략
+    body = repo.get_json(problem_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail={
+            "code": "PROBLEM_NOT_FOUND",
+            "message": f"problem not found: {problem_id}"
+        })
+    return Response(content=body, media_type="application/json")
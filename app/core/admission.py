@@ -0,0 +1,159 @@
+# app/core/admission.py
+"""
+LLM 라우트 입장 제어(admission control) + 과부하 시 즉시 거절(load shedding).
+- 라우트별 동시 처리 한도 + 길이 제한 대기열. 한도를 넘는 요청은 대기열에서 순서대로 기다린다.
+- 대기열이 가득 찼거나, 예상 대기 시간(평균 처리 시간 × 앞선 대기 수 / 한도)이 요청 기한을 넘으면
+  기다리지 않고 503 + Retry-After. 기한 안에 차례가 오지 않아도 503.
+  기한 = min(ADMISSION_MAX_WAIT, X-Request-Timeout 헤더(초)) — 호출 측(Express)이 남은 시간을 넘길 수 있음.
+- 우선 차선: 한도가 없는 라우트(헬스체크, 문제 조회 등)는 이 미들웨어를 그냥 통과하고,
+  LLM 라우트 한도 합계를 스레드풀보다 작게 잡아 조회용 스레드를 남긴다.
+  DB 헬스체크는 run_priority() 로 별도 소형 스레드 풀에서 돌아 기본 풀이 꽉 차도 막히지 않는다.
+대기열은 워커(이벤트 루프)별 상태다.
+"""
+from __future__ import annotations
+import asyncio, json, math, time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+import anyio
+import anyio.to_thread
+
+from app.core.metrics import ADMISSION_REQUESTS, ADMISSION_WAIT
+
+T = TypeVar("T")
+
+class Shed(Exception):
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.reason = reason            # "queue_full" | "deadline" | "timeout"
+        self.retry_after = retry_after
+
+class RouteLimiter:
+    def __init__(self, route: str, limit: int, queue: int, initial_service_time: float = 1.0) -> None:
+        self.route = route
+        self.limit = max(1, limit)
+        self.queue = max(0, queue)
+        self.active = 0
+        self.service_time = initial_service_time   # 처리 시간 지수이동평균(초)
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w.done())
+
+    def expected_wait(self, ahead: int) -> float:
+        """앞에 ahead 명이 기다릴 때 차례가 올 때까지의 예상 시간."""
+        return self.service_time * (ahead // self.limit + 1)
+
+    async def acquire(self, timeout: float) -> None:
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            return
+        ahead = self.waiting
+        if ahead >= self.queue:
+            raise Shed("queue_full", self.expected_wait(ahead))
+        est = self.expected_wait(ahead)
+        if est > timeout:
+            raise Shed("deadline", est)
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if fut.done() and not fut.cancelled():
+                self.release()        # 슬롯을 넘겨받은 직후 포기 → 다음 대기자에게
+            else:
+                fut.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                raise Shed("timeout", self.expected_wait(self.waiting)) from None
+            raise
+
+    def release(self, elapsed: Optional[float] = None) -> None:
+        if elapsed is not None:
+            self.service_time = 0.8 * self.service_time + 0.2 * elapsed
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)  # 슬롯을 그대로 넘김(active 유지)
+                return
+        self.active -= 1
+
+class AdmissionMiddleware:
+    """순수 ASGI 미들웨어. limits: {경로: 동시 처리 한도}, queues: {경로: 대기열 길이}."""
+
+    def __init__(self, app, limits: Dict[str, int], queues: Optional[Dict[str, int]] = None,
+                 default_queue: int = 0, max_wait: float = 10.0) -> None:
+        self.app = app
+        self.max_wait = max_wait
+        queues = queues or {}
+        self.limiters: Dict[str, RouteLimiter] = {
+            path.rstrip("/") or "/": RouteLimiter(path, n, queues.get(path, default_queue))
+            for path, n in limits.items() if n > 0
+        }
+
+    def match(self, path: str) -> Optional[RouteLimiter]:
+        # 정확히 일치하거나 하위 경로(/api/v1/chat/...)
+        path = path.rstrip("/") or "/"
+        while True:
+            lim = self.limiters.get(path)
+            if lim is not None or path in ("", "/"):
+                return lim
+            path = path.rsplit("/", 1)[0] or "/"
+
+    def deadline(self, scope) -> float:
+        for k, v in scope.get("headers") or ():
+            if k == b"x-request-timeout":
+                try:
+                    return max(0.0, min(self.max_wait, float(v)))
+                except ValueError:
+                    break
+        return self.max_wait
+
+    async def __call__(self, scope, receive, send):
+        lim = self.match(scope["path"]) if scope["type"] == "http" else None
+        if lim is None:
+            return await self.app(scope, receive, send)
+        t0 = time.perf_counter()
+        try:
+            await lim.acquire(self.deadline(scope))
+        except Shed as e:
+            ADMISSION_REQUESTS.inc(route=lim.route, outcome=e.reason)
+            return await self._reject(send, lim, e)
+        ADMISSION_WAIT.observe(time.perf_counter() - t0, route=lim.route)
+        ADMISSION_REQUESTS.inc(route=lim.route, outcome="admitted")
+        t1 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lim.release(time.perf_counter() - t1)
+
+    @staticmethod
+    async def _reject(send, lim: RouteLimiter, e: Shed) -> None:
+        body = json.dumps({"detail": {
+            "code": "OVERLOADED",
+            "message": f"{lim.route} is busy ({e.reason}); retry later",
+        }}).encode("utf-8")
+        await send({"type": "http.response.start", "status": 503, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(e.retry_after))).encode()),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+
+# ==================== 우선 차선(헬스체크 전용 스레드) ====================
+_priority: Optional[anyio.CapacityLimiter] = None
+_priority_threads = 4
+
+def configure(threadpool: int, priority_threads: int) -> None:
+    """기동 시(이벤트 루프 안) 호출: 기본 스레드풀 크기와 우선 차선 스레드 수 설정."""
+    global _priority, _priority_threads
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool
+    _priority_threads = priority_threads
+    _priority = anyio.CapacityLimiter(priority_threads)
+
+async def run_priority(fn: Callable[..., T], *args) -> T:
+    """기본 스레드풀과 별개의 소형 풀에서 동기 함수 실행(LLM 요청이 풀을 다 써도 대기하지 않음)."""
+    global _priority
+    if _priority is None:
+        _priority = anyio.CapacityLimiter(_priority_threads)
+    return await anyio.to_thread.run_sync(fn, *args, limiter=_priority)
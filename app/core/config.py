@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
@@ -12,6 +12,28 @@ class Settings(BaseSettings):
     AURA_URI: Optional[str] = None
     AURA_USER: Optional[str] = None
     AURA_PASS: Optional[str] = None
+    # 문제 단건 조회 캐시(프로세스 내 LRU)
+    PROBLEM_CACHE_MAX_ITEMS: int = 2048
+    PROBLEM_CACHE_MAX_BYTES: Optional[int] = 64 * 1024 * 1024
+    PROBLEM_CACHE_TTL: Optional[float] = None  # 초. None이면 버전 스탬프로만 무효화
+    PROBLEM_CACHE_VERSION_CHECK: float = 5.0   # 버전 스탬프 확인 주기(초)
+    # 프로파일링: True면 모든 요청, 아니면 ?profile=1 + X-Service-Token 요청만
+    PROFILE_REQUESTS: bool = False
+    PROFILE_SAMPLE_INTERVAL: float = 0.002     # 샘플링 간격(초)
+    # 교육과정 그래프 스냅샷(scripts/build_graph_snapshot.py). None이면 out/graph/curriculum_graph.snap
+    GRAPH_SNAPSHOT_PATH: Optional[str] = None
+    GRAPH_SNAPSHOT_CHECK: float = 5.0          # 파일 교체 확인 주기(초)
+    # 입장 제어(app/core/admission.py): 경로별 동시 처리 한도/대기열 길이. 환경변수는 JSON
+    # 예: ADMISSION_LIMITS='{"/api/v1/chat": 24}'. 한도 합계는 THREADPOOL_SIZE 보다 충분히 작게(조회용 여유)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: Dict[str, int] = {"/api/v1/chat": 24, "/problems/pipeline/run": 1}
+    ADMISSION_QUEUES: Dict[str, int] = {"/api/v1/chat": 48}
+    ADMISSION_DEFAULT_QUEUE: int = 0          # ADMISSION_QUEUES 에 없는 경로(파이프라인: 실행 중이면 바로 503)
+    ADMISSION_MAX_WAIT: float = 10.0          # 대기 기한(초). X-Request-Timeout 헤더가 더 짧으면 그 값
+    THREADPOOL_SIZE: int = 40                 # sync 엔드포인트용 anyio 스레드풀
+    PRIORITY_THREADS: int = 4                 # 헬스체크 전용 스레드
+    # 문제 그림(out/images, 변형은 out/images/opt). None이면 기본 경로
+    IMAGE_DIR: Optional[str] = None
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 settings = Settings()
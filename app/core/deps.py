@@ -2,9 +2,16 @@
 from functools import lru_cache
 from fastapi import Header, HTTPException
 from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.core.profiling import SamplingProfiler
 from app.services.chat_service import ChatService
 from app.services.ai_generator import AIGenerator
 from app.services.learning_path import LearningPathService
+from app.services.mastery_store import MasteryStore
+from app.services.problem_repository import ProblemRepository
+from app.services.problem_cache import CachedProblemRepository, ProblemCache
+from app.services.graph_snapshot import DEFAULT_PATH as GRAPH_SNAPSHOT_DEFAULT, SnapshotHandle
+from app.services.images import IMAGE_DIR, ImageStore
 
 def verify_service_token(x_service_token: str = Header(default="")) -> str:
     if x_service_token != settings.SERVICE_TOKEN:
@@ -22,6 +29,39 @@ def get_chat_service() -> ChatService:
 def get_ai_generator() -> AIGenerator:
     return AIGenerator(model=settings.MODEL_PROBLEM, api_key=settings.OPENAI_API_KEY, temperature=settings.TEMPERATURE)
 
+@lru_cache(maxsize=1)
+def get_graph_snapshot() -> SnapshotHandle:
+    return SnapshotHandle(settings.GRAPH_SNAPSHOT_PATH or GRAPH_SNAPSHOT_DEFAULT,
+                          check_interval=settings.GRAPH_SNAPSHOT_CHECK)
+
 @lru_cache(maxsize=1)
 def get_learning_path_service() -> LearningPathService:
-    return LearningPathService(model=settings.MODEL_LP, api_key=settings.OPENAI_API_KEY, temperature=settings.TEMPERATURE)
+    from app.db import mongo
+    return LearningPathService(model=settings.MODEL_LP, api_key=settings.OPENAI_API_KEY, temperature=settings.TEMPERATURE,
+                               graph=get_graph_snapshot(),
+                               store=MasteryStore(mongo.student_mastery, mongo.meta))
+
+@lru_cache(maxsize=1)
+def get_profiler() -> SamplingProfiler:
+    return SamplingProfiler(settings.PROFILE_SAMPLE_INTERVAL)
+
+@lru_cache(maxsize=1)
+def get_image_store() -> ImageStore:
+    return ImageStore(settings.IMAGE_DIR or IMAGE_DIR)
+
+@lru_cache(maxsize=1)
+def get_problem_repository() -> ProblemRepository:
+    from app.db import mongo  # import 시 Mongo 연결 설정 → 실제 사용 시점까지 지연
+    return ProblemRepository(problems=mongo.problems, generated=mongo.generated)
+
+@lru_cache(maxsize=1)
+def get_cached_problem_repository() -> CachedProblemRepository:
+    from app.db import mongo
+    cache = ProblemCache(max_items=settings.PROBLEM_CACHE_MAX_ITEMS,
+                         max_bytes=settings.PROBLEM_CACHE_MAX_BYTES,
+                         ttl=settings.PROBLEM_CACHE_TTL)
+    REGISTRY.gauge("problem_cache", "Problem cache counters (hits, misses, hit_rate, ...)", ("stat",),
+                   fn=lambda: {(k,): v for k, v in cache.stats().items()})
+    return CachedProblemRepository(get_problem_repository(), cache,
+                                   version_fn=mongo.problems_version,
+                                   version_check_interval=settings.PROBLEM_CACHE_VERSION_CHECK)
@@ -0,0 +1,247 @@
+# app/core/metrics.py
+"""
+의존성 없는 Prometheus 텍스트 포맷(0.0.4) 메트릭.
+- API: main.py 미들웨어가 라우트별 지연시간을 기록하고 /metrics 로 노출
+- 스크립트: METRICS_DUMP_PATH 환경변수가 있으면 종료 시 스냅샷(JSON)을 남김 → pipeline_all 리포트에 합쳐짐
+"""
+from __future__ import annotations
+import atexit, bisect, json, os, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+
+LabelKey = Tuple[str, ...]
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *a, **kw) -> None:
+        super().__init__(*a, **kw)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}" for k, v in items
+        ]
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [{"labels": dict(zip(self.labelnames, k)), "value": v}
+                    for k, v in sorted(self._values.items())]
+
+class Gauge(Counter):
+    """set/inc 가능한 값. fn을 주면 수집 시점에 fn()이 {라벨튜플: 값}을 돌려준다."""
+    kind = "gauge"
+
+    def __init__(self, *a, fn: Optional[Callable[[], Dict[LabelKey, float]]] = None, **kw) -> None:
+        super().__init__(*a, **kw)
+        self._fn = fn
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _collect(self) -> None:
+        if self._fn is None:
+            return
+        try:
+            values = self._fn()
+        except Exception:
+            return
+        with self._lock:
+            self._values = dict(values)
+
+    def render(self) -> List[str]:
+        self._collect()
+        return super().render()
+
+    def snapshot(self) -> List[dict]:
+        self._collect()
+        return super().snapshot()
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *a, buckets: Sequence[float] = DEFAULT_BUCKETS, **kw) -> None:
+        super().__init__(*a, **kw)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            if idx < len(self.buckets):
+                row[idx] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = self.header()
+        for key, row in items:
+            acc = 0.0
+            for b, c in zip(self.buckets, row):
+                acc += c
+                le = 'le="' + _fmt_value(b) + '"'
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {_fmt_value(acc)}")
+            inf = _fmt_labels(self.labelnames, key, 'le="+Inf"')
+            out.append(f"{self.name}_bucket{inf} {_fmt_value(row[-1])}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labelnames, key)} {_fmt_value(row[-2])}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labelnames, key)} {_fmt_value(row[-1])}")
+        return out
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [{"labels": dict(zip(self.labelnames, k)), "count": int(v[-1]), "sum": v[-2]}
+                    for k, v in sorted(self._values.items())]
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, m: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(m.name)
+            if existing is not None:
+                return existing  # 모듈 재임포트 등으로 중복 선언돼도 같은 인스턴스 사용
+            self._metrics[m.name] = m
+            return m
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help, tuple(labelnames)))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = (), fn=None) -> Gauge:
+        return self._register(Gauge(name, help, tuple(labelnames), fn=fn))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, tuple(labelnames), buckets=buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in list(self._metrics.values()):
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, dict]:
+        """관측값이 있는 메트릭만 {이름: {type, samples}} 로."""
+        out = {}
+        for name, m in list(self._metrics.items()):
+            samples = m.snapshot()
+            if samples:
+                out[name] = {"type": m.kind, "samples": samples}
+        return out
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ==================== 공용 메트릭 ====================
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "FastAPI request latency by route template",
+    ("method", "route", "status"))
+LLM_LATENCY = REGISTRY.histogram(
+    "llm_request_duration_seconds", "OpenAI chat completion latency per attempt",
+    ("model", "outcome"), buckets=SLOW_BUCKETS)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total", "OpenAI tokens used", ("model", "kind"))
+LLM_RETRIES = REGISTRY.counter(
+    "llm_retries_total", "OpenAI call retries after a failed attempt", ("model",))
+ADMISSION_REQUESTS = REGISTRY.counter(
+    "admission_requests_total", "Limited-route requests by outcome (admitted/queue_full/deadline/timeout)",
+    ("route", "outcome"))
+ADMISSION_WAIT = REGISTRY.histogram(
+    "admission_wait_seconds", "Time an admitted request waited for a concurrency slot", ("route",))
+SINGLEFLIGHT_REQUESTS = REGISTRY.counter(
+    "singleflight_requests_total", "Calls through a single-flight group (leader = upstream call, coalesced = shared)",
+    ("group", "role"))
+MATHPIX_POLL = REGISTRY.histogram(
+    "mathpix_poll_duration_seconds", "Mathpix status request latency", ("status",))
+MATHPIX_WAIT = REGISTRY.histogram(
+    "mathpix_conversion_wait_seconds", "Time from submit to completed/error", ("outcome",),
+    buckets=SLOW_BUCKETS)
+DB_LATENCY = REGISTRY.histogram(
+    "db_operation_duration_seconds", "Mongo/Neo4j operation latency", ("backend", "operation"))
+CURRICULUM_LABELS = REGISTRY.counter(
+    "curriculum_label_total", "Converted problems by curriculum label source (prefilled/llm/corrected/rejected)",
+    ("source",))
+PROBLEM_SCHEMA_SKIPS = REGISTRY.counter(
+    "problem_schema_skipped_total", "Stored problem documents dropped from list pages by schema mismatch",
+    ("view",))
+
+def db_timer(backend: str, operation: str):
+    return DB_LATENCY.time(backend=backend, operation=operation)
+
+# ==================== 스크립트용 스냅샷 ====================
+def dump_snapshot(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(REGISTRY.snapshot(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+def _dump_at_exit() -> None:
+    target = os.getenv("METRICS_DUMP_PATH")
+    if target:
+        try:
+            dump_snapshot(Path(target))
+        except Exception:
+            pass
+
+atexit.register(_dump_at_exit)
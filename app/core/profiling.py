@@ -0,0 +1,229 @@
+# app/core/profiling.py
+"""
+온디맨드 프로파일링.
+- API: ?profile=1 (+ X-Service-Token) 또는 PROFILE_REQUESTS=1 이면 해당 요청을 처리하는 스레드만 샘플링해
+  out/profiles/*.speedscope.json 으로 저장(https://www.speedscope.app 에서 열기). 샘플러 스레드는 프로세스에 하나.
+- 파이프라인: PIPELINE_PROFILE=1 이면 각 단계를 `python -m cProfile -o out/profiles/*.prof` 로 실행
+  (python -m pstats / snakeviz 로 열기)
+비활성 시에는 미들웨어의 조건 검사 한 번 외 비용 없음.
+"""
+from __future__ import annotations
+import asyncio, contextvars, functools, json, os, sys, threading, time, weakref
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import anyio.to_thread
+
+ROOT = Path(__file__).resolve().parents[2]
+PROFILE_DIR = ROOT / "out" / "profiles"
+
+def profile_path(name: str, suffix: str) -> Path:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name).strip("_") or "profile"
+    return PROFILE_DIR / f"{safe}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}{suffix}"
+
+# ==================== 샘플링 프로파일러(요청용) ====================
+# 미들웨어가 세션을 컨텍스트 변수에 넣고, 스레드풀로 넘기는 작업은 감싼 runner 가 실행 동안
+# 스레드 id → 세션을 등록한다(샘플러 스레드는 다른 스레드의 컨텍스트를 읽을 수 없음)
+_SESSION: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar("profile_session", default=None)
+_THREAD_SESSION: Dict[int, "ProfileSession"] = {}
+
+Stack = Tuple[Tuple[str, str, int], ...]
+
+def _stack(frame) -> Stack:
+    out: List[Tuple[str, str, int]] = []
+    while frame is not None:
+        code = frame.f_code
+        out.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    out.reverse()
+    return tuple(out)
+
+def _run_bound(session: "ProfileSession", func: Callable, *args):
+    """스레드풀 워커에서 실행: 작업이 끝날 때까지 이 스레드를 세션에 묶는다."""
+    tid = threading.get_ident()
+    _THREAD_SESSION[tid] = session
+    try:
+        return func(*args)
+    finally:
+        _THREAD_SESSION.pop(tid, None)
+
+def _install_threadpool_hook() -> None:
+    """
+    anyio.to_thread.run_sync 를 감싼다. starlette/FastAPI(run_in_threadpool, sync 엔드포인트/의존성)와
+    admission.run_priority 는 호출 때마다 이 속성을 찾으므로 모두 지나간다.
+    """
+    run_sync = anyio.to_thread.run_sync
+    if getattr(run_sync, "_profiling", False):
+        return
+
+    @functools.wraps(run_sync)
+    async def profiled_run_sync(func, *args, **kw):
+        session = _SESSION.get()
+        if session is not None:
+            func = functools.partial(_run_bound, session, func)
+        return await run_sync(func, *args, **kw)
+
+    profiled_run_sync._profiling = True
+    anyio.to_thread.run_sync = profiled_run_sync
+
+# 이벤트 루프 쪽: 태스크 → 세션. 3.11 의 Task 는 컨텍스트를 밖에서 읽을 수 없어,
+# 태스크가 만들어지는 순간(세션 컨텍스트 안이면) 기록해 둔다
+_TASK_SESSION: "weakref.WeakKeyDictionary[asyncio.Task, ProfileSession]" = weakref.WeakKeyDictionary()
+
+def _install_task_factory(loop: asyncio.AbstractEventLoop) -> None:
+    prev = loop.get_task_factory()
+    if getattr(prev, "_profiling", False):
+        return
+
+    def factory(loop, coro, **kw):
+        task = prev(loop, coro, **kw) if prev is not None else asyncio.Task(coro, loop=loop, **kw)
+        ctx = kw.get("context")
+        session = ctx.get(_SESSION) if ctx is not None else _SESSION.get()
+        if session is not None:
+            _TASK_SESSION[task] = session
+        return task
+
+    factory._profiling = True
+    loop.set_task_factory(factory)
+
+class ProfileSession:
+    """요청 하나의 샘플. 그 요청의 컨텍스트를 실행 중인 스레드의 스택만 모인다."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, loop_thread: int) -> None:
+        self.loop = loop
+        self.loop_thread = loop_thread
+        self._stacks: Dict[int, Counter] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._started = time.perf_counter()
+        self.duration = 0.0
+
+    def add(self, tid: int, name: str, stack: Stack, weight: float) -> None:
+        self._stacks.setdefault(tid, Counter())[stack] += weight
+        self._thread_names[tid] = name
+
+    def to_speedscope(self, name: str) -> dict:
+        frames: List[dict] = []
+        index: Dict[Tuple[str, str, int], int] = {}
+        profiles = []
+        for tid, stacks in self._stacks.items():
+            samples, weights = [], []
+            for stack, seconds in stacks.most_common():
+                ids = []
+                for fr in stack:
+                    i = index.get(fr)
+                    if i is None:
+                        i = index[fr] = len(frames)
+                        frames.append({"name": fr[0], "file": fr[1], "line": fr[2]})
+                    ids.append(i)
+                samples.append(ids)
+                weights.append(seconds)
+            profiles.append({
+                "type": "sampled",
+                "name": f"{name} [{self._thread_names.get(tid, tid)}]",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "app.core.profiling",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def save(self, name: str) -> Path:
+        path = profile_path(name, ".speedscope.json")
+        path.write_text(json.dumps(self.to_speedscope(name)), encoding="utf-8")
+        return path
+
+class SamplingProfiler:
+    """
+    프로세스에 하나인 샘플러. 프로파일 중인 요청(세션)이 있을 때만 별도 스레드가 interval 마다
+    sys._current_frames() 를 훑는다. 스택은 그 순간 세션의 컨텍스트를 실행 중인 스레드에만 기록:
+    - 이벤트 루프 스레드: 현재 실행 중인 asyncio 태스크가 세션 안에서 만들어졌는지
+    - 스레드풀 워커: 세션 안에서 넘긴 작업을 실행 중인지(sync 엔드포인트/의존성은 여기서 돈다 → cProfile 로는 안 잡힘)
+    다른 요청을 처리 중이거나 유휴(작업 대기, 루프 select 대기)인 스레드는 건너뛴다.
+    """
+
+    def __init__(self, interval: float = 0.002) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._sessions: Set[ProfileSession] = set()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self) -> Tuple[ProfileSession, contextvars.Token]:
+        """이벤트 루프(미들웨어)에서 호출. 이후 이 컨텍스트에서 만든 태스크/스레드 작업이 세션에 묶인다."""
+        loop = asyncio.get_running_loop()
+        _install_task_factory(loop)
+        _install_threadpool_hook()
+        session = ProfileSession(loop, threading.get_ident())
+        token = _SESSION.set(session)
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+            self._wake.set()
+        return session, token
+
+    def end(self, session: ProfileSession, token: contextvars.Token) -> None:
+        _SESSION.reset(token)
+        session.duration = time.perf_counter() - session._started
+        with self._lock:
+            self._sessions.discard(session)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        last = time.perf_counter()
+        while True:
+            with self._lock:
+                if not self._sessions:
+                    self._wake.clear()
+                sessions = list(self._sessions)
+            if not sessions:
+                # 세션이 없으면 다음 begin() 까지 대기(일정 시간 없으면 스레드 종료)
+                if not self._wake.wait(30.0):
+                    with self._lock:
+                        if not self._sessions:
+                            self._thread = None
+                            return
+                last = time.perf_counter()
+                continue
+            time.sleep(self.interval)
+            # GIL 경합으로 간격이 interval 보다 길어질 수 있어 실제 경과 시간으로 가중
+            now = time.perf_counter()
+            self.sample(sessions, min(now - last, 10 * self.interval), me)
+            last = now
+
+    def sample(self, sessions: List[ProfileSession], weight: float, skip: Optional[int] = None) -> None:
+        frames = sys._current_frames()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        by_loop: Dict[int, List[ProfileSession]] = {}
+        for s in sessions:
+            by_loop.setdefault(s.loop_thread, []).append(s)
+        for tid, frame in frames.items():
+            if tid == skip:
+                continue
+            if tid in by_loop:
+                task = asyncio.current_task(by_loop[tid][0].loop)
+                session = _TASK_SESSION.get(task) if task is not None else None
+            else:
+                session = _THREAD_SESSION.get(tid)
+            if session is not None and session in sessions:
+                session.add(tid, names.get(tid, str(tid)), _stack(frame), weight)
+
+# ==================== cProfile(파이프라인 단계용) ====================
+def pipeline_profile_enabled() -> bool:
+    return os.getenv("PIPELINE_PROFILE", "0") == "1"
+
+def cprofile_cmd(python: str, stage: str, args: List[str]) -> List[str]:
+    """[python, *args] 를 cProfile 로 감싼 명령. args 는 ['script.py', ...] 또는 ['-m', 'pkg.mod', ...]."""
+    out = profile_path(f"pipeline-{stage}", ".prof")
+    return [python, "-m", "cProfile", "-o", str(out), *args]
@@ -0,0 +1,94 @@
+# app/core/singleflight.py
+"""
+동일 요청 합치기(single-flight).
+같은 키로 이미 진행 중인 호출이 있으면 새로 시작하지 않고 그 결과(또는 예외)를 함께 받는다.
+- do():       스레드풀(sync 엔드포인트)에서 호출 — 후속 호출자는 결과가 나올 때까지 블록
+- do_async(): 이벤트 루프에서 호출 — 후속 호출자는 await 로 대기(스레드를 점유하지 않음)
+두 방식이 같은 진행 중 표를 공유하므로 sync/async 호출자끼리도 합쳐진다.
+결과는 캐시하지 않는다: 호출이 끝나면 키를 지우고, 이후 요청은 다시 업스트림으로 간다.
+"""
+from __future__ import annotations
+import asyncio, hashlib, json, re, threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple, TypeVar
+
+from app.core.metrics import SINGLEFLIGHT_REQUESTS
+
+T = TypeVar("T")
+
+def normalize_prompt(text: str) -> str:
+    """공백/줄바꿈 차이만 있는 프롬프트를 같은 것으로 본다."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+def prompt_key(model: str, *parts: Any) -> str:
+    """(모델, 프롬프트 구성 요소...) → 고정 길이 키. 문자열은 normalize_prompt 적용."""
+    def norm(x):
+        if isinstance(x, str):
+            return normalize_prompt(x)
+        if isinstance(x, (list, tuple)):
+            return [norm(v) for v in x]
+        if isinstance(x, dict):
+            return {k: norm(v) for k, v in x.items()}
+        return x
+    raw = json.dumps([model, norm(list(parts))], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class SingleFlight:
+    def __init__(self, group: str) -> None:
+        self.group = group   # 메트릭 라벨(예: "chat", "generate")
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Set[asyncio.Task] = set()   # do_async 리더 작업(GC 방지)
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """(진행 중 Future, 내가 리더인지)."""
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                SINGLEFLIGHT_REQUESTS.inc(group=self.group, role="coalesced")
+                return fut, False
+            fut = self._calls[key] = Future()
+            SINGLEFLIGHT_REQUESTS.inc(group=self.group, role="leader")
+            return fut, True
+
+    def _finish(self, key: Hashable, fut: Future, result: Any = None, exc: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        fut, leader = self._join(key)
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                self._finish(key, fut, exc=e)
+                raise
+            self._finish(key, fut, result)
+        return fut.result()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        fut, leader = self._join(key)
+        if leader:
+            async def run():
+                try:
+                    result = await fn()
+                except BaseException as e:
+                    self._finish(key, fut, exc=e)
+                else:
+                    self._finish(key, fut, result)
+            # 리더 요청이 취소(클라이언트 연결 끊김)돼도 후속 대기자를 위해 업스트림 호출은 끝까지
+            task = asyncio.ensure_future(run())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        waiter = asyncio.wrap_future(fut)
+        # 대기자가 취소돼도 결과 Future 는 그대로(shield), 버려진 예외 경고는 막는다
+        waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return await asyncio.shield(waiter)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -2,7 +2,7 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-from pymongo import MongoClient, ASCENDING
+from pymongo import MongoClient, ASCENDING, ReturnDocument
 
 # 프로젝트 루트(AI/.env) 로드
 ROOT = Path(__file__).resolve().parents[2]
@@ -18,11 +18,52 @@ db = _client.get_default_database()  # URI에 DB명이 들어있으면 자동 
 # 컬렉션 핸들
 problems = db["problems"]
 generated = db["generated_problems"]
+meta = db["meta"]  # 데이터 버전 스탬프 등
+student_mastery = db["student_mastery"]  # 학생별 개념 숙달도(MasteryStore, _id = student_id)
 
-# 인덱스(없으면 생성)
-problems.create_index([("problem_id", ASCENDING)], unique=True, name="u_problem_id")
-generated.create_index([("origin_problem_id", ASCENDING), ("problem_id", ASCENDING)],
-                       unique=True, name="u_origin_problem")
+PROBLEMS_VERSION_ID = "problems_version"
+
+# 목록 조회(키셋 페이지네이션: _id 오름차순)용 복합 인덱스. 등호 조건 필드 → _id 순서
+# - 필터 하나: 해당 단일 필드 인덱스
+# - 네 필터 모두(학년+대단원+소단원+난이도): ix_curriculum_difficulty_id 로 정렬까지 인덱스에서 끝남
+# - 그 밖의 조합: 가장 선택적인 단일 필드 인덱스를 _id 순서로 훑고 나머지 조건은 문서에서 거름
+#   (정렬은 여전히 인덱스 순서라 메모리 정렬 없음, 다만 걸러지는 만큼 더 읽음)
+LIST_INDEXES = [
+    ([("curriculum.대단원", ASCENDING), ("_id", ASCENDING)], "ix_major_unit_id"),
+    ([("curriculum.소단원", ASCENDING), ("_id", ASCENDING)], "ix_minor_unit_id"),
+    ([("curriculum.학년", ASCENDING), ("_id", ASCENDING)], "ix_grade_id"),
+    ([("difficulty", ASCENDING), ("_id", ASCENDING)], "ix_difficulty_id"),
+    ([("curriculum.학년", ASCENDING), ("curriculum.대단원", ASCENDING), ("curriculum.소단원", ASCENDING),
+      ("difficulty", ASCENDING), ("_id", ASCENDING)], "ix_curriculum_difficulty_id"),
+]
+
+def ensure_indexes() -> None:
+    """인덱스(없으면 생성). 앱 startup / load_to_mongo 에서 호출."""
+    problems.create_index([("problem_id", ASCENDING)], unique=True, name="u_problem_id")
+    # 생성문항은 (origin_problem_id, problem_id) 조합으로 유니크
+    generated.create_index([("origin_problem_id", ASCENDING), ("problem_id", ASCENDING)],
+                           unique=True, name="u_origin_problem")
+    generated.create_index([("origin_problem_id", ASCENDING), ("_id", ASCENDING)],
+                           name="ix_origin_id")
+    # 단건 조회(ProblemRepository.get)의 변형 문제 폴백: problem_id 만으로 찾음
+    generated.create_index([("problem_id", ASCENDING)], name="ix_problem_id")
+    for coll in (problems, generated):
+        for keys, name in LIST_INDEXES:
+            coll.create_index(keys, name=name)
+
+def problems_version() -> int:
+    """load_to_mongo 실행마다 증가하는 문제 데이터 버전(캐시 무효화용)."""
+    doc = meta.find_one({"_id": PROBLEMS_VERSION_ID}, {"version": 1})
+    return int(doc["version"]) if doc else 0
+
+def bump_problems_version() -> int:
+    doc = meta.find_one_and_update(
+        {"_id": PROBLEMS_VERSION_ID},
+        {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return int(doc["version"])
 
 def ping() -> bool:
     # 1이면 OK
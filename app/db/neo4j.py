@@ -1,14 +1,27 @@
 import os
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
+from app.core.metrics import db_timer
 
 load_dotenv()
 URI  = os.getenv("AURA_URI")
 USER = os.getenv("AURA_USER")
 PASS = os.getenv("AURA_PASS")
 
-driver = GraphDatabase.driver(URI, auth=(USER, PASS))  # TLS 자동
+_driver = None
 
-def run_cypher(query: str, params=None):
-    with driver.session() as s:
+def get_driver():
+    # 첫 사용 시 생성(import 만으로 연결 설정을 요구하지 않도록)
+    global _driver
+    if _driver is None:
+        _driver = GraphDatabase.driver(URI, auth=(USER, PASS))  # TLS 자동
+    return _driver
+
+def ping() -> bool:
+    with db_timer("neo4j", "verify_connectivity"):
+        get_driver().verify_connectivity()
+    return True
+
+def run_cypher(query: str, params=None, operation: str = "run_cypher"):
+    with db_timer("neo4j", operation), get_driver().session() as s:
         return s.run(query, params or {}).data()
\ No newline at end of file
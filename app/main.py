@@ -1,9 +1,18 @@
-from fastapi import FastAPI
-from app.api.v1_chat import router as chat_router
+import time
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from app.api.v1_chat import router as chat_router, chat_router as chat_reply_router
 from app.api.v1_problems import router as problems_router
 from app.api.v1_learning_path import router as lp_router
 from app.api.v1_db_health import router as health_router
+from app.api.v1_images import router as images_router
 from app.db import mongo
+from app.core import admission
+from app.core.config import settings
+from app.core.deps import get_graph_snapshot, get_profiler, verify_service_token
+from app.core.metrics import CONTENT_TYPE, HTTP_LATENCY, REGISTRY
+from app.core.profiling import ROOT
 
 app = FastAPI(
     title="nerdmath",
@@ -13,19 +22,77 @@ app = FastAPI(
 
 # 기능별 라우터 등록
 app.include_router(chat_router)
+app.include_router(chat_reply_router)
 app.include_router(problems_router)
 app.include_router(lp_router)
 app.include_router(health_router)
+app.include_router(images_router)
+
+# LLM 라우트 입장 제어(가장 안쪽 미들웨어 → 거절된 요청도 아래 지연시간/프로파일에 집계)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(admission.AdmissionMiddleware, limits=settings.ADMISSION_LIMITS,
+                       queues=settings.ADMISSION_QUEUES, default_queue=settings.ADMISSION_DEFAULT_QUEUE,
+                       max_wait=settings.ADMISSION_MAX_WAIT)
+
+# 라우트별 지연시간(경로 템플릿 기준 → /api/v1/problems/{problem_id} 하나로 집계)
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_LATENCY.observe(time.perf_counter() - t0, method=request.method,
+                             route=getattr(route, "path", "<unmatched>"), status=str(status))
+
+# 온디맨드 프로파일링: ?profile=1 (서비스 토큰 필요) 또는 PROFILE_REQUESTS=1
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    on_demand = request.query_params.get("profile") == "1"
+    if not (on_demand or settings.PROFILE_REQUESTS):
+        return await call_next(request)
+    if on_demand:
+        try:
+            verify_service_token(request.headers.get("x-service-token", ""))
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+    # 공유 샘플러에 이 요청을 세션으로 등록 → 이 요청을 처리하는 스레드의 스택만 모임
+    profiler = get_profiler()
+    session, token = profiler.begin()
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.end(session, token)
+    path = await run_in_threadpool(session.save, f"{request.method}{request.url.path.replace('/', '_')}")
+    response.headers["X-Profile-Path"] = path.relative_to(ROOT).as_posix()
+    return response
+
+# /metrics, /health 는 async(스레드풀을 쓰지 않음) → 풀이 포화돼도 바로 응답
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
 
 # 헬스체크
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
+@app.on_event("startup")
+async def configure_threads():
+    admission.configure(settings.THREADPOOL_SIZE, settings.PRIORITY_THREADS)
+
 @app.on_event("startup")
 def on_startup():
     try:
         mongo.ensure_indexes()
-        print("✅ Mongo indexes ensured")
+        print("[OK] Mongo indexes ensured")
+    except Exception as e:
+        print("[WARN] Mongo ensure_indexes failed:", e)
+    try:
+        snap = get_graph_snapshot().get()  # mmap(없으면 CSV 에서 생성)
+        print(f"[OK] Graph snapshot v{snap.version} ({snap.n_nodes} concepts, {snap.n_edges} edges)")
     except Exception as e:
-        print("⚠️ Mongo ensure_indexes failed:", e)
\ No newline at end of file
+        print("[WARN] Graph snapshot load failed:", e)
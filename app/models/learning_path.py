@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class AnswerEvent(BaseModel):
+    student_id: str
+    problem_id: str | None = None   # problems/generated_problems 의 curriculum.소단원 으로 개념 결정
+    concept: str | None = None      # 또는 개념 전체 이름/코드 직접 지정(우선)
+    correct: bool
+
+class AnswerBatch(BaseModel):
+    answers: List[AnswerEvent] = Field(..., max_length=100_000)
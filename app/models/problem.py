@@ -0,0 +1,92 @@
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from typing import Any, Iterable, List, Literal, Optional, Tuple, Type, TypeVar, Union
+
+# ai_transformer.SCHEMA_TEXT 의 변환 문항 스키마를 그대로 옮긴 모델.
+# 한글 키(대단원/소단원/학년)는 alias로 유지 → model_dump(by_alias=True) 시 원래 JSON 형태.
+
+AnswerLabel = Literal["A", "B", "C", "D"]
+# curriculum 라벨 출처: llm(LLM 선택, 실제 개념 확인) / prefilled·corrected(로컬 분류기) / verified(사람 검수)
+CurriculumSource = Literal["llm", "prefilled", "corrected", "verified"]
+
+class Choices(BaseModel):
+    A: str
+    B: str
+    C: str
+    D: str
+
+class Curriculum(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    major_unit: str = Field(..., alias="대단원")
+    minor_unit: str = Field(..., alias="소단원")
+    grade: str = Field(..., alias="학년")
+
+class ConvertedProblem(BaseModel):
+    """ai_transformer 출력(= out/converted_with_schema.json 한 문항)."""
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
+    problem_id: str
+    korean_problem: str
+    english_problem: str
+    korean_solution: str
+    english_solution: str
+    choices: Choices
+    answer: AnswerLabel
+    curriculum: Curriculum
+    difficulty: str
+    curriculum_source: Optional[CurriculumSource] = None  # LLM 출력이 아니라 transform_problem 이 채움
+
+class StoredProblem(ConvertedProblem):
+    """Mongo(problems / generated_problems)에 적재된 문서. API 응답에도 사용."""
+    type: Literal["original", "generated"] = "original"
+    origin_problem_id: Optional[str] = None
+    source_file: Optional[str] = None
+    created_at: Optional[str] = None
+
+class ProblemSummary(BaseModel):
+    """목록 조회용 요약(해설 제외)."""
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
+    problem_id: str
+    type: Literal["original", "generated"] = "original"
+    origin_problem_id: Optional[str] = None
+    korean_problem: Optional[str] = None
+    curriculum: Optional[Curriculum] = None
+    difficulty: Optional[str] = None
+
+class ProblemPage(BaseModel):
+    items: List[Union[StoredProblem, ProblemSummary]]
+    next_cursor: Optional[str] = None  # None이면 마지막 페이지
+
+# ==================== 대량 검증 ====================
+M = TypeVar("M", bound=BaseModel)
+
+_list_adapters: dict = {}
+
+def _list_adapter(model: Type[M]) -> TypeAdapter:
+    ta = _list_adapters.get(model)
+    if ta is None:
+        ta = _list_adapters[model] = TypeAdapter(List[model])
+    return ta
+
+def validate_many(items: Iterable[Any], model: Type[M] = ConvertedProblem
+                  ) -> Tuple[List[M], List[Tuple[int, ValidationError]]]:
+    """리스트 전체를 한 번에 검증(빠른 경로). 실패가 섞여 있으면 문항별로 다시 검증해
+    (유효 문항 목록, [(index, 에러)]) 로 나눠 돌려준다."""
+    items = list(items)
+    try:
+        return _list_adapter(model).validate_python(items), []
+    except ValidationError:
+        pass
+    ok: List[M] = []
+    bad: List[Tuple[int, ValidationError]] = []
+    for i, it in enumerate(items):
+        try:
+            ok.append(model.model_validate(it))
+        except ValidationError as e:
+            bad.append((i, e))
+    return ok, bad
+
+def dump_many(problems: Iterable[BaseModel]) -> List[dict]:
+    """JSON/Mongo 저장용 dict 목록(한글 alias 키 유지)."""
+    return [p.model_dump(by_alias=True, exclude_none=True) for p in problems]
@@ -1,12 +1,18 @@
 # app/services/ai_generator.py
 
 from __future__ import annotations
+import time
 from typing import Optional, Dict, Any
+from openai import OpenAI
+from starlette.concurrency import run_in_threadpool
+
+from app.core.metrics import LLM_LATENCY, LLM_TOKENS
+from app.core.singleflight import SingleFlight, prompt_key
 
 class AIGenerator:
     """
-    간단한 스텁(placeholder) 구현.
-    실제 모델 호출(OpenAI 등)은 나중에 generate() 내부를 교체하면 됩니다.
+    프롬프트 → 텍스트 생성(OpenAI chat completion 한 번).
+    같은 (모델, 정규화된 프롬프트, 샘플링 설정) 요청이 동시에 들어오면 업스트림 호출 하나를 공유한다.
     """
 
     def __init__(
@@ -20,17 +26,55 @@ class AIGenerator:
         self.api_key = api_key
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self._client: Optional[OpenAI] = None
+        self.flight = SingleFlight("generate")
 
-    def generate(self, prompt: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """
-        실제론 LLM 호출로 바꿔야 하는 자리.
-        현재는 입력을 그대로 되돌려주는 더미 응답을 반환합니다.
-        """
+    @property
+    def client(self) -> OpenAI:
+        # ChatService 와 같이 첫 호출 시 생성
+        if self._client is None:
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
+
+    @client.setter
+    def client(self, value: OpenAI) -> None:
+        self._client = value
+
+    def _complete(self, prompt: str) -> str:
+        t0 = time.perf_counter()
+        try:
+            resp = self.client.chat.completions.create(
+                model=self.model,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
+        except Exception:
+            LLM_LATENCY.observe(time.perf_counter() - t0, model=self.model, outcome="error")
+            raise
+        LLM_LATENCY.observe(time.perf_counter() - t0, model=self.model, outcome="ok")
+        if resp.usage is not None:
+            LLM_TOKENS.inc(resp.usage.prompt_tokens, model=self.model, kind="prompt")
+            LLM_TOKENS.inc(resp.usage.completion_tokens, model=self.model, kind="completion")
+        return resp.choices[0].message.content or ""
+
+    def _key(self, prompt: str) -> str:
+        return prompt_key(self.model, self.temperature, self.max_tokens, prompt)
+
+    def _result(self, output: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # 공유된 결과라도 응답 dict 와 metadata 는 호출자별로 따로
         return {
             "model": self.model,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
-            "prompt_echo": prompt,
             "metadata": metadata or {},
-            "output": f"[stub] generated text for: {prompt[:50]}...",
+            "output": output,
         }
+
+    def generate(self, prompt: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        output = self.flight.do(self._key(prompt), lambda: self._complete(prompt))
+        return self._result(output, metadata)
+
+    async def agenerate(self, prompt: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        output = await self.flight.do_async(self._key(prompt), lambda: run_in_threadpool(self._complete, prompt))
+        return self._result(output, metadata)
@@ -4,6 +4,11 @@ from typing import Optional
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from app.models.problem import ConvertedProblem
+from app.services import curriculum
+from app.services.curriculum_classifier import Prediction, get_classifier
+from app.core.metrics import CURRICULUM_LABELS, LLM_LATENCY, LLM_RETRIES, LLM_TOKENS
+
 # ==================== 경로/환경 ====================
 THIS = Path(__file__).resolve()     # .../app/services/ai_transformer.py
 ROOT = THIS.parents[2]              # 프로젝트 루트
@@ -29,8 +34,14 @@ MAX_RETRY   = 2
 # 디버그 모드: 원문(raw) 백업 파일 생성 여부 (기본 OFF)
 DEBUG_RAW = os.getenv("AI_TRANSFORMER_DEBUG_RAW", "0") == "1"
 
+# 프롬프트에 넣을 교육과정 후보 수(문항과 어휘가 비슷한 상위 k개). 0이면 전체 목록
+CURRICULUM_TOP_K = int(os.getenv("AI_TRANSFORMER_CURRICULUM_TOP_K", "12"))
+# 로컬 분류기가 확신하면 교육과정을 미리 채우고 프롬프트에서 목록을 뺀다(기본 ON)
+PREFILL_CURRICULUM = os.getenv("AI_TRANSFORMER_PREFILL_CURRICULUM", "1") == "1"
+
 # ==================== 커리큘럼/스키마 ====================
-CURRICULUM_TEXT = r"""(여기에 한국 중학교 수학 교육과정 리스트를 붙여넣으세요)"""
+# data/neo4j_nodes.csv 기반. 문항별로는 curriculum_text()가 후보만 골라 넣는다
+CURRICULUM_TEXT = "[한국 전체 교육과정]\n" + curriculum.format_concepts(curriculum.load_concepts())
 SCHEMA_TEXT = r"""
 [출력 JSON 스키마]
 {
@@ -54,7 +65,18 @@ def clean_text(s: str) -> str:
     s = re.sub(r"\s{2,}", " ", s).strip()
     return s
 
-def build_prompt(item: dict) -> tuple[str, str]:
+def curriculum_text(item: dict, top_k: Optional[int] = None,
+                    fixed: Optional[curriculum.Concept] = None) -> str:
+    if fixed is not None:
+        return "[교육과정(확정) - curriculum 에 그대로 사용]\n" + json.dumps(fixed.curriculum, ensure_ascii=False)
+    k = CURRICULUM_TOP_K if top_k is None else top_k
+    concepts = curriculum.candidates(item, k)
+    if len(concepts) >= len(curriculum.get_index().concepts):
+        return CURRICULUM_TEXT
+    return "[한국 교육과정 후보]\n" + curriculum.format_concepts(concepts)
+
+def build_prompt(item: dict, top_k: Optional[int] = None,
+                 fixed: Optional[curriculum.Concept] = None) -> tuple[str, str]:
     problem_id    = clean_text(item.get("problem_id", ""))
     question_text = clean_text(item.get("question_text", ""))
     choices       = {k: clean_text(v) for k, v in (item.get("choices") or {}).items()}
@@ -74,7 +96,7 @@ def build_prompt(item: dict) -> tuple[str, str]:
 - 문제 배경이 학생들이 일상에서 접할 수 있는 상황이어야 함
 - 실생활 예시가 없으면 변형이 완료되지 않은 것으로 간주
 - 보기 4개 유지(A~D), 숫자 표기 일관
-- 아래 제공된 '한국 전체 교육과정'에서만 대단원/소단원/학년을 선택
+- 아래 제공된 교육과정 목록에서만 대단원/소단원/학년을 선택(표기 그대로, 예: "3. 함수" / "3.5 일차함수의 뜻과 그래프" / "2학년")
 - 출력은 반드시 JSON만
 
 [문항 ID] {problem_id}
@@ -92,7 +114,7 @@ D. {choices.get('D','')}
 [해설(있으면)]: {rationale_src}
 [난이도 힌트(있으면)]: {difficulty_src}
 
-{CURRICULUM_TEXT}
+{curriculum_text(item, top_k, fixed)}
 
 {SCHEMA_TEXT}
 """
@@ -108,6 +130,10 @@ def call_chat_json(
 ) -> dict:
     last_err: Optional[Exception] = None
     for attempt in range(max_retry + 1):
+        if attempt:
+            LLM_RETRIES.inc(model=model)
+        t0 = time.perf_counter()
+        resp = None
         try:
             resp = client.chat.completions.create(
                 model=model,
@@ -118,30 +144,59 @@ def call_chat_json(
                 ],
                 response_format={"type": "json_object"},  # JSON 모드
             )
+            LLM_LATENCY.observe(time.perf_counter() - t0, model=model, outcome="ok")
+            if resp.usage is not None:
+                LLM_TOKENS.inc(resp.usage.prompt_tokens, model=model, kind="prompt")
+                LLM_TOKENS.inc(resp.usage.completion_tokens, model=model, kind="completion")
             content = resp.choices[0].message.content
             if raw_dump_path and DEBUG_RAW:
                 raw_dump_path.write_text(content, encoding="utf-8")  # 원문 백업(디버그 ON일 때만)
             return json.loads(content)
         except Exception as e:
+            if resp is None:  # API 호출 자체가 실패(타임아웃/HTTP 오류)
+                LLM_LATENCY.observe(time.perf_counter() - t0, model=model, outcome="error")
             last_err = e
             time.sleep(0.8)
     raise last_err or RuntimeError("OpenAI 호출 실패")
 
-def transform_problem(item: dict) -> dict:
-    sys_msg, usr_msg = build_prompt(item)
-    data = call_chat_json(sys_msg, usr_msg)
-    # 필수 키 검증
-    for k in ["problem_id","korean_problem","english_problem","korean_solution",
-              "english_solution","choices","answer","curriculum","difficulty"]:
-        if k not in data:
-            raise ValueError(f"필수 키 누락: {k}")
-    for k in ["A","B","C","D"]:
-        if k not in data["choices"]:
-            raise ValueError("보기 키(A,B,C,D) 누락")
-    for k in ["대단원","소단원","학년"]:
-        if k not in data["curriculum"]:
-            raise ValueError("curriculum 키 누락")
-    return data
+class CurriculumRejected(ValueError):
+    """LLM 라벨이 실제 개념이 아니고 분류기도 확신이 없음 → 이 문항만 건너뜀(배치는 계속)."""
+    def __init__(self, label: dict, pred: Prediction) -> None:
+        super().__init__(f"교육과정 라벨이 실제 개념이 아닙니다(분류기 확신 없음: score={pred.score:.2f}, "
+                         f"margin={pred.margin:.2f}): {label}")
+        self.label = label
+        self.pred = pred
+
+def check_curriculum(label: dict, pred: Prediction) -> tuple[dict, str]:
+    """
+    LLM 라벨을 실제 Concept 표기로 정규화. 개념이 아니면 분류기가 확신할 때만 1순위로 교정,
+    확신이 없으면 추측으로 채우지 않고 CurriculumRejected.
+    """
+    concept = get_classifier().resolve(label)
+    if concept is not None:
+        return concept.curriculum, "llm"
+    if pred.concept is not None and pred.confident:
+        print(f"[warn] 교육과정 라벨이 실제 개념이 아님 → 분류기 결과로 교정: {label} → {pred.concept.name}")
+        return pred.concept.curriculum, "corrected"
+    CURRICULUM_LABELS.inc(source="rejected")
+    raise CurriculumRejected(label, pred)
+
+def transform_problem(item: dict, raw_dump_path: Optional[Path] = None,
+                      pred: Optional[Prediction] = None) -> dict:
+    if pred is None:
+        pred = get_classifier().predict([item])[0]
+    fixed = pred.concept if (PREFILL_CURRICULUM and pred.confident) else None
+    sys_msg, usr_msg = build_prompt(item, fixed=fixed)
+    data = call_chat_json(sys_msg, usr_msg, raw_dump_path=raw_dump_path)
+    # 스키마 검증(필수 키/보기 A~D/정답 라벨/curriculum 키). ValidationError는 ValueError 하위 클래스
+    problem = ConvertedProblem.model_validate(data).model_dump(by_alias=True)
+    if fixed is not None:
+        problem["curriculum"], source = fixed.curriculum, "prefilled"
+    else:
+        problem["curriculum"], source = check_curriculum(problem["curriculum"], pred)
+    CURRICULUM_LABELS.inc(source=source)
+    problem["curriculum_source"] = source  # 분류기 학습에서 자기 출력(prefilled/corrected)을 거르는 데 사용
+    return problem
 
 # ==================== 입력/출력 자동 결정 ====================
 def pick_input_json() -> Path:
@@ -199,19 +254,35 @@ def main():
     items = src if isinstance(src, list) else [src]
 
     err_log  = out_dir / "_error.txt"
+    rejected_path = out_dir / "_rejected.json"
     raw_dump = out_dir / "_last_raw.json" if DEBUG_RAW else None
 
-    results = []
+    results, rejected = [], []
     try:
-        for it in items:
-            data = call_chat_json(*build_prompt(it), raw_dump_path=raw_dump)  # 디버그 ON일 때만 raw 저장
+        preds = get_classifier().predict(items)  # 교육과정 후보는 한 번에 채점
+        for it, pred in zip(items, preds):
+            try:
+                data = transform_problem(it, raw_dump_path=raw_dump, pred=pred)  # 디버그 ON일 때만 raw 저장
+            except CurriculumRejected as e:
+                # 라벨을 확인할 수 없는 문항만 빼고 나머지는 저장(메트릭은 check_curriculum 에서 rejected 로 집계)
+                rejected.append({"problem_id": it.get("problem_id"), "label": e.label,
+                                 "score": round(e.pred.score, 4), "margin": round(e.pred.margin, 4),
+                                 "error": str(e)})
+                print(f"[warn] 교육과정 라벨 거부 → 건너뜀: {it.get('problem_id')}")
+                continue
             results.append(data)
 
         out_path.write_text(
-            json.dumps(results if len(results) > 1 else results[0], ensure_ascii=False, indent=2),
+            json.dumps(results if len(results) != 1 else results[0], ensure_ascii=False, indent=2),
             encoding="utf-8",
         )
-        print(f"[OK] 저장 완료: {out_path}")
+        if rejected:
+            rejected_path.write_text(json.dumps(rejected, ensure_ascii=False, indent=2), encoding="utf-8")
+            err_log.write_text("\n".join(r["error"] for r in rejected), encoding="utf-8")
+            print(f"[warn] 교육과정 라벨 거부 {len(rejected)}건 → {rejected_path}")
+        else:
+            rejected_path.unlink(missing_ok=True)   # 이전 실행의 거부 목록이 남지 않도록
+        print(f"[OK] 저장 완료: {out_path} ({len(results)}건)")
         print("ok")  # 성공 신호
     except Exception as e:
         err_log.write_text(repr(e), encoding="utf-8")
@@ -1,9 +1,67 @@
 # app/services/chat_service.py
+from __future__ import annotations
+import time
+from typing import Dict, List, Optional
+from openai import OpenAI
+from starlette.concurrency import run_in_threadpool
+
+from app.core.metrics import LLM_LATENCY, LLM_TOKENS
+from app.core.singleflight import SingleFlight, prompt_key
+from app.models.chat import ChatMessage
+
+PERSONAS = {
+    "tutor": "당신은 친절한 한국 중학교 수학 선생님입니다. 학생이 스스로 풀 수 있도록 단계별로 설명하세요.",
+    "coach": "당신은 학습 코치입니다. 짧고 격려하는 말투로 다음에 할 일을 안내하세요.",
+}
+
 class ChatService:
-    def __init__(self, model: str, api_key: str, temperature: float = 0.2):
+    def __init__(self, model: str, api_key: Optional[str], temperature: float = 0.2):
         self.model = model
         self.api_key = api_key
         self.temperature = temperature
+        self._client: Optional[OpenAI] = None
+        # 수업 중 같은 문제에 대한 같은 질문이 동시에 몰리면 업스트림 호출 한 번을 나눠 받음
+        self.flight = SingleFlight("chat")
+
+    @property
+    def client(self) -> OpenAI:
+        # 키가 없을 때 import/DI 단계에서 죽지 않도록 첫 호출 시 생성
+        if self._client is None:
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
+
+    @client.setter
+    def client(self, value: OpenAI) -> None:
+        self._client = value
+
+    def _request(self, messages: List[ChatMessage], persona: Optional[str]) -> List[Dict[str, str]]:
+        system = PERSONAS.get(persona or "tutor", PERSONAS["tutor"])
+        return [{"role": "system", "content": system}] + [{"role": m.role, "content": m.content} for m in messages]
+
+    def _complete(self, payload: List[Dict[str, str]]) -> str:
+        t0 = time.perf_counter()
+        try:
+            resp = self.client.chat.completions.create(
+                model=self.model,
+                temperature=self.temperature,
+                messages=payload,
+            )
+        except Exception:
+            LLM_LATENCY.observe(time.perf_counter() - t0, model=self.model, outcome="error")
+            raise
+        LLM_LATENCY.observe(time.perf_counter() - t0, model=self.model, outcome="ok")
+        if resp.usage is not None:
+            LLM_TOKENS.inc(resp.usage.prompt_tokens, model=self.model, kind="prompt")
+            LLM_TOKENS.inc(resp.usage.completion_tokens, model=self.model, kind="completion")
+        return resp.choices[0].message.content or ""
+
+    def reply(self, messages: List[ChatMessage], persona: Optional[str] = "tutor") -> str:
+        payload = self._request(messages, persona)
+        key = prompt_key(self.model, self.temperature, payload)
+        return self.flight.do(key, lambda: self._complete(payload))
 
-    def reply(self, messages):
-        ...
+    async def areply(self, messages: List[ChatMessage], persona: Optional[str] = "tutor") -> str:
+        """reply() 의 async 버전. 같은 요청을 기다리는 동안 스레드를 점유하지 않는다."""
+        payload = self._request(messages, persona)
+        key = prompt_key(self.model, self.temperature, payload)
+        return await self.flight.do_async(key, lambda: run_in_threadpool(self._complete, payload))
@@ -0,0 +1,299 @@
+# app/services/curriculum.py
+"""
+교육과정(Concept) 목록 로드 + 문항별 후보 선택.
+data/neo4j_nodes.csv 의 개념(소단원)/대단원/학년을 읽어 개념마다 문자 n-gram TF-IDF 벡터를 만들고,
+문항 텍스트와의 코사인 유사도로 상위 k개 후보만 골라 프롬프트에 넣는다.
+SAT 문항은 영어이고 개념명은 한국어라 그대로는 겹치는 n-gram이 거의 없으므로,
+영어 수학 용어 → 한국어 키워드 사전(EN_KO_TERMS)으로 질의를 보강한다.
+"""
+from __future__ import annotations
+import csv, io, math, re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+NODES_CSV = DATA_DIR / "neo4j_nodes.csv"
+EDGES_CSV = DATA_DIR / "neo4j_edges.csv"
+
+# ==================== CSV 읽기 ====================
+CSV_ENCODINGS = ("utf-8-sig", "utf-8", "cp949", "euc-kr", "latin1")
+
+def decode_flex(raw: bytes) -> Tuple[str, str]:
+    """바이트를 한 번만 읽고 인코딩 후보를 차례로 시도(파일 재오픈 없음)."""
+    last_err: Optional[Exception] = None
+    for enc in CSV_ENCODINGS:
+        try:
+            return raw.decode(enc), enc
+        except UnicodeDecodeError as e:
+            last_err = e
+    raise RuntimeError(f"CSV 인코딩 판별 실패 ({last_err})")
+
+def read_csv(path: Path, strip_values: bool = False) -> Tuple[List[Dict[str, str]], str]:
+    """
+    CSV → (행 dict 목록, 사용한 인코딩). 키는 BOM/공백 제거 + 소문자.
+    값은 그대로(Neo4j 적재는 CSV 값을 손대지 않음); strip_values=True 면 앞뒤 공백 제거.
+    """
+    text, enc = decode_flex(Path(path).read_bytes())
+    reader = csv.DictReader(io.StringIO(text, newline=""))
+    if not reader.fieldnames:
+        raise RuntimeError(f"CSV 헤더 없음: {path}")
+    if strip_values:
+        rows = [{(k or "").lstrip("\ufeff").strip().lower(): (v or "").strip() for k, v in row.items()}
+                for row in reader]
+    else:
+        rows = [{(k or "").lstrip("\ufeff").strip().lower(): v for k, v in row.items()} for row in reader]
+    return rows, enc
+
+def read_csv_rows(path: Path) -> List[Dict[str, str]]:
+    """개념 목록/그래프 스냅샷용: 값까지 공백 제거."""
+    return read_csv(path, strip_values=True)[0]
+
+# ==================== 개념 목록 ====================
+_CODE_RE = re.compile(r"^(\d+(?:\.\d+)*)\.?\s+(.+)$")
+
+def split_code(s: str) -> Tuple[str, str]:
+    """'3.5 일차함수의 뜻과 그래프' → ('3.5', '일차함수의 뜻과 그래프'). 코드가 없으면 ('', s)."""
+    m = _CODE_RE.match(s.strip())
+    return (m.group(1), m.group(2).strip()) if m else ("", s.strip())
+
+@dataclass(frozen=True)
+class Concept:
+    name: str    # Neo4j Concept.name 과 같은 전체 표기(예: "3.5 일차함수의 뜻과 그래프")
+    unit: str    # 대단원(예: "3. 함수")
+    grade: str   # 예: "2학년"
+
+    @property
+    def code(self) -> str:
+        return split_code(self.name)[0]
+
+    @property
+    def title(self) -> str:
+        return split_code(self.name)[1]
+
+    @property
+    def curriculum(self) -> Dict[str, str]:
+        """ConvertedProblem.curriculum 형태(by_alias)."""
+        return {"대단원": self.unit, "소단원": self.name, "학년": self.grade}
+
+def _blank(v: Optional[str]) -> bool:
+    return not v or v.strip().lower() in ("nan", "none", "null")
+
+def load_concepts(path: Path = NODES_CSV) -> List[Concept]:
+    """
+    노드 CSV → Concept 목록. 대단원은 단원 첫 행에만 있으므로 앞 값으로 채운다(forward-fill).
+    이름 없이 코드만 있는 행(예: '3.7,,')은 건너뛴다.
+    """
+    out: List[Concept] = []
+    unit = ""
+    for row in read_csv_rows(path):
+        name = row.get("concept", "")
+        if not _blank(row.get("unit")):
+            unit = row["unit"]
+        code, title = split_code(name)
+        if not code or not title or _blank(row.get("grade")):
+            continue
+        out.append(Concept(name=name, unit=unit, grade=row["grade"]))
+    return out
+
+def format_concepts(concepts: Sequence[Concept]) -> str:
+    """대단원별로 묶어 한 줄에 한 개념(대단원 문자열 반복을 줄여 토큰 절약)."""
+    lines: List[str] = []
+    unit = None
+    for c in concepts:
+        if c.unit != unit:
+            unit = c.unit
+            lines.append(f"[대단원] {unit}")
+        lines.append(f"- {c.name} ({c.grade})")
+    return "\n".join(lines)
+
+# ==================== 영어 → 한국어 용어 사전 ====================
+# SAT 문항/해설에 나오는 표현 → 개념명에 쓰인 한국어 키워드.
+# 영문 한 단어는 단어 집합으로, 공백/기호가 든 표현은 소문자 텍스트 부분 문자열로 검사한다
+# (패턴마다 정규식 search 를 돌리면 문항당 ~1ms라 배치 채점에서 병목).
+EN_KO_TERMS: List[Tuple[Tuple[str, ...], str]] = [
+    (("prime", "primes"), "소수 합성수 소인수분해"),
+    (("factor", "factors", "factored", "factorization"), "소인수분해 최대공약수"),
+    (("greatest common factor", "greatest common divisor", "gcd"), "최대공약수"),
+    (("least common multiple", "lcm", "multiple", "multiples"), "최소공배수"),
+    (("integer", "integers", "negative"), "정수 정수와 유리수"),
+    (("rational", "fraction", "fractions"), "유리수"),
+    (("absolute value",), "절댓값"),
+    (("decimal", "decimals", "terminating"), "유한소수 순환소수"),
+    (("repeating decimal",), "순환소수"),
+    (("square root", "\\sqrt", "radical", "radicals"), "제곱근 분모의 유리화"),
+    (("irrational", "real number"), "무리수와 실수 실수의 대소 관계"),
+    (("expression", "expressions", "variable", "variables"), "문자와 식 일차식"),
+    (("equivalent", "identity"), "항등식"),
+    (("equation", "equations", "solve", "value of $x", "value of x"), "일차방정식의 풀이"),
+    (("system of", "systems", "simultaneous"), "연립방정식의 풀이 연립방정식의 활용"),
+    (("inequality", "inequalities", "at least", "at most", "greater than", "less than"),
+     "일차부등식의 풀이 일차부등식의 활용"),
+    (("percent", "%", "concentration", "mixture"), "농도 소금물의 농도"),
+    (("speed", "per hour", "rate", "increase", "increases", "decrease", "decreases"), "속력과 증가, 감소"),
+    (("exponent", "exponents", "power", "powers", "^"), "지수 법칙 단항식의 곱셈과 나눗셈"),
+    (("monomial", "monomials"), "단항식"),
+    (("polynomial", "polynomials", "binomial", "binomials"), "다항식의 사칙 연산"),
+    (("ordered pair", "coordinate", "coordinates", "(x, y)", "(x,y)", "point", "points"), "순서쌍과 좌표"),
+    (("proportional",), "정비례 함수 y=ax의 그래프"),
+    (("inversely proportional", "inverse variation"), "반비례 함수 y=a/x의 그래프"),
+    (("function", "functions", "f(x)", "g(x)"), "함수와 함숫값"),
+    (("linear", "line", "lines"), "일차함수의 뜻과 그래프"),
+    (("per mile", "per day", "per week", "per month", "per item", "per unit", "per minute", "per ticket",
+      "fare", "fares", "cost", "costs", "charge", "charges"), "일차함수의 뜻과 그래프 일차식"),
+    (("slope", "rate of change"), "일차함수의 절편과 기울기 기울기"),
+    (("intercept", "intercepts", "y-axis", "x-axis"), "절편 일차함수의 절편과 기울기"),
+    (("equation of the line", "equation of a line", "line passes", "line that passes"), "직선의 방정식 구하기"),
+    (("intersect", "intersects", "intersection"), "두 직선의 교점 연립방정식의 해"),
+    (("graph", "graphs", "graphed", "xy-plane"), "그래프 일차함수의 그래프의 성질"),
+    (("quadratic", "parabola", "vertex", "x^2", "x^{2}", "squared"), "이차함수의 뜻과 그래프 이차함수의 그래프"),
+    (("number of ways", "number of outcomes", "number of possible", "arrange", "arrangements", "combination",
+      "combinations"), "경우의 수 한 줄로 세우기 대표 뽑기"),
+    (("probability", "at random", "randomly"), "확률의 뜻과 성질 확률의 계산"),
+    (("frequency", "histogram"), "도수분포표와 상대도수"),
+    (("mean", "average", "median", "mode"), "대푯값(평균, 중앙값, 최빈값)"),
+    (("standard deviation", "variance", "spread"), "분산과 표준편차"),
+    (("scatterplot", "scatter plot", "correlation", "line of best fit"), "산점도 산정도와 상관관계"),
+    (("segment", "segments", "ray", "rays", "distance"), "직선, 반직선, 선분, 두 점 사이의 거리"),
+    (("angle", "angles", "degree", "degrees", "perpendicular"), "각, 수직과 수선"),
+    (("parallel", "transversal", "alternate", "corresponding"), "동위각과 엇각, 평행선의 성질"),
+    (("triangle", "triangles"), "삼각형"),
+    (("isosceles",), "이등변삼각형"),
+    (("congruent",), "삼각형의 합동"),
+    (("polygon", "polygons", "interior angle", "exterior angle", "hexagon", "pentagon"), "다각형의 내각과 외각"),
+    (("circle", "circles", "radius", "diameter", "circumference", "\\pi", "pi"), "원과 부채꼴 원"),
+    (("arc", "arcs", "sector", "sectors", "central angle"), "원과 부채꼴"),
+    (("chord", "chords"), "원의 현"),
+    (("tangent to", "tangent line"), "원의 접선"),
+    (("inscribed angle", "inscribed in"), "원주각 원주각의 활용 내접원"),
+    (("polyhedron", "polyhedra"), "다면체"),
+    (("cylinder", "cylinders", "cone", "cones", "sphere", "spheres", "prism", "prisms", "pyramid", "pyramids",
+      "cube", "cubes"), "기둥, 뿔, 구의 겉넓이와 부피 회전체"),
+    (("volume", "surface area"), "겉넓이와 부피"),
+    (("area",), "넓이"),
+    (("parallelogram",), "평행사변형"),
+    (("rectangle", "rectangles", "square", "squares", "rhombus", "trapezoid", "quadrilateral"), "사각형 넓이"),
+    (("circumcenter", "circumscribed"), "삼각형의 외심"),
+    (("incenter", "incircle"), "삼각형의 내심 내접원"),
+    (("similar", "similarity", "scale"), "닮은 도형 닮음의 활용"),
+    (("midpoint",), "두 변의 중점을 연결한 선분"),
+    (("centroid", "median of"), "삼각형의 중선과 무게중심"),
+    (("pythagorean", "hypotenuse", "right triangle"), "피타고라스의 정리"),
+    (("sin", "cos", "tan", "sine", "cosine", "trigonometry", "trigonometric"), "삼각비 삼각비의 활용"),
+]
+_WORD_RE = re.compile(r"[a-z]+")
+
+def gloss(text: str) -> str:
+    """영어 수학 용어가 보이면 대응 한국어 키워드를 모아 반환(사전 순서 유지, 중복 제거)."""
+    low = text.lower()
+    words = set(_WORD_RE.findall(low))
+    seen: List[str] = []
+    for triggers, ko in EN_KO_TERMS:
+        if ko in seen:
+            continue
+        if any((t in words) if t.isalpha() else (t in low) for t in triggers):
+            seen.append(ko)
+    return " ".join(seen)
+
+_HANGUL_RE = re.compile(r"[가-힣]")
+
+def problem_query(item: dict) -> str:
+    """
+    문항 dict(sat_mathpix_single 출력 또는 변환 결과) → 유사도 질의 텍스트.
+    영어 원문의 n-gram은 한국어 개념명과 우연히만 겹치므로(x, y=ax 등) 질의에는 사전 키워드만 넣고,
+    한국어 필드가 있으면 그대로 덧붙인다.
+    """
+    english = " ".join(str(item.get(k) or "") for k in ("question_text", "english_problem", "rationale", "english_solution"))
+    english += " " + " ".join(str(v) for v in (item.get("choices") or {}).values())
+    korean = " ".join(str(item.get(k) or "") for k in ("korean_problem", "korean_solution"))
+    return f"{gloss(english)} {korean if _HANGUL_RE.search(korean) else ''}".strip()
+
+# ==================== 문자 n-gram TF-IDF ====================
+_TOKEN_RE = re.compile(r"[0-9A-Za-z가-힣=/]+")
+
+def char_ngrams(text: str, ngram: Tuple[int, int] = (2, 3)) -> Iterable[str]:
+    """토큰 단위로 앞뒤 공백을 붙여 n-gram 생성(한 글자 개념어 '각', '원'도 잡히도록)."""
+    lo, hi = ngram
+    for tok in _TOKEN_RE.findall(text.lower()):
+        padded = f" {tok} "
+        for n in range(lo, hi + 1):
+            for i in range(len(padded) - n + 1):
+                yield padded[i:i + n]
+
+class CharTfidf:
+    """문자 n-gram TF-IDF(sublinear tf, smooth idf, L2 정규화). 어휘는 fit 문서에서만 만든다."""
+
+    def __init__(self, docs: Sequence[str], ngram: Tuple[int, int] = (2, 3)) -> None:
+        self.ngram = ngram
+        counts = [Counter(char_ngrams(d, ngram)) for d in docs]
+        self.vocab: Dict[str, int] = {}
+        for c in counts:
+            for g in c:
+                self.vocab.setdefault(g, len(self.vocab))
+        df = np.zeros(len(self.vocab), dtype=np.float32)
+        for c in counts:
+            df[[self.vocab[g] for g in c]] += 1
+        self.idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+        self.fitted = self._weigh(counts)
+
+    def _weigh(self, counts: Sequence[Counter]) -> np.ndarray:
+        m = np.zeros((len(counts), len(self.vocab)), dtype=np.float32)
+        for i, c in enumerate(counts):
+            for g, n in c.items():
+                j = self.vocab.get(g)
+                if j is not None:
+                    m[i, j] = 1 + math.log(n)
+        m *= self.idf
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        np.divide(m, norms, out=m, where=norms > 0)
+        return m
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        return self._weigh([Counter(char_ngrams(t, self.ngram)) for t in texts])
+
+def concept_document(c: Concept) -> str:
+    # 소단원 제목을 두 번 넣어 대단원보다 가중
+    unit = split_code(c.unit)[1]
+    return f"{c.title} {c.title} {unit}"
+
+class CurriculumIndex:
+    """개념별 TF-IDF 행렬(개념 수 × 어휘). 질의는 같은 어휘로 투영해 내적 = 코사인 유사도."""
+
+    def __init__(self, concepts: Sequence[Concept], ngram: Tuple[int, int] = (2, 3)) -> None:
+        self.concepts = list(concepts)
+        self.tfidf = CharTfidf([concept_document(c) for c in self.concepts], ngram)
+        self.matrix = self.tfidf.fitted
+
+    def scores(self, texts: Sequence[str]) -> np.ndarray:
+        """(질의 수 × 개념 수) 코사인 유사도."""
+        return self.tfidf.transform(texts) @ self.matrix.T
+
+    def top_k(self, text: str, k: int) -> List[Tuple[Concept, float]]:
+        s = self.scores([text])[0]
+        k = min(k, len(self.concepts))
+        idx = np.argpartition(-s, k - 1)[:k] if k > 0 else np.array([], dtype=int)
+        idx = idx[np.argsort(-s[idx], kind="stable")]
+        return [(self.concepts[i], float(s[i])) for i in idx if s[i] > 0]
+
+@lru_cache(maxsize=1)
+def get_index() -> CurriculumIndex:
+    return CurriculumIndex(load_concepts())
+
+def candidates(item: dict, k: int) -> List[Concept]:
+    """
+    문항별 후보 개념 top-k(교육과정 순서로 정렬).
+    k<=0 이거나 유사도가 전부 0이면(용어 사전에 안 걸림) 전체 목록을 돌려준다 → 정답 후보를 잘라내지 않도록.
+    """
+    index = get_index()
+    if k <= 0:
+        return list(index.concepts)
+    picked = index.top_k(problem_query(item), k)
+    if not picked:
+        return list(index.concepts)
+    order = {c.name: i for i, c in enumerate(index.concepts)}
+    return sorted((c for c, _ in picked), key=lambda c: order[c.name])
@@ -0,0 +1,139 @@
+# app/services/curriculum_classifier.py
+"""
+로컬 교육과정 분류기(대단원/소단원/학년).
+개념 문서(data/neo4j_nodes.csv) + 이미 변환된 문항(분류기가 채우지 않았고 라벨이 실제 개념인 것만)으로 개념별 중심 벡터를 만들고,
+문항 배치를 한 번의 행렬곱(문자 n-gram TF-IDF · 코사인)으로 채점한다.
+- predict(): 문항별 1순위 개념, 점수, 2순위와의 차이(margin), 확신 여부
+- resolve(): LLM 이 고른 curriculum 이 실제 Concept 인지 확인(아니면 None)
+"""
+from __future__ import annotations
+import json, re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.curriculum import (
+    ROOT, CharTfidf, Concept, concept_document, load_concepts, problem_query, split_code,
+)
+
+OUT_ROOT = ROOT / "out"
+# 학습에 쓰는 라벨 출처. prefilled/corrected 는 이 분류기의 출력이라 다시 학습하면 자기 오류를 강화한다.
+# 출처가 없는 문항은 분류기 도입 전 변환분(LLM 라벨)
+TRAIN_SOURCES = frozenset({None, "llm", "verified"})
+
+@dataclass(frozen=True)
+class Prediction:
+    concept: Optional[Concept]   # 유사도가 전부 0이면 None
+    score: float                 # 1순위 코사인 유사도
+    margin: float                # 1순위 - 2순위
+    confident: bool
+
+def _norm(s: str) -> str:
+    return re.sub(r"\s+", " ", str(s or "")).strip()
+
+def load_training_problems(out_root: Path = OUT_ROOT) -> List[dict]:
+    """out/**/converted_with_schema.json (단건 dict 또는 list) 중 라벨 출처가 TRAIN_SOURCES 인 문항."""
+    items: List[dict] = []
+    for path in sorted(out_root.rglob("converted_with_schema.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        items.extend(d for d in (data if isinstance(data, list) else [data])
+                     if isinstance(d, dict) and d.get("curriculum_source") in TRAIN_SOURCES)
+    return items
+
+class CurriculumClassifier:
+    # 1순위 점수와 2순위와의 차이가 둘 다 이 이상이면 확신(LLM 에 교육과정 선택을 맡기지 않음)
+    MIN_SCORE = 0.45
+    MIN_MARGIN = 0.10
+
+    def __init__(self, concepts: Sequence[Concept], examples: Iterable[dict] = (),
+                 min_score: float = MIN_SCORE, min_margin: float = MIN_MARGIN) -> None:
+        self.concepts = list(concepts)
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self._by_name = {_norm(c.name): c for c in self.concepts}
+        self._by_code = {c.code: c for c in self.concepts}
+        titles: Dict[str, List[Concept]] = {}
+        for c in self.concepts:
+            titles.setdefault(_norm(c.title), []).append(c)
+        self._by_title = {t: cs[0] for t, cs in titles.items() if len(cs) == 1}
+
+        # 라벨이 실제 개념으로 확인되는 문항만 학습에 사용
+        labelled = []
+        for ex in examples:
+            c = self.resolve(ex.get("curriculum") or {})
+            q = problem_query(ex)
+            if c is not None and q:
+                labelled.append((c, q))
+        self.n_examples = len(labelled)
+
+        n = len(self.concepts)
+        self.tfidf = CharTfidf([concept_document(c) for c in self.concepts] + [q for _, q in labelled])
+        centroids = self.tfidf.fitted[:n].copy()
+        if labelled:
+            row = {c.name: i for i, c in enumerate(self.concepts)}
+            np.add.at(centroids, [row[c.name] for c, _ in labelled], self.tfidf.fitted[n:])
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        np.divide(centroids, norms, out=centroids, where=norms > 0)
+        self.centroids = centroids
+
+    # ---------- 라벨 검증 ----------
+    def resolve(self, curriculum: dict) -> Optional[Concept]:
+        """
+        curriculum(by_alias 또는 필드명) → 실제 Concept. 소단원 기준:
+        전체 표기 일치 > 코드 일치(제목이 같이 있으면 제목도 같아야 함) > 제목만 일치(유일할 때).
+        '일차함수' 처럼 개념명이 아닌 자유 표기는 None.
+        """
+        minor = _norm(curriculum.get("소단원") or curriculum.get("minor_unit") or "")
+        if not minor:
+            return None
+        if minor in self._by_name:
+            return self._by_name[minor]
+        if re.fullmatch(r"\d+(?:\.\d+)+", minor):   # 코드만("3.5")
+            return self._by_code.get(minor)
+        code, title = split_code(minor)
+        if code:
+            c = self._by_code.get(code)
+            if c is not None and (not title or _norm(c.title) == title):
+                return c
+            return None
+        return self._by_title.get(minor)
+
+    # ---------- 배치 채점 ----------
+    def scores(self, items: Sequence[dict]) -> np.ndarray:
+        """(문항 수 × 개념 수) 코사인 유사도."""
+        return self.tfidf.transform([problem_query(it) for it in items]) @ self.centroids.T
+
+    def predict(self, items: Sequence[dict]) -> List[Prediction]:
+        if not items:
+            return []
+        s = self.scores(items)
+        rows = np.arange(len(items))
+        if s.shape[1] > 1:
+            top2 = np.argpartition(-s, 1, axis=1)[:, :2]
+            swap = s[rows, top2[:, 1]] > s[rows, top2[:, 0]]
+            top2[swap] = top2[swap][:, ::-1]
+            best, second = s[rows, top2[:, 0]], s[rows, top2[:, 1]]
+        else:
+            top2 = np.zeros((len(items), 1), dtype=int)
+            best, second = s[:, 0], np.zeros(len(items), dtype=s.dtype)
+        margin = best - second
+        confident = (best >= self.min_score) & (margin >= self.min_margin)
+        return [
+            Prediction(
+                concept=self.concepts[top2[i, 0]] if best[i] > 0 else None,
+                score=float(best[i]),
+                margin=float(margin[i]),
+                confident=bool(confident[i]),
+            )
+            for i in rows
+        ]
+
+@lru_cache(maxsize=1)
+def get_classifier() -> CurriculumClassifier:
+    return CurriculumClassifier(load_concepts(), load_training_problems())
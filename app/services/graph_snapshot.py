@@ -0,0 +1,385 @@
+# app/services/graph_snapshot.py
+"""
+교육과정 선수 관계(PRECEDES) 그래프의 컴파일된 스냅샷.
+scripts/build_graph_snapshot.py 가 data/neo4j_*.csv 를 한 파일로 컴파일하고, 앱 워커는 그 파일을 mmap 으로 연다
+→ uvicorn 워커 N개가 페이지 캐시 한 벌을 공유하고, 콜드 스타트는 mmap + 헤더 파싱뿐.
+
+파일 구조
+  [0:8]    매직 b"CGRAPH01"
+  [8:12]   헤더 JSON 길이(uint32 LE)
+  [12:..]  헤더 JSON {"version", "built_at", "checksum"(본문 sha256), "n_nodes", "n_edges",
+                      "arrays": {이름: [dtype, 길이, 본문 내 offset]}}
+  본문     헤더 뒤 64바이트 경계에서 시작, 배열마다 64바이트 정렬
+배열
+  fwd_indptr/fwd_indices   정방향 CSR(선수 → 후속), int32
+  rev_indptr/rev_indices   역방향 CSR(후속 → 선수)
+  str_offsets/str_data     문자열 테이블(utf-8). 0..n-1 은 개념명, 이후 코드/대단원/학년
+  node_unit/node_grade     노드별 대단원/학년 문자열 id
+  hash_keys/hash_vals      키(개념명·코드) → 노드 id 오픈 어드레싱 해시(FNV-1a 64, 선형 탐사, 빈 칸 -1)
+배포
+  스냅샷 경로(예: curriculum_graph.snap)는 현재 버전 파일 이름만 적힌 포인터 파일이고, 본문은
+  curriculum_graph.<version>-<checksum12>.snap 처럼 버전별 파일에 쓴다. 워커가 mmap 중인 파일을
+  덮어쓰지 않으므로 Windows 에서도 교체가 된다(매핑된 파일은 os.replace/삭제 불가).
+  포인터 대신 스냅샷 본문이 바로 들어 있는 옛 형식 파일도 그대로 열린다.
+"""
+from __future__ import annotations
+import hashlib, json, mmap, os, re, struct, tempfile, threading, time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.curriculum import (
+    EDGES_CSV, NODES_CSV, ROOT, Concept, load_concepts, read_csv_rows,
+)
+
+MAGIC = b"CGRAPH01"
+ALIGN = 64
+DEFAULT_PATH = ROOT / "out" / "graph" / "curriculum_graph.snap"
+KEEP_VERSIONS = 2   # 포인터 교체 후 남겨 둘 버전 파일 수(현재 + 직전: 아직 옛 버전을 보는 워커용)
+
+class SnapshotError(RuntimeError):
+    pass
+
+def fnv1a64(data: bytes) -> int:
+    h = 0xcbf29ce484222325
+    for b in data:
+        h = ((h ^ b) * 0x100000001b3) & 0xFFFFFFFFFFFFFFFF
+    return h
+
+# ==================== 빌드 ====================
+def resolve_edges(concepts: Sequence[Concept], rows: Iterable[dict]) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    엣지 CSV 행 → (src id, dst id). source 는 코드("1.1"), target 은 전체 이름이 섞여 있으므로
+    전체 이름 → 코드 순으로 찾는다. 못 찾은 행 수도 함께 반환.
+    """
+    by_key: Dict[str, int] = {}
+    for i, c in enumerate(concepts):
+        by_key[c.name] = i
+        by_key.setdefault(c.code, i)
+    edges, skipped = [], 0
+    for row in rows:
+        if (row.get("type") or "PRECEDES").upper() != "PRECEDES":
+            continue
+        s = by_key.get((row.get("source") or row.get("src") or "").strip())
+        d = by_key.get((row.get("target") or row.get("dst") or "").strip())
+        if s is None or d is None or s == d:
+            skipped += 1
+            continue
+        edges.append((s, d))
+    return edges, skipped
+
+def _csr(n: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order].astype(np.int32)
+
+def compile_graph(concepts: Sequence[Concept], edges: Sequence[Tuple[int, int]],
+                  version: Optional[int] = None) -> bytes:
+    n = len(concepts)
+    e = np.unique(np.asarray(edges, dtype=np.int32).reshape(-1, 2), axis=0)
+    fwd_indptr, fwd_indices = _csr(n, e[:, 0], e[:, 1])
+    rev_indptr, rev_indices = _csr(n, e[:, 1], e[:, 0])
+
+    # 문자열 테이블: 개념명(0..n-1) → 코드 → 대단원/학년(중복 제거)
+    strings: List[str] = [c.name for c in concepts]
+    sid: Dict[str, int] = {}
+    def intern(s: str) -> int:
+        if s not in sid:
+            sid[s] = len(strings)
+            strings.append(s)
+        return sid[s]
+    code_ids = [intern(c.code) if c.code and c.code != c.name else -1 for c in concepts]
+    node_unit = np.array([intern(c.unit) for c in concepts], dtype=np.int32)
+    node_grade = np.array([intern(c.grade) for c in concepts], dtype=np.int32)
+    encoded = [s.encode("utf-8") for s in strings]
+    str_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=str_offsets[1:])
+    str_data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    # 해시 인덱스(적재율 <= 0.5)
+    keys = [(i, i) for i in range(n)] + [(code_ids[i], i) for i in range(n) if code_ids[i] >= 0]
+    size = 1
+    while size < 2 * len(keys):
+        size <<= 1
+    hash_keys = np.full(size, -1, dtype=np.int32)
+    hash_vals = np.full(size, -1, dtype=np.int32)
+    for key_sid, node in keys:
+        slot = fnv1a64(encoded[key_sid]) & (size - 1)
+        while hash_keys[slot] >= 0:
+            if encoded[hash_keys[slot]] == encoded[key_sid]:
+                break   # 같은 키가 이미 있으면 먼저 들어간 것 유지
+            slot = (slot + 1) & (size - 1)
+        else:
+            hash_keys[slot], hash_vals[slot] = key_sid, node
+
+    arrays = {
+        "fwd_indptr": fwd_indptr, "fwd_indices": fwd_indices,
+        "rev_indptr": rev_indptr, "rev_indices": rev_indices,
+        "str_offsets": str_offsets, "str_data": str_data,
+        "node_unit": node_unit, "node_grade": node_grade,
+        "hash_keys": hash_keys, "hash_vals": hash_vals,
+    }
+    body = bytearray()
+    layout: Dict[str, list] = {}
+    for name, arr in arrays.items():
+        body.extend(b"\0" * (-len(body) % ALIGN))
+        layout[name] = [arr.dtype.str, int(arr.size), len(body)]
+        body.extend(np.ascontiguousarray(arr).tobytes())
+    header = {
+        "version": int(version if version is not None else time.time()),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "checksum": hashlib.sha256(body).hexdigest(),
+        "n_nodes": n,
+        "n_edges": int(len(e)),
+        "arrays": layout,
+    }
+    raw = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(raw)) + raw
+    return prefix + b"\0" * (-len(prefix) % ALIGN) + bytes(body)
+
+def build_from_csv(nodes_csv: Path = NODES_CSV, edges_csv: Path = EDGES_CSV,
+                   version: Optional[int] = None) -> Tuple[bytes, dict]:
+    concepts = load_concepts(nodes_csv)
+    edges, skipped = resolve_edges(concepts, read_csv_rows(edges_csv))
+    blob = compile_graph(concepts, edges, version)
+    return blob, {"nodes": len(concepts), "edges": len(edges), "skipped_edges": skipped}
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """임시 파일 → os.replace(원자적)."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        for attempt in range(5):
+            try:
+                os.replace(tmp, path)
+                break
+            except PermissionError:   # Windows: 다른 프로세스가 포인터를 읽는 순간이면 잠깐 뒤 재시도
+                if attempt == 4:
+                    raise
+                time.sleep(0.05)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def _version_re(path: Path) -> "re.Pattern[str]":
+    return re.compile(rf"^{re.escape(path.stem)}\.\d+-[0-9a-f]{{12}}{re.escape(path.suffix)}$")
+
+def version_path(path: Path, header: dict) -> Path:
+    """포인터 경로 + 헤더 → 버전 파일 경로(<stem>.<version>-<checksum12><suffix>)."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{header['version']}-{header['checksum'][:12]}{path.suffix}")
+
+def resolve_snapshot(path: Path) -> Path:
+    """포인터 파일 → 현재 버전 파일. 본문이 바로 들어 있는 옛 형식이면 path 그대로."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        head = f.read(512)
+    if head.startswith(MAGIC):
+        return path
+    name = head.decode("utf-8").strip()
+    if not name or Path(name).name != name:
+        raise SnapshotError(f"invalid snapshot pointer: {path}")
+    return path.with_name(name)
+
+def write_snapshot(path: Path, blob: bytes) -> Path:
+    """
+    본문을 버전 파일에 쓰고(새 이름이라 mmap 중인 파일과 겹치지 않음) 포인터를 원자적으로 교체.
+    오래된 버전 파일은 KEEP_VERSIONS 개만 남기고 지운다(아직 매핑 중이라 못 지우면 다음 빌드 때).
+    반환: 버전 파일 경로.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header, _ = read_header(blob)
+    target = version_path(path, header)
+    if not target.exists():
+        _atomic_write(target, blob)
+    _atomic_write(path, (target.name + "\n").encode("utf-8"))
+
+    pattern = _version_re(path)
+    olds = sorted((p for p in path.parent.iterdir() if pattern.match(p.name) and p != target),
+                  key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for old in olds[KEEP_VERSIONS - 1:]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+    return target
+
+def ensure_snapshot(path: Path = DEFAULT_PATH) -> None:
+    """스냅샷이 없으면 CSV 에서 바로 컴파일(빌드 스크립트를 안 돌린 개발 환경용)."""
+    if not Path(path).exists():
+        write_snapshot(path, build_from_csv()[0])
+
+# ==================== 읽기(mmap) ====================
+def read_header(buf) -> Tuple[dict, int]:
+    if bytes(buf[:len(MAGIC)]) != MAGIC:
+        raise SnapshotError("not a curriculum graph snapshot")
+    (hlen,) = struct.unpack_from("<I", buf, len(MAGIC))
+    end = len(MAGIC) + 4 + hlen
+    header = json.loads(bytes(buf[len(MAGIC) + 4:end]).decode("utf-8"))
+    return header, end + (-end % ALIGN)
+
+class GraphSnapshot:
+    ARRAYS = ("fwd_indptr", "fwd_indices", "rev_indptr", "rev_indices", "_str_offsets", "_str_data",
+              "_node_unit", "_node_grade", "_hash_keys", "_hash_vals")
+
+    def __init__(self, mm: mmap.mmap, header: dict, body_start: int, path: Optional[Path] = None) -> None:
+        self._mm = mm   # 배열들이 이 버퍼를 참조(복사 없음)
+        self.path = path
+        self.header = header
+        self.version: int = header["version"]
+        self.checksum: str = header["checksum"]
+        self.n_nodes: int = header["n_nodes"]
+        self.n_edges: int = header["n_edges"]
+        a = {name: np.frombuffer(mm, dtype=np.dtype(dt), count=cnt, offset=body_start + off)
+             for name, (dt, cnt, off) in header["arrays"].items()}
+        self.fwd_indptr, self.fwd_indices = a["fwd_indptr"], a["fwd_indices"]
+        self.rev_indptr, self.rev_indices = a["rev_indptr"], a["rev_indices"]
+        self._str_offsets, self._str_data = a["str_offsets"], a["str_data"]
+        self._node_unit, self._node_grade = a["node_unit"], a["node_grade"]
+        self._hash_keys, self._hash_vals = a["hash_keys"], a["hash_vals"]
+
+    @classmethod
+    def open(cls, path: Path, verify: bool = True) -> "GraphSnapshot":
+        """포인터 파일이면 현재 버전 파일을 연다(self.path 는 실제 버전 파일)."""
+        path = resolve_snapshot(path)
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header, body_start = read_header(mm)
+        if verify and hashlib.sha256(mm[body_start:]).hexdigest() != header["checksum"]:
+            mm.close()
+            raise SnapshotError(f"checksum mismatch: {path}")
+        return cls(mm, header, body_start, Path(path))
+
+    def close(self) -> None:
+        """배열 참조를 놓고 mmap 해제. 밖에서 잡고 있는 배열 조각이 있으면 그것이 사라질 때 해제된다."""
+        for name in self.ARRAYS:
+            setattr(self, name, None)
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+
+    # ---------- 문자열/조회 ----------
+    def _bytes(self, sid: int) -> bytes:
+        return self._str_data[self._str_offsets[sid]:self._str_offsets[sid + 1]].tobytes()
+
+    def name(self, node: int) -> str:
+        return self._bytes(node).decode("utf-8")
+
+    def unit(self, node: int) -> str:
+        return self._bytes(int(self._node_unit[node])).decode("utf-8")
+
+    def grade(self, node: int) -> str:
+        return self._bytes(int(self._node_grade[node])).decode("utf-8")
+
+    def id(self, key: str) -> Optional[int]:
+        """개념 전체 이름 또는 코드("3.5") → 노드 id."""
+        kb = key.strip().encode("utf-8")
+        mask = len(self._hash_keys) - 1
+        slot = fnv1a64(kb) & mask
+        while True:
+            sid = int(self._hash_keys[slot])
+            if sid < 0:
+                return None
+            if self._bytes(sid) == kb:
+                return int(self._hash_vals[slot])
+            slot = (slot + 1) & mask
+
+    def names(self) -> List[str]:
+        return [self.name(i) for i in range(self.n_nodes)]
+
+    # ---------- 인접 ----------
+    def successors(self, node: int) -> np.ndarray:
+        return self.fwd_indices[self.fwd_indptr[node]:self.fwd_indptr[node + 1]]
+
+    def predecessors(self, node: int) -> np.ndarray:
+        return self.rev_indices[self.rev_indptr[node]:self.rev_indptr[node + 1]]
+
+    def ancestors(self, node: int) -> Dict[int, int]:
+        """모든 선수 개념 → 최단 거리(BFS, 역방향 CSR)."""
+        dist = {node: 0}
+        q = deque([node])
+        while q:
+            u = q.popleft()
+            for p in self.predecessors(u).tolist():
+                if p not in dist:
+                    dist[p] = dist[u] + 1
+                    q.append(p)
+        del dist[node]
+        return dist
+
+class SnapshotHandle:
+    """
+    워커별 스냅샷 핸들. check_interval 마다 포인터 파일 stat 만 보고, 바뀌었으면 새 버전 파일을 mmap.
+    새 파일이 깨졌으면(checksum 불일치) 기존 스냅샷을 계속 쓴다.
+    교체된 옛 스냅샷은 retire_after 초 뒤(진행 중인 요청이 끝난 뒤) close() 해 매핑을 푼다.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH, check_interval: float = 5.0,
+                 builder: Optional[Callable[[Path], None]] = ensure_snapshot,
+                 clock: Callable[[], float] = time.monotonic, retire_after: float = 60.0) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.retire_after = retire_after
+        self._retired: List[Tuple[float, GraphSnapshot]] = []
+        self.builder = builder
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snap: Optional[GraphSnapshot] = None
+        self._sig: Optional[tuple] = None
+        self._checked = float("-inf")
+        self.reloads = 0
+
+    def get(self) -> GraphSnapshot:
+        if self._snap is None or self._clock() - self._checked >= self.check_interval:
+            with self._lock:
+                if self._snap is None or self._clock() - self._checked >= self.check_interval:
+                    self._refresh()
+        return self._snap
+
+    def _refresh(self) -> None:
+        self._checked = self._clock()
+        while self._retired and self._checked - self._retired[0][0] >= self.retire_after:
+            self._retired.pop(0)[1].close()
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._snap is not None:
+                return
+            if self.builder is None:
+                raise
+            self.builder(self.path)
+            st = os.stat(self.path)
+        sig = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if sig == self._sig:
+            return
+        try:
+            target = resolve_snapshot(self.path)
+            if self._snap is not None and target == self._snap.path:
+                self._sig = sig   # 포인터만 다시 쓰였고 가리키는 버전은 그대로
+                return
+            snap = GraphSnapshot.open(target)
+        except (SnapshotError, OSError, ValueError) as e:
+            if self._snap is None:
+                raise
+            self._sig = sig   # 파일이 다시 바뀔 때까지 재시도하지 않음
+            print(f"[WARN] graph snapshot reload skipped: {e}")
+            return
+        self._sig = sig
+        if self._snap is None or snap.checksum != self._snap.checksum:
+            if self._snap is not None:
+                self._retired.append((self._checked, self._snap))
+            self._snap = snap
+            self.reloads += 1
+        else:
+            snap.close()
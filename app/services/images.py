@@ -0,0 +1,198 @@
+# app/services/images.py
+"""
+문제 그림 최적화/서빙 도우미.
+- optimize_image(): 원본(out/images/*.png 등) → 폭별 WebP + PNG 변형(메타데이터 제거, 확대 없음).
+  파일명에 원본 내용 해시가 들어가므로(<stem>.<hash>.<w>w.webp) 한 번 만든 변형은 내용이 절대 바뀌지 않는다
+  → 라우트에서 Cache-Control: immutable 로 내려줄 수 있다.
+- out/images/opt/manifest.json: 원본 이름 → 변형 목록. 라우트가 ?w= / Accept 로 변형을 고를 때 사용.
+- content_etag(): 파일 내용 기반 강한 ETag(경로별로 (mtime, 크기)가 바뀔 때만 다시 해시, 최근 ETAG_CACHE 개만 유지).
+Pillow 는 선택 의존성: 없으면 최적화 단계는 건너뛰고 원본만 서빙한다.
+"""
+from __future__ import annotations
+import hashlib, json, os, re, tempfile, threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 미설치 → 최적화 단계 생략
+    Image = None
+
+ROOT = Path(__file__).resolve().parents[2]
+IMAGE_DIR = ROOT / "out" / "images"
+OPT_SUBDIR = "opt"
+MANIFEST = "manifest.json"
+
+WIDTHS = (480, 960)          # 모바일 / 데스크톱(2x 고려) 표시 폭
+WEBP_QUALITY = 82
+ETAG_CACHE = 4096            # ImageStore 가 ETag 를 기억하는 파일 수(LRU)
+SOURCE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".tif", ".tiff"}
+# opt/ 아래 변형 파일명: <stem>.<hash12>.<w>w.<webp|png>
+VARIANT_RE = re.compile(r"^.+\.[0-9a-f]{12}\.\d+w\.(?:webp|png)$")
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _clean(im: "Image.Image") -> "Image.Image":
+    """EXIF/ICC/텍스트 청크 등 메타데이터 없이 픽셀만 남긴 사본."""
+    if im.mode in ("1", "L"):
+        mode = "L"   # 흑백 도형은 그대로(RGB 로 바꾸면 PNG 가 커짐)
+    elif im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info):
+        mode = "RGBA"
+    else:
+        mode = "RGB"
+    im = im.convert(mode)
+    clean = Image.new(mode, im.size)
+    clean.paste(im)
+    return clean
+
+def _palette(im: "Image.Image") -> "Image.Image":
+    method = Image.Quantize.FASTOCTREE if im.mode == "RGBA" else Image.Quantize.MEDIANCUT
+    return im.quantize(256, method=method, dither=Image.Dither.NONE)
+
+def _atomic_save(im: "Image.Image", dst: Path, fmt: str, **opts) -> None:
+    fd, tmp = tempfile.mkstemp(dir=dst.parent, prefix=dst.name + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        im.save(tmp, fmt, **opts)
+        os.replace(tmp, dst)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def optimize_image(src: Path, out_dir: Optional[Path] = None, widths: Sequence[int] = WIDTHS) -> List[dict]:
+    """
+    src → 폭별 WebP/PNG 변형. 원본보다 넓게 키우지 않으며(원본이 더 좁으면 원본 폭 하나),
+    이미 있는 변형은 다시 만들지 않는다. 반환: [{file, format, width, height, bytes}] (file 은 out_dir 기준).
+    """
+    if Image is None:
+        return []
+    out_dir = out_dir or src.parent / OPT_SUBDIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    digest = file_sha256(src)[:12]
+    with Image.open(src) as raw:
+        raw.load()
+        base = _clean(raw)
+    targets = sorted({min(w, base.width) for w in widths})
+    variants = []
+    for w in targets:
+        h = max(1, round(base.height * w / base.width))
+        im = base if w == base.width else base.resize((w, h), Image.LANCZOS)
+        for fmt, ext, opts in (("WEBP", "webp", {"quality": WEBP_QUALITY, "method": 6}),
+                               ("PNG", "png", {"optimize": True})):
+            dst = out_dir / f"{src.stem}.{digest}.{w}w.{ext}"
+            if not dst.exists():
+                # PNG(WebP 미지원 브라우저용)는 256색 팔레트로: 축소하며 생긴 중간색 때문에 원본보다 커지는 것 방지.
+                # 문제 그림은 선/글자 위주라 디더링 없이도 차이가 거의 없다
+                out = _palette(im) if fmt == "PNG" else im
+                _atomic_save(out, dst, fmt, **opts)
+            variants.append({"file": dst.name, "format": ext, "width": w, "height": h,
+                             "bytes": dst.stat().st_size})
+    return variants
+
+def update_manifest(image_dir: Path, entries: Dict[str, dict], replace: bool = False) -> Dict[str, dict]:
+    """opt/manifest.json 에 {원본 이름: {bytes, variants}} 병합(replace=True 면 통째로 교체), 원자적 저장."""
+    out_dir = image_dir / OPT_SUBDIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / MANIFEST
+    manifest: Dict[str, dict] = {}
+    if not replace and path.exists():
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            manifest = {}
+    manifest.update(entries)
+    fd, tmp = tempfile.mkstemp(dir=out_dir, prefix=MANIFEST + ".", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return manifest
+
+def optimize_dir(image_dir: Path = IMAGE_DIR, widths: Sequence[int] = WIDTHS) -> Dict[str, dict]:
+    """image_dir 의 원본 전부 최적화 + manifest 재작성. 반환: manifest."""
+    if Image is None or not image_dir.is_dir():
+        return {}
+    entries: Dict[str, dict] = {}
+    for src in sorted(image_dir.iterdir()):
+        if not src.is_file() or src.suffix.lower() not in SOURCE_SUFFIXES:
+            continue
+        try:
+            variants = optimize_image(src, image_dir / OPT_SUBDIR, widths)
+        except OSError as e:   # 손상/미지원 형식 → 원본만 서빙
+            print(f"[images] skip {src.name}: {e}")
+            continue
+        entries[src.name] = {"bytes": src.stat().st_size, "variants": variants}
+    return update_manifest(image_dir, entries, replace=True)
+
+def pick_variant(entry: dict, width: Optional[int], accept: str) -> Optional[dict]:
+    """
+    요청 폭 이상인 가장 작은 변형(없으면 가장 큰 것). Accept 에 image/webp 가 있으면 WebP, 아니면 PNG.
+    width 가 없으면 가장 큰 변형.
+    """
+    fmt = "webp" if "image/webp" in (accept or "") else "png"
+    cands = sorted((v for v in entry.get("variants", ()) if v["format"] == fmt), key=lambda v: v["width"])
+    if not cands:
+        return None
+    if width:
+        for v in cands:
+            if v["width"] >= width:
+                return v
+    return cands[-1]
+
+class ImageStore:
+    """라우트용: manifest 캐시(파일 변경 시 다시 읽음) + 내용 기반 ETag 캐시."""
+
+    def __init__(self, image_dir: Path = IMAGE_DIR, etag_cache: int = ETAG_CACHE) -> None:
+        self.image_dir = Path(image_dir)
+        self.etag_cache = etag_cache
+        self._lock = threading.Lock()
+        self._manifest: Tuple[Optional[int], Dict[str, dict]] = (None, {})
+        # 경로 → (mtime_ns, 크기, ETag): 파일이 바뀌면 같은 항목을 덮어쓰고, 지워진 파일은 LRU 로 밀려남
+        self._etags: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+
+    def manifest(self) -> Dict[str, dict]:
+        path = self.image_dir / OPT_SUBDIR / MANIFEST
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        with self._lock:
+            if self._manifest[0] != mtime:
+                try:
+                    self._manifest = (mtime, json.loads(path.read_text(encoding="utf-8")))
+                except ValueError:
+                    self._manifest = (mtime, {})
+            return self._manifest[1]
+
+    def resolve(self, name: str) -> Optional[Path]:
+        """이미지 파일만(manifest.json, 임시 파일 등은 None). image_dir 밖으로 나가는 경로(../)는 거부."""
+        path = (self.image_dir / name).resolve()
+        root = self.image_dir.resolve()
+        if root not in path.parents or path.suffix.lower() not in SOURCE_SUFFIXES or not path.is_file():
+            return None
+        return path
+
+    def content_etag(self, path: Path) -> str:
+        st = path.stat()
+        key, sig = str(path), (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            item = self._etags.get(key)
+            if item is not None and item[:2] == sig:
+                self._etags.move_to_end(key)
+                return item[2]
+        tag = f'"{file_sha256(path)[:32]}"'
+        with self._lock:
+            self._etags[key] = (*sig, tag)
+            self._etags.move_to_end(key)
+            while len(self._etags) > self.etag_cache:
+                self._etags.popitem(last=False)
+        return tag
+
+    @staticmethod
+    def immutable(path: Path) -> bool:
+        return path.parent.name == OPT_SUBDIR and bool(VARIANT_RE.match(path.name))
@@ -0,0 +1,239 @@
+# app/services/knowledge_tracing.py
+"""
+학생별 개념 숙달도 추정(Bayesian Knowledge Tracing) — 그래프 스냅샷의 노드 id 를 열로 하는 NumPy 행렬.
+- 관측(학생, 개념, 정오)을 배치로 받아 한 번에 갱신: 직접 관측은 BKT 사후확률 + 학습 전이,
+  PRECEDES 로 연결된 선수 개념에는 약한 근거로 전파(정답이면 선수 개념도 알 가능성↑, 오답이면 조금↓).
+- 전파는 (갱신된 학생 × 개념) 근거 행렬 @ 선수 관계 행렬 한 번으로 계산 → 학급/학년 단위 배치도 수십 ms.
+- recommend(): 선수 개념 숙달도(준비도) × 미숙달 정도로 다음 학습 개념 순위.
+행렬은 워커별 작업 사본이다. 워커 간 공유는 LearningPathService 가 MasteryStore(Mongo)와
+get_rows()/set_rows() 로 학생 행을 주고받아 처리하고, save()/load() 는 .npz 로 내보내기/가져오기.
+"""
+from __future__ import annotations
+import os, tempfile, threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.graph_snapshot import GraphSnapshot
+
+@dataclass(frozen=True)
+class BKTParams:
+    p_init: float = 0.2             # 처음 숙달 확률
+    p_learn: float = 0.1            # 한 번 풀 때 숙달로 넘어갈 확률
+    p_slip: float = 0.1             # 알면서 틀릴 확률
+    p_guess: float = 0.25           # 몰라도 맞힐 확률(4지선다)
+    prereq_weight_correct: float = 0.3   # 정답이 선수 개념에 주는 근거 비중
+    prereq_weight_wrong: float = 0.1     # 오답이 선수 개념에 주는 근거 비중
+    mastered: float = 0.95          # 이 이상이면 숙달로 보고 추천에서 제외
+
+class KnowledgeTracer:
+    def __init__(self, graph: GraphSnapshot, params: BKTParams = BKTParams(), capacity: int = 1024) -> None:
+        self.params = params
+        self._lock = threading.Lock()
+        self.students: Dict[str, int] = {}
+        self._bind(graph)
+        self.mastery = np.full((max(capacity, 1), self.n_concepts), params.p_init, dtype=np.float32)
+
+    def _bind(self, graph: GraphSnapshot) -> None:
+        self.graph = graph
+        self.checksum = graph.checksum
+        self.n_concepts = graph.n_nodes
+        self.concepts: List[str] = graph.names()
+        # prereq[c, p] = 1  ⇔  p -[:PRECEDES]-> c
+        prereq = np.zeros((self.n_concepts, self.n_concepts), dtype=np.float32)
+        counts = np.diff(graph.rev_indptr)
+        prereq[np.repeat(np.arange(self.n_concepts), counts), graph.rev_indices] = 1.0
+        self.prereq = prereq
+        self._has_prereq = prereq.astype(bool)
+
+    def rebind(self, graph: GraphSnapshot) -> None:
+        """그래프 스냅샷이 바뀌면 개념 이름 기준으로 열을 옮긴다(새 개념은 p_init)."""
+        with self._lock:
+            if graph.checksum == self.checksum:
+                return
+            old_cols = {name: j for j, name in enumerate(self.concepts)}
+            old = self.mastery
+            self._bind(graph)
+            self.mastery = np.full((old.shape[0], self.n_concepts), self.params.p_init, dtype=np.float32)
+            pairs = [(j, old_cols[name]) for j, name in enumerate(self.concepts) if name in old_cols]
+            if pairs:
+                new_j, old_j = map(list, zip(*pairs))
+                self.mastery[:, new_j] = old[:, old_j]
+
+    # ---------- 학생 행 ----------
+    def rows(self, student_ids: Sequence[str]) -> np.ndarray:
+        """학생 id → 행 번호(없으면 추가, 용량은 두 배씩)."""
+        with self._lock:
+            out = np.empty(len(student_ids), dtype=np.int64)
+            for k, sid in enumerate(student_ids):
+                row = self.students.get(sid)
+                if row is None:
+                    row = self.students[sid] = len(self.students)
+                out[k] = row
+            need = len(self.students)
+            if need > self.mastery.shape[0]:
+                cap = self.mastery.shape[0]
+                while cap < need:
+                    cap *= 2
+                grown = np.full((cap, self.n_concepts), self.params.p_init, dtype=np.float32)
+                grown[:self.mastery.shape[0]] = self.mastery
+                self.mastery = grown
+            return out
+
+    def get_rows(self, student_ids: Sequence[str]) -> np.ndarray:
+        """학생들의 숙달도 행 사본(학생 수 × 개념 수)."""
+        rows = self.rows(student_ids)
+        with self._lock:
+            return self.mastery[rows].copy()
+
+    def set_rows(self, student_ids: Sequence[str], values: np.ndarray,
+                 concepts: Optional[Sequence[str]] = None) -> None:
+        """
+        학생 행을 통째로 덮어쓴다(공유 저장소/파일에서 읽은 값). concepts 가 values 의 열 이름이고
+        현재 그래프와 다르면 이름으로 매칭하고, 없는 개념은 p_init.
+        """
+        if not len(student_ids):
+            return
+        rows = self.rows(student_ids)
+        values = np.asarray(values, dtype=np.float32)
+        with self._lock:
+            if concepts is not None and list(concepts) != self.concepts:
+                cols = {name: j for j, name in enumerate(concepts)}
+                pairs = [(j, cols[name]) for j, name in enumerate(self.concepts) if name in cols]
+                mapped = np.full((len(rows), self.n_concepts), self.params.p_init, dtype=np.float32)
+                if pairs:
+                    new_j, old_j = map(list, zip(*pairs))
+                    mapped[:, new_j] = values[:, old_j]
+                values = mapped
+            self.mastery[rows] = values
+
+    # ---------- BKT ----------
+    def _posterior(self, p: np.ndarray, correct) -> np.ndarray:
+        s, g = np.float32(self.params.p_slip), np.float32(self.params.p_guess)
+        one = np.float32(1)
+        hit = np.where(correct, one - s, s)     # P(관측 | 숙달)
+        miss = np.where(correct, g, one - g)    # P(관측 | 미숙달)
+        return p * hit / (p * hit + (one - p) * miss)
+
+    def update(self, rows: np.ndarray, concepts: np.ndarray, correct: np.ndarray) -> None:
+        """
+        관측 배치 반영(rows 는 self.rows() 결과). 같은 (학생, 개념)이 여러 번 있으면 입력 순서대로
+        라운드를 나눠 적용하고, 한 라운드 안의 (학생, 개념) 쌍은 유일하므로 전부 벡터 연산.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        concepts = np.asarray(concepts, dtype=np.int64)
+        correct = np.asarray(correct, dtype=bool)
+        if not len(rows):
+            return
+        key = rows * self.n_concepts + concepts
+        order = np.argsort(key, kind="stable")
+        sk = key[order]
+        first = np.r_[True, sk[1:] != sk[:-1]]
+        rank_sorted = np.arange(len(sk)) - np.maximum.accumulate(np.where(first, np.arange(len(sk)), 0))
+        rank = np.empty_like(rank_sorted)
+        rank[order] = rank_sorted
+        with self._lock:
+            for r in range(int(rank.max()) + 1):
+                sel = rank == r
+                self._apply(rows[sel], concepts[sel], correct[sel])
+
+    def _apply(self, rows: np.ndarray, concepts: np.ndarray, correct: np.ndarray) -> None:
+        prm, m, n = self.params, self.mastery, self.n_concepts
+        flat = m.reshape(-1)   # (행, 열) 팬시 인덱싱보다 1차원 인덱스가 빠름
+        # 1) 직접 관측
+        idx = rows * n + concepts
+        post = self._posterior(flat[idx], correct)
+        flat[idx] = post + (1 - post) * np.float32(prm.p_learn)
+
+        # 2) 선수 개념 전파: 학생별 정답/오답 근거 수를 선수 관계 행렬로 옮기고(행렬곱 한 번),
+        #    근거 k개는 가중치 w 를 k번 적용한 것(1-(1-w)^k)으로 사후확률 쪽으로 당긴다
+        present = np.zeros(m.shape[0], dtype=bool)
+        present[rows] = True
+        touched = np.flatnonzero(present)
+        local = (np.cumsum(present) - 1)[rows] * n + concepts
+        evidence = np.zeros((len(touched), n), dtype=np.float32)
+        for mask, w, outcome in ((correct, prm.prereq_weight_correct, True),
+                                 (~correct, prm.prereq_weight_wrong, False)):
+            if not mask.any():
+                continue
+            evidence.fill(0.0)
+            evidence.reshape(-1)[local[mask]] = 1.0
+            counts = evidence @ self.prereq
+            keep = np.float32(1 - w)
+            nz = np.count_nonzero(counts)
+            if nz > counts.size // 4:
+                # 대부분 닿으면(학급 전체가 여러 개념 응답) 학생 행 통째로 갱신
+                p = m[touched]
+                alpha = 1 - keep ** counts
+                m[touched] = np.clip(p + alpha * (self._posterior(p, outcome) - p), 0.0, 1.0)
+            elif nz:
+                i, j = np.nonzero(counts)      # 근거가 닿은 (학생, 선수 개념)만 갱신
+                at = touched[i] * n + j
+                p = flat[at]
+                alpha = 1 - keep ** counts[i, j]
+                flat[at] = np.clip(p + alpha * (self._posterior(p, outcome) - p), 0.0, 1.0)
+
+    def observe(self, events: Sequence[Tuple[str, int, bool]]) -> None:
+        """(student_id, concept id, correct) 목록."""
+        if not events:
+            return
+        sids, concepts, correct = zip(*events)
+        self.update(self.rows(sids), np.array(concepts), np.array(correct))
+
+    # ---------- 조회/추천 ----------
+    def student_mastery(self, student_id: str) -> Optional[np.ndarray]:
+        row = self.students.get(student_id)
+        if row is None:
+            return None
+        return self.mastery[row].copy()
+
+    def readiness(self, mastery: np.ndarray) -> np.ndarray:
+        """개념별 준비도 = 선수 개념 숙달도의 최솟값(선수 개념이 없으면 1)."""
+        return np.where(self._has_prereq, mastery[None, :], 1.0).min(axis=1)
+
+    def recommend(self, student_id: str, k: int = 5) -> List[dict]:
+        m = self.student_mastery(student_id)
+        if m is None:
+            m = np.full(self.n_concepts, self.params.p_init, dtype=np.float32)
+        ready = self.readiness(m)
+        score = np.where(m >= self.params.mastered, -1.0, ready * (1 - m))
+        top = np.argsort(-score, kind="stable")[:k]
+        return [{"concept": self.concepts[j], "mastery": round(float(m[j]), 4),
+                 "readiness": round(float(ready[j]), 4), "score": round(float(score[j]), 4)}
+                for j in top if score[j] > 0]
+
+    # ---------- 저장 ----------
+    @staticmethod
+    def state_path(path: Path) -> Path:
+        """저장 경로 정규화: np.savez 는 .npz 를 붙이므로 save/load 모두 .npz 경로를 쓴다."""
+        path = Path(path)
+        return path if path.suffix == ".npz" else path.with_name(path.name + ".npz")
+
+    def save(self, path: Path) -> Path:
+        """임시 파일에 쓰고 os.replace(원자적). 문자열은 유니코드 배열로 저장(pickle 없음)."""
+        path = self.state_path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            ids = sorted(self.students, key=self.students.get)
+            mastery = self.mastery[:len(ids)].copy()
+            concepts = list(self.concepts)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:   # 파일 객체로 쓰면 savez 가 확장자를 붙이지 않음
+                np.savez(f, mastery=mastery, students=np.array(ids, dtype=str),
+                         concepts=np.array(concepts, dtype=str))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def load(self, path: Path) -> None:
+        """save() 결과를 현재 그래프 기준으로 복원(개념 이름으로 열 매칭)."""
+        with np.load(self.state_path(path), allow_pickle=False) as data:
+            self.set_rows(data["students"].tolist(), data["mastery"], data["concepts"].tolist())
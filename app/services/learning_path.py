@@ -1,25 +1,149 @@
 # app/services/learning_path.py
 
 from __future__ import annotations
-from typing import List, Dict, Any
+import threading
+from contextlib import ExitStack
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from app.services.graph_snapshot import SnapshotHandle
+from app.services.knowledge_tracing import KnowledgeTracer
+from app.services.mastery_store import MasteryConflict, MasteryStore, Versions
+
+SAVE_RETRIES = 5      # compare-and-set 충돌 시 최신 값을 다시 읽고 재적용하는 횟수
+STUDENT_LOCKS = 64    # 학생 id 해시로 나눈 락 개수(프로세스 내 같은 학생 갱신 직렬화)
 
 class LearningPathService:
     """
-    선수 개념 그래프(Neo4j)나 규칙을 이용해 학습 경로를 산출하는 서비스의 스텁.
-    실제 로직은 나중에 메서드 내부를 구현하세요.
+    선수 개념 그래프(컴파일된 스냅샷, mmap)를 이용해 학습 경로를 산출하는 서비스.
+    학생별 숙달도는 KnowledgeTracer(BKT)가 추적하고, 추천/경로에 반영한다.
+    store 가 있으면 학생 행을 쓰기 전/읽기 전에 저장소에서 가져오고 갱신 직후 다시 써서 워커 간에 공유한다
+    (없으면 프로세스 메모리에만 유지). 같은 프로세스 안의 같은 학생 갱신은 락으로 직렬화하고,
+    다른 워커와의 경합은 저장소의 version compare-and-set 으로 감지해 재적용한다.
     """
 
-    def __init__(self) -> None:
-        # 필요시 드라이버/설정 주입
-        pass
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None,
+                 temperature: float = 0.2, graph: Optional[SnapshotHandle] = None,
+                 store: Optional[MasteryStore] = None) -> None:
+        # 필요시 드라이버/설정 주입 (deps.get_learning_path_service 가 모델 설정/그래프 핸들을 넘김)
+        self.model = model
+        self.api_key = api_key
+        self.temperature = temperature
+        self.graph = graph
+        self.store = store
+        self._tracer: Optional[KnowledgeTracer] = None
+        self._tracer_lock = threading.Lock()
+        self._student_locks = [threading.Lock() for _ in range(STUDENT_LOCKS)]
+
+    def tracer(self) -> Optional[KnowledgeTracer]:
+        """현재 스냅샷 기준 트레이서(스냅샷이 바뀌면 열 재매핑)."""
+        if self.graph is None:
+            return None
+        snap = self.graph.get()
+        with self._tracer_lock:
+            if self._tracer is None:
+                self._tracer = KnowledgeTracer(snap)
+            else:
+                self._tracer.rebind(snap)
+            return self._tracer
+
+    def _pull(self, kt: KnowledgeTracer, student_ids: Sequence[str]) -> Versions:
+        """저장소의 최신 행으로 작업 사본 갱신(다른 워커가 반영한 답안 포함). 읽은 학생별 version 반환."""
+        if self.store is None:
+            return {}
+        groups, versions = self.store.load(student_ids)
+        for cols, (sids, values) in groups.items():
+            kt.set_rows(sids, values, cols)
+        return versions
+
+    def _locked(self, student_ids: Sequence[str]) -> ExitStack:
+        """학생들의 락을 고정 순서로 잡는다(교착 방지)."""
+        stack = ExitStack()
+        for i in sorted({hash(sid) % STUDENT_LOCKS for sid in student_ids}):
+            stack.enter_context(self._student_locks[i])
+        return stack
+
+    def record_answers(self, answers: Sequence[Tuple[str, str, bool]]) -> Dict[str, Any]:
+        """
+        (student_id, 개념 이름/코드, 정답 여부) 배치를 한 번에 반영.
+        그래프에 없는 개념은 건너뛰고 skipped 로 돌려준다.
+        """
+        kt = self.tracer()
+        if kt is None:
+            return {"applied": 0, "skipped": [a[1] for a in answers]}
+        snap = kt.graph
+        ids: Dict[str, Optional[int]] = {}
+        events, skipped = [], []
+        for sid, concept, ok in answers:
+            if concept not in ids:
+                ids[concept] = snap.id(concept)
+            node = ids[concept]
+            if node is None:
+                skipped.append(concept)
+            else:
+                events.append((sid, node, ok))
+        if events:
+            with self._locked({e[0] for e in events}):
+                self._apply(kt, events)
+        return {"applied": len(events), "skipped": sorted(set(skipped))}
+
+    def _apply(self, kt: KnowledgeTracer, events: List[Tuple[str, int, bool]]) -> None:
+        """최신 행 읽기 → 반영 → compare-and-set 저장. 다른 워커가 먼저 쓴 학생만 다시 읽어 재적용."""
+        for _ in range(SAVE_RETRIES):
+            sids = list(dict.fromkeys(e[0] for e in events))
+            versions = self._pull(kt, sids)
+            kt.observe(events)
+            if self.store is None:
+                return
+            missed = set(self.store.save(kt.checksum, kt.concepts, sids, kt.get_rows(sids), versions))
+            if not missed:
+                return
+            events = [e for e in events if e[0] in missed]
+        raise MasteryConflict(sorted({e[0] for e in events}))
+
+    def next_concepts(self, student_id: str, k: int = 5) -> List[Dict[str, Any]]:
+        """선수 개념 준비도 × 미숙달 정도 상위 k개(처음 보는 학생은 사전확률 기준)."""
+        kt = self.tracer()
+        if kt is None:
+            return []
+        self._pull(kt, [student_id])
+        return kt.recommend(student_id, k)
+
+    def mastery(self, student_id: str) -> Optional[Dict[str, float]]:
+        kt = self.tracer()
+        if kt is None:
+            return None
+        self._pull(kt, [student_id])
+        m = kt.student_mastery(student_id)
+        if m is None:
+            return None
+        return {name: round(float(v), 4) for name, v in zip(kt.concepts, m)}
 
-    def recommend(self, target_concept: str) -> List[Dict[str, Any]]:
+    def recommend(self, target_concept: str, student_id: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
         """
-        예시: target_concept까지 도달하기 위한 선행 개념 경로.
-        현재는 더미 결과 반환.
+        target_concept(개념 전체 이름 또는 코드)까지 도달하기 위한 선행 개념 경로.
+        먼 선수 개념부터(거리 내림차순, 같은 거리는 교육과정 순서), 마지막이 목표 개념(distance 0).
+        student_id 가 있으면 이미 숙달한 선수 개념은 빼고, 같은 거리 안에서는 숙달도 낮은 순.
+        그래프에 없는 개념이면 None.
         """
-        return [
-            {"concept": "기본 연산", "distance": 2},
-            {"concept": "약수/배수", "distance": 1},
-            {"concept": target_concept, "distance": 0},
-        ]
+        if self.graph is None:
+            return None
+        kt = self.tracer() if student_id is not None else None
+        if kt is not None:
+            self._pull(kt, [student_id])
+        snap = kt.graph if kt is not None else self.graph.get()   # 숙달도 열과 같은 스냅샷 기준
+        node = snap.id(target_concept)
+        if node is None:
+            return None
+        dist = snap.ancestors(node)
+        m = kt.student_mastery(student_id) if kt is not None else None
+        if m is None:
+            path = [{"concept": snap.name(i), "distance": d}
+                    for i, d in sorted(dist.items(), key=lambda kv: (-kv[1], kv[0]))]
+            path.append({"concept": snap.name(node), "distance": 0})
+            return path
+        done = kt.params.mastered
+        path = [{"concept": snap.name(i), "distance": d, "mastery": round(float(m[i]), 4)}
+                for i, d in sorted(dist.items(), key=lambda kv: (-kv[1], m[kv[0]], kv[0]))
+                if m[i] < done]
+        path.append({"concept": snap.name(node), "distance": 0, "mastery": round(float(m[node]), 4)})
+        return path
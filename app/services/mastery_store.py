@@ -0,0 +1,112 @@
+# app/services/mastery_store.py
+
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from bson import Binary
+from pymongo.errors import DuplicateKeyError
+
+from app.core.metrics import db_timer
+
+Columns = Tuple[str, ...]
+Versions = Dict[str, Optional[int]]
+
+class MasteryConflict(RuntimeError):
+    """재시도 후에도 다른 워커와의 동시 갱신 충돌이 풀리지 않음."""
+    def __init__(self, student_ids: Sequence[str]) -> None:
+        super().__init__(f"숙달도 동시 갱신 충돌: {', '.join(student_ids)}")
+        self.student_ids = list(student_ids)
+
+class MasteryStore:
+    """
+    학생 숙달도 공유 저장소(student_mastery 컬렉션) — uvicorn 워커들이 같은 값을 읽고 쓴다.
+    학생 1명 = 문서 1개 {_id: student_id, graph: 스냅샷 checksum, values: float32 bytes, version, updated_at}.
+    values 의 열 순서(개념 이름 목록)는 checksum 별로 meta 에 한 번만 저장 → 그래프가 바뀌어도 이름으로 재매핑.
+    쓰기는 load 때 읽은 version 기준 compare-and-set: 그 사이 다른 워커가 쓴 학생은 save 가 돌려주고,
+    호출자가 최신 값을 다시 읽어 답안을 재적용한다(덮어써서 잃어버리지 않음).
+    """
+
+    def __init__(self, coll, meta) -> None:
+        self.coll = coll
+        self.meta = meta
+        self._columns: Dict[str, Columns] = {}
+
+    @staticmethod
+    def _columns_id(checksum: str) -> str:
+        return f"kt_columns:{checksum}"
+
+    def columns(self, checksum: str) -> Optional[Columns]:
+        cols = self._columns.get(checksum)
+        if cols is None:
+            with db_timer("mongo", f"{self.meta.name}.find_one"):
+                doc = self.meta.find_one({"_id": self._columns_id(checksum)}, {"names": 1})
+            if doc is None:
+                return None
+            cols = self._columns[checksum] = tuple(doc["names"])
+        return cols
+
+    def _register(self, checksum: str, names: Sequence[str]) -> None:
+        if checksum in self._columns:
+            return
+        with db_timer("mongo", f"{self.meta.name}.update_one"):
+            self.meta.update_one({"_id": self._columns_id(checksum)},
+                                 {"$setOnInsert": {"names": list(names)}}, upsert=True)
+        self._columns[checksum] = tuple(names)
+
+    def load(self, student_ids: Sequence[str]) -> Tuple[Dict[Columns, Tuple[List[str], np.ndarray]], Versions]:
+        """
+        저장된 학생만 {열 이름 목록: (학생 id 목록, (학생 수 × 열 수) float32)} 로 묶어 반환하고,
+        저장된 학생별 version(save 의 compare-and-set 기준, version 필드 이전 문서는 None)도 함께 반환.
+        """
+        ids = list(dict.fromkeys(student_ids))
+        if not ids:
+            return {}, {}
+        with db_timer("mongo", f"{self.coll.name}.find"):
+            docs = list(self.coll.find({"_id": {"$in": ids}}, {"graph": 1, "values": 1, "version": 1}))
+        groups: Dict[Columns, Tuple[List[str], List[np.ndarray]]] = {}
+        versions: Versions = {}
+        for d in docs:
+            versions[d["_id"]] = d.get("version")
+            cols = self.columns(d["graph"])
+            values = np.frombuffer(d["values"], dtype="<f4")
+            if cols is None or len(cols) != len(values):
+                continue   # 열 정보가 없는 문서는 무시(처음부터 다시 추정)
+            sids, rows = groups.setdefault(cols, ([], []))
+            sids.append(d["_id"])
+            rows.append(values)
+        return {cols: (sids, np.vstack(rows).astype(np.float32)) for cols, (sids, rows) in groups.items()}, versions
+
+    def save(self, checksum: str, names: Sequence[str], student_ids: Sequence[str], values: np.ndarray,
+             versions: Versions) -> List[str]:
+        """
+        versions(load 결과)와 저장소의 version 이 같은 학생만 쓰고 version + 1.
+        versions 에 없는 학생은 새 문서로 넣는다. 그 사이 다른 워커가 먼저 쓴 학생 id 목록을 반환(비어 있으면 전부 반영).
+        """
+        if not len(student_ids):
+            return []
+        self._register(checksum, names)
+        values = np.asarray(values, dtype="<f4")
+        missed: List[str] = []
+        for i, sid in enumerate(student_ids):
+            fields = {"graph": checksum, "values": Binary(values[i].tobytes())}
+            if sid not in versions:
+                # 새 학생: 이미 문서가 있으면(다른 워커가 먼저 넣음) upsert 가 아무것도 바꾸지 않는다
+                try:
+                    with db_timer("mongo", f"{self.coll.name}.update_one"):
+                        res = self.coll.update_one({"_id": sid}, {"$setOnInsert": {
+                            **fields, "version": 1, "updated_at": datetime.now(timezone.utc)}}, upsert=True)
+                except DuplicateKeyError:   # 동시 upsert 경합
+                    res = None
+                if res is None or res.upserted_id is None:
+                    missed.append(sid)
+                continue
+            # version 필드가 없는(이전) 문서는 {"version": None} 으로 매칭되고 $inc 가 1 로 만든다
+            with db_timer("mongo", f"{self.coll.name}.update_one"):
+                res = self.coll.update_one({"_id": sid, "version": versions[sid]},
+                                           {"$set": fields, "$inc": {"version": 1},
+                                            "$currentDate": {"updated_at": True}})
+            if not res.matched_count:
+                missed.append(sid)
+        return missed
@@ -0,0 +1,146 @@
+# app/services/problem_cache.py
+
+from __future__ import annotations
+import threading, time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.models.problem import StoredProblem
+from app.services.problem_repository import ProblemRepository
+
+class ProblemCache:
+    """
+    프로세스 내 LRU 캐시. 값은 직렬화가 끝난 JSON bytes.
+    - max_items: 최대 항목 수
+    - max_bytes: 값 크기 합 상한(None이면 무제한)
+    - ttl: 항목 유효 시간(초, None이면 무제한)
+    uvicorn 스레드풀에서 동시에 불리므로 lock으로 보호한다.
+    """
+
+    def __init__(self, max_items: int = 1024, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, stored_at = item
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        size = len(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # 단일 항목이 상한보다 크면 캐시하지 않음
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, self._clock())
+            self._bytes += size
+            while self._data and (
+                len(self._data) > self.max_items
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.invalidations += 1
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._data.pop(key)
+        self._bytes -= len(value)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+class CachedProblemRepository:
+    """
+    ProblemRepository 앞단의 read-through 캐시.
+    문제 문서는 적재 후 사실상 불변이므로 단건 조회(get)만 캐시하고,
+    load_to_mongo 가 올리는 버전 스탬프(version_fn)가 바뀌면 전체를 비운다.
+    버전 확인은 version_check_interval 초마다 한 번만 한다(매 요청 Mongo 왕복 방지).
+    """
+
+    def __init__(self, repo: ProblemRepository, cache: ProblemCache,
+                 version_fn: Optional[Callable[[], int]] = None,
+                 version_check_interval: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.repo = repo
+        self.cache = cache
+        self.version_fn = version_fn
+        self.version_check_interval = version_check_interval
+        self._clock = clock
+        self._version: Optional[int] = None
+        self._checked_at = float("-inf")
+        self._version_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # list 등 캐시하지 않는 메서드는 원본 repository로 위임
+        return getattr(self.repo, name)
+
+    def _check_version(self) -> None:
+        if self.version_fn is None:
+            return
+        now = self._clock()
+        if now - self._checked_at < self.version_check_interval:
+            return
+        with self._version_lock:
+            if now - self._checked_at < self.version_check_interval:
+                return
+            try:
+                version = self.version_fn()
+            except Exception:
+                return  # 버전 조회 실패 시 기존 캐시 유지, 다음 주기에 재시도
+            self._checked_at = now
+            if self._version is not None and version != self._version:
+                self.cache.clear()
+            self._version = version
+
+    def get_json(self, problem_id: str) -> Optional[bytes]:
+        """StoredProblem 형태로 직렬화된 JSON bytes. 없으면 None(캐시하지 않음)."""
+        self._check_version()
+        body = self.cache.get(problem_id)
+        if body is not None:
+            return body
+        doc = self.repo.get(problem_id)
+        if not doc:
+            return None
+        body = StoredProblem.model_validate(doc).model_dump_json(by_alias=True).encode("utf-8")
+        self.cache.put(problem_id, body)
+        return body
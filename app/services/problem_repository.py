@@ -0,0 +1,98 @@
+# app/services/problem_repository.py
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId
+
+from app.core.metrics import db_timer
+
+# 목록(요약) 뷰에서 내려줄 필드. 한/영 해설 등 큰 필드는 제외
+SUMMARY_PROJECTION = {
+    "_id": 1, "problem_id": 1, "type": 1, "origin_problem_id": 1,
+    "korean_problem": 1, "curriculum": 1, "difficulty": 1,
+}
+
+MAX_LIMIT = 100
+
+class InvalidCursor(ValueError):
+    pass
+
+class ProblemRepository:
+    """
+    problems / generated_problems 컬렉션 조회.
+    목록은 _id 오름차순 키셋(커서) 페이지네이션 — skip 없이 app.db.mongo.LIST_INDEXES 를 탄다.
+    """
+
+    def __init__(self, problems, generated) -> None:
+        self.problems = problems
+        self.generated = generated
+
+    def get(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        """원본 → 변형 문제 순으로 조회(concepts_for 와 같은 순서)."""
+        for coll in (self.problems, self.generated):
+            with db_timer("mongo", f"{coll.name}.find_one"):
+                doc = coll.find_one({"problem_id": problem_id}, {"_id": 0})
+            if doc:
+                return doc
+        return None
+
+    def concepts_for(self, problem_ids: List[str]) -> Dict[str, str]:
+        """problem_id → curriculum.소단원 (원본/변형 문제 모두). 없거나 태그가 없는 문제는 빠진다."""
+        ids = list(dict.fromkeys(problem_ids))
+        out: Dict[str, str] = {}
+        for coll in (self.problems, self.generated):
+            todo = [pid for pid in ids if pid not in out]
+            if not todo:
+                break
+            with db_timer("mongo", f"{coll.name}.find"):
+                docs = coll.find({"problem_id": {"$in": todo}},
+                                 {"_id": 0, "problem_id": 1, "curriculum.소단원": 1})
+                for d in docs:
+                    minor = (d.get("curriculum") or {}).get("소단원")
+                    if minor:
+                        out[d["problem_id"]] = minor
+        return out
+
+    def list(
+        self,
+        generated: bool = False,
+        major_unit: Optional[str] = None,
+        minor_unit: Optional[str] = None,
+        grade: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        origin_problem_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        summary: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """(문서 목록, next_cursor). next_cursor가 None이면 마지막 페이지."""
+        query: Dict[str, Any] = {}
+        if major_unit:
+            query["curriculum.대단원"] = major_unit
+        if minor_unit:
+            query["curriculum.소단원"] = minor_unit
+        if grade:
+            query["curriculum.학년"] = grade
+        if difficulty:
+            query["difficulty"] = difficulty
+        if origin_problem_id:
+            query["origin_problem_id"] = origin_problem_id
+        if cursor:
+            if not ObjectId.is_valid(cursor):
+                raise InvalidCursor(f"invalid cursor: {cursor}")
+            query["_id"] = {"$gt": ObjectId(cursor)}
+
+        limit = max(1, min(limit, MAX_LIMIT))
+        coll = self.generated if generated else self.problems
+        projection = dict(SUMMARY_PROJECTION) if summary else None  # 드라이버가 수정해도 원본 보존
+        # limit+1개를 읽어 다음 페이지 존재 여부 판단
+        with db_timer("mongo", f"{coll.name}.find"):
+            docs = list(coll.find(query, projection).sort("_id", 1).limit(limit + 1))
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = str(docs[-1]["_id"])
+        for d in docs:
+            d.pop("_id", None)
+        return docs, next_cursor
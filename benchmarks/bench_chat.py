@@ -0,0 +1,26 @@
+# benchmarks/bench_chat.py
+"""챗봇: 수업 중 같은 질문이 몰릴 때 single-flight 로 업스트림 호출이 얼마나 줄어드는지."""
+from __future__ import annotations
+import asyncio
+from fixtures import FakeOpenAI
+from harness import bench, size
+
+@bench(repeat=3, params={"distinct": [100, 5]})
+def burst(distinct):
+    # 동시 요청 100개(quick 20) 중 서로 다른 질문 수. distinct=100 이면 합칠 것이 없는 기준선
+    from app.models.chat import ChatMessage
+    from app.services.chat_service import ChatService
+    n = size(100, 20)
+    questions = [[ChatMessage(content=f"{i % distinct}번 문제 풀이를 설명해 주세요")] for i in range(n)]
+    with FakeOpenAI(base_latency=0.2) as fake:
+        svc = ChatService(model="bench", api_key=None)
+        svc.client = fake.client()
+
+        async def fire():
+            await asyncio.gather(*(svc.areply(q) for q in questions))
+
+        def run():
+            before = fake.requests
+            asyncio.run(fire())
+            return {"requests": n, "upstream": fake.requests - before}
+        yield run
@@ -0,0 +1,52 @@
+# benchmarks/bench_curriculum.py
+"""교육과정 후보 선택/로컬 분류기: 학습(중심 벡터 생성), 배치 채점 처리량, 라벨 검증."""
+from __future__ import annotations
+from fixtures import converted_problem, import_mathpix_script, mathpix_corpus, split_questions
+from harness import bench, size
+
+def _items(n: int):
+    mp = import_mathpix_script()
+    return [mp.parse_single_question(md, problem_id=f"q{i:05d}", origin_pdf="bench.pdf")
+            for i, md in enumerate(split_questions(mathpix_corpus(n)))]
+
+@bench(repeat=3, params={"examples": [0, 1000]})
+def fit(examples):
+    from app.services.curriculum import load_concepts
+    from app.services.curriculum_classifier import CurriculumClassifier
+    concepts = load_concepts()
+    train = [converted_problem(f"t{i:05d}") for i in range(size(examples, examples // 10))]
+
+    def run():
+        clf = CurriculumClassifier(concepts, train)
+        return {"concepts": len(concepts), "examples": clf.n_examples, "vocab": len(clf.tfidf.vocab)}
+    yield run
+
+@bench(repeat=5, params={"n": [100, 2000]})
+def predict(n):
+    from app.services.curriculum_classifier import get_classifier
+    clf = get_classifier()
+    items = _items(size(n, max(10, n // 20)))
+
+    def run():
+        import time
+        t0 = time.perf_counter()
+        preds = clf.predict(items)
+        dt = time.perf_counter() - t0
+        return {"items": len(items), "items_per_s": round(len(items) / dt),
+                "confident": sum(p.confident for p in preds)}
+    yield run
+
+@bench(repeat=5)
+def resolve_labels():
+    from app.services.curriculum_classifier import get_classifier
+    clf = get_classifier()
+    labels = [c.curriculum for c in clf.concepts] + [
+        {"대단원": "함수", "소단원": "일차함수", "학년": "중학교 3학년"},
+        {"대단원": "3. 함수", "소단원": "3.5", "학년": "2학년"},
+    ]
+    labels = labels * size(100, 10)
+
+    def run():
+        ok = sum(clf.resolve(l) is not None for l in labels)
+        return {"labels": len(labels), "real_concepts": ok}
+    yield run
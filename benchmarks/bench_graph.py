@@ -0,0 +1,109 @@
+# benchmarks/bench_graph.py
+"""선수 개념 그래프: CSV 파싱, Neo4j 적재 루프(가짜 드라이버), 선수 개념 폐포 질의, mmap 스냅샷."""
+from __future__ import annotations
+import contextlib, importlib, io, tempfile
+from collections import defaultdict, deque
+from pathlib import Path
+from fixtures import FakeNeo4jDriver, synthetic_graph, write_graph_csv
+from harness import bench, size
+
+@bench(repeat=5)
+def open_csv_flex():
+    # 엣지 CSV(cp949)는 utf-8-sig/utf-8 실패 후 세 번째 인코딩에서 디코딩(파일은 한 번만 읽음)
+    from app.services.curriculum import read_csv
+    with tempfile.TemporaryDirectory() as d:
+        _, e_path = write_graph_csv(*synthetic_graph(size(20, 2)), Path(d))
+
+        def run():
+            rows, _ = read_csv(e_path)
+            return {"rows": len(rows)}
+        yield run
+
+@bench(repeat=3, params={"latency": [0.0, 0.001]})
+def prereq_loaders(latency):
+    lpg = importlib.import_module("load_prereq_graph")
+    with tempfile.TemporaryDirectory() as d:
+        n_path, e_path = write_graph_csv(*synthetic_graph(size(4, 1)), Path(d))
+        orig = lpg.driver
+
+        def run():
+            lpg.driver = FakeNeo4jDriver(latency)
+            with contextlib.redirect_stdout(io.StringIO()):
+                lpg.load_nodes(n_path)
+                lpg.load_edges(e_path)
+            return {"queries": lpg.driver.queries}
+        try:
+            yield run
+        finally:
+            lpg.driver = orig
+
+@bench(repeat=5)
+def prereq_closure():
+    # 노드마다 모든 선수 개념(조상) 집합 — 워커가 파이썬 dict 그래프로 들고 있을 때의 기준선
+    nodes, edges = synthetic_graph(size(10, 2))
+    parents = defaultdict(list)
+    for s, t in edges:
+        parents[t].append(s)
+    names = [n["concept"] for n in nodes]
+
+    def run():
+        total = 0
+        for name in names:
+            seen, q = set(), deque([name])
+            while q:
+                for p in parents.get(q.popleft(), ()):
+                    if p not in seen:
+                        seen.add(p)
+                        q.append(p)
+            total += len(seen)
+        return {"nodes": len(names), "edges": len(edges), "ancestors": total}
+    yield run
+
+# ==================== 컴파일된 스냅샷 ====================
+def _snapshot_concepts(scale: int):
+    from app.services.curriculum import Concept
+    nodes, edges = synthetic_graph(scale)
+    # 코드만 있는 행은 synthetic_graph 에서 이미 전체 이름으로 치환됨 → 이름 있는 행만 개념으로
+    concepts = [Concept(n["concept"], n["unit"], n["grade"]) for n in nodes if " " in n["concept"]]
+    ids = {c.name: i for i, c in enumerate(concepts)}
+    return concepts, [(ids[s], ids[t]) for s, t in edges if s in ids and t in ids]
+
+@bench(repeat=3)
+def snapshot_build():
+    from app.services.graph_snapshot import compile_graph
+    concepts, edges = _snapshot_concepts(size(10, 2))
+
+    def run():
+        blob = compile_graph(concepts, edges, version=1)
+        return {"nodes": len(concepts), "edges": len(edges), "bytes": len(blob)}
+    yield run
+
+@bench(repeat=10)
+def snapshot_open():
+    # 워커 콜드 스타트: mmap + 헤더 파싱 + checksum 검증
+    from app.services.graph_snapshot import GraphSnapshot, compile_graph, write_snapshot
+    concepts, edges = _snapshot_concepts(size(10, 2))
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "g.snap"
+        write_snapshot(path, compile_graph(concepts, edges, version=1))
+
+        def run():
+            snap = GraphSnapshot.open(path)
+            return {"nodes": snap.n_nodes, "edges": snap.n_edges}
+        yield run
+
+@bench(repeat=5)
+def snapshot_closure():
+    # prereq_closure 와 같은 질의를 mmap CSR + 해시 인덱스로
+    from app.services.graph_snapshot import GraphSnapshot, compile_graph, write_snapshot
+    concepts, edges = _snapshot_concepts(size(10, 2))
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "g.snap"
+        write_snapshot(path, compile_graph(concepts, edges, version=1))
+        snap = GraphSnapshot.open(path)
+        names = [c.name for c in concepts]
+
+        def run():
+            total = sum(len(snap.ancestors(snap.id(name))) for name in names)
+            return {"nodes": len(names), "edges": snap.n_edges, "ancestors": total}
+        yield run
@@ -0,0 +1,92 @@
+# benchmarks/bench_images.py
+"""문제 그림: 변형 생성(WebP/PNG, 메타데이터 제거) 속도와 문제 1회 조회당 전송 바이트(원본 vs 변형 vs 재검증)."""
+from __future__ import annotations
+import random, tempfile
+from pathlib import Path
+from harness import bench, size
+
+FIGURES_PER_PROBLEM = 2
+
+def _figure(path: Path, seed: int, width: int = 1600, height: int = 1000) -> None:
+    # Mathpix 캡처와 비슷한 흰 바탕 도형(격자, 축, 곡선, 라벨) + EXIF/텍스트 메타데이터
+    from PIL import Image, ImageDraw
+    from PIL.PngImagePlugin import PngInfo
+    rnd = random.Random(seed)
+    im = Image.new("RGB", (width, height), "white")
+    d = ImageDraw.Draw(im)
+    for x in range(0, width, 80):
+        d.line([(x, 0), (x, height)], fill=(225, 225, 225))
+    for y in range(0, height, 80):
+        d.line([(0, y), (width, y)], fill=(225, 225, 225))
+    d.line([(80, height // 2), (width - 80, height // 2)], fill="black", width=3)
+    d.line([(width // 2, 80), (width // 2, height - 80)], fill="black", width=3)
+    a, b = rnd.uniform(-1, 1), rnd.uniform(-200, 200)
+    d.line([(x, height // 2 - (a * (x - width // 2) + b)) for x in range(80, width - 80, 8)], fill=(30, 60, 200), width=4)
+    for k in range(12):
+        d.text((rnd.randrange(width - 100), rnd.randrange(height - 40)), f"({k}, {rnd.randint(-9, 9)})", fill="black")
+    info = PngInfo()
+    info.add_text("Software", "mathpix-export " + "x" * 2000)
+    exif = Image.Exif()
+    exif[0x010E] = "figure " * 200   # ImageDescription
+    im.save(path, "PNG", pnginfo=info, exif=exif)
+
+def _figures(d: Path, n: int):
+    d.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(n):
+        p = d / f"fig{i:03d}.png"
+        _figure(p, i)
+        paths.append(p)
+    return paths
+
+@bench(repeat=3)
+def optimize():
+    from app.services.images import optimize_dir
+    n = size(20, 4)
+    with tempfile.TemporaryDirectory() as tmp:
+        img_dir = Path(tmp) / "images"
+        _figures(img_dir, n)
+
+        def run():
+            for p in (img_dir / "opt").glob("*"):
+                p.unlink()
+            manifest = optimize_dir(img_dir)
+            return {"images": len(manifest),
+                    "original_bytes": sum(e["bytes"] for e in manifest.values()),
+                    "variant_files": sum(len(e["variants"]) for e in manifest.values())}
+        yield run
+
+@bench(repeat=5, params={"client": ["original", "webp_480", "png_960", "revalidate"]})
+def bytes_per_view(client):
+    # 문제 1회 조회(그림 2장)에 /api/v1/images 가 내려주는 본문 바이트
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api.v1_images import router
+    from app.core.deps import get_image_store
+    from app.services.images import ImageStore, optimize_dir
+    with tempfile.TemporaryDirectory() as tmp:
+        img_dir = Path(tmp) / "images"
+        names = [p.name for p in _figures(img_dir, FIGURES_PER_PROBLEM)]
+        if client != "original":
+            optimize_dir(img_dir)
+        app = FastAPI()
+        app.include_router(router)
+        store = ImageStore(img_dir)
+        app.dependency_overrides[get_image_store] = lambda: store
+        http = TestClient(app)
+        accept = {"webp_480": "image/webp,image/*", "revalidate": "image/webp,image/*"}.get(client, "image/png,image/*")
+        width = {"webp_480": 480, "png_960": 960, "revalidate": 480}.get(client)
+        etags = {n: http.get(f"/api/v1/images/{n}", params={"w": width} if width else None,
+                             headers={"Accept": accept}).headers["etag"] for n in names}
+
+        def run():
+            total, statuses = 0, set()
+            for n in names:
+                headers = {"Accept": accept}
+                if client == "revalidate":
+                    headers["If-None-Match"] = etags[n]
+                r = http.get(f"/api/v1/images/{n}", params={"w": width} if width else None, headers=headers)
+                total += len(r.content)
+                statuses.add(r.status_code)
+            return {"bytes_per_view": total, "status": sorted(statuses)}
+        yield run
@@ -0,0 +1,26 @@
+# benchmarks/bench_ingest.py
+"""Mathpix 마크다운 → 문항 JSON 파싱(sat_mathpix_single.parse_single_question)."""
+from __future__ import annotations
+from fixtures import import_mathpix_script, mathpix_corpus, split_questions
+from harness import bench, size
+
+@bench(repeat=5)
+def parse_corpus():
+    mp = import_mathpix_script()
+    docs = split_questions(mathpix_corpus(size(1000, 50)))
+
+    def run():
+        for i, md in enumerate(docs):
+            mp.parse_single_question(md, problem_id=f"q{i}", origin_pdf="bench.pdf")
+        return {"questions": len(docs)}
+    yield run
+
+@bench(repeat=5)
+def strip_meta_and_images():
+    mp = import_mathpix_script()
+    docs = split_questions(mathpix_corpus(size(1000, 50)))
+
+    def run():
+        for md in docs:
+            mp.extract_images(mp.strip_meta(md))  # 상대 경로 이미지만 있어 다운로드 없음
+    yield run
@@ -0,0 +1,84 @@
+# benchmarks/bench_knowledge_tracing.py
+"""학생 숙달도(BKT) 배치 갱신과 다음 개념 추천 — 실제 선수 개념 그래프를 155개념으로 늘린 스냅샷."""
+from __future__ import annotations
+import tempfile
+from pathlib import Path
+import numpy as np
+from harness import bench, size
+
+N_CONCEPTS = 155
+
+def _snapshot(d: str, n: int = N_CONCEPTS):
+    # 실제 개념/엣지(89개념)를 이어 붙여 n개념으로, 복제본 사이는 직전 복제본의 같은 개념에서 선행
+    from app.services.curriculum import EDGES_CSV, Concept, load_concepts, read_csv_rows
+    from app.services.graph_snapshot import GraphSnapshot, compile_graph, resolve_edges, write_snapshot
+    base = load_concepts()
+    base_edges, _ = resolve_edges(base, read_csv_rows(EDGES_CSV))
+    concepts, edges, k = [], [], 0
+    while len(concepts) < n:
+        off = len(concepts)
+        concepts += [Concept(c.name + (f" #{k}" if k else ""), c.unit, c.grade) for c in base]
+        edges += [(s + off, t + off) for s, t in base_edges]
+        if k:
+            edges += [(off - len(base) + i, off + i) for i in range(len(base))]
+        k += 1
+    concepts = concepts[:n]
+    path = Path(d) / "g.snap"
+    write_snapshot(path, compile_graph(concepts, [(s, t) for s, t in edges if s < n and t < n], version=1))
+    return GraphSnapshot.open(path)
+
+@bench(repeat=5, params={"answers_per_student": [1, N_CONCEPTS]})
+def update(answers_per_student):
+    # 학생 10k(quick 1k) × 문항 배치 한 번. answers_per_student=155 면 전 개념 응답(학생 × 개념 전체 갱신)
+    from app.services.knowledge_tracing import KnowledgeTracer
+    n_students = size(10_000, 1_000)
+    rnd = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as d:
+        snap = _snapshot(d)
+        kt = KnowledgeTracer(snap, capacity=n_students)
+        rows = kt.rows([f"s{i:05d}" for i in range(n_students)])
+        r = np.repeat(rows, answers_per_student)
+        c = (rnd.permuted(np.tile(np.arange(snap.n_nodes), (n_students, 1)), axis=1)[:, :answers_per_student]
+             .reshape(-1))
+        ok = rnd.random(len(r)) < 0.6
+
+        def run():
+            import time
+            t0 = time.perf_counter()
+            kt.update(r, c, ok)
+            dt = time.perf_counter() - t0
+            return {"students": n_students, "concepts": snap.n_nodes, "answers": len(r),
+                    "answers_per_s": round(len(r) / dt)}
+        yield run
+
+@bench(repeat=5)
+def update_repeats():
+    # 같은 학생이 같은 개념을 여러 번 푼 배치(순서대로 라운드 분할)
+    from app.services.knowledge_tracing import KnowledgeTracer
+    n_students = size(10_000, 1_000)
+    rnd = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as d:
+        snap = _snapshot(d)
+        kt = KnowledgeTracer(snap, capacity=n_students)
+        rows = kt.rows([f"s{i:05d}" for i in range(n_students)])
+        r = np.repeat(rows, 20)
+        c = rnd.integers(0, 10, len(r))   # 학생당 20문항이 앞쪽 10개념에 몰림
+        ok = rnd.random(len(r)) < 0.6
+
+        def run():
+            kt.update(r, c, ok)
+            return {"answers": len(r)}
+        yield run
+
+@bench(repeat=5)
+def recommend():
+    from app.services.knowledge_tracing import KnowledgeTracer
+    with tempfile.TemporaryDirectory() as d:
+        snap = _snapshot(d)
+        kt = KnowledgeTracer(snap)
+        kt.observe([(f"s{i % 100}", i % snap.n_nodes, i % 3 != 0) for i in range(5000)])
+        ids = [f"s{i}" for i in range(100)]
+
+        def run():
+            return {"students": len(ids), "recommended": sum(len(kt.recommend(s, 5)) for s in ids)}
+        yield run
@@ -0,0 +1,23 @@
+# benchmarks/bench_load.py
+"""scripts/load_to_mongo.main: 검증 + upsert (mongomock 기본, BENCH_MONGODB_URI 로 실제 mongod)."""
+from __future__ import annotations
+import contextlib, importlib, io, json, tempfile
+from pathlib import Path
+from fixtures import converted_problem, mongo
+from harness import bench, size
+
+@bench(repeat=3)
+def load_to_mongo():
+    n = size(2000, 100)
+    with tempfile.TemporaryDirectory() as d, mongo("bench_load") as m:
+        out_dir = Path(d)
+        docs = [converted_problem(f"p{i:06d}") for i in range(n)]
+        (out_dir / "converted_with_schema.json").write_text(json.dumps(docs, ensure_ascii=False), encoding="utf-8")
+        ltm = importlib.import_module("load_to_mongo")
+
+        def run():
+            m.problems.drop()
+            with contextlib.redirect_stdout(io.StringIO()):
+                ltm.main(out_dir)
+            return {"docs": n}
+        yield run
@@ -0,0 +1,92 @@
+# benchmarks/bench_problem_schema.py
+"""
+변환 문항 스키마 검증 비용 측정.
+  python benchmarks/bench_problem_schema.py --n 10000
+
+같은 문항 N개에 대해
+  - 기존 수기 키 검사 루프
+  - Pydantic 일괄 검증(validate_many) / 문항별 model_validate
+  - JSON 직렬화 + 디스크 쓰기/읽기(I/O 기준선)
+을 비교한다. 검증 비용이 I/O 대비 무시할 수준인지 확인하는 용도.
+"""
+from __future__ import annotations
+import argparse, json, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.models.problem import ConvertedProblem, validate_many
+from harness import bench, size
+
+def make_problems(n: int) -> list[dict]:
+    out = []
+    for i in range(n):
+        out.append({
+            "problem_id": f"{i:08x}",
+            "korean_problem": f"한 마트에서 사과 한 개의 가격은 {25 + i % 7}원이고, 포장 비용은 30원입니다. " * 3,
+            "english_problem": f"At a store, the price of one apple is {25 + i % 7} won. " * 3,
+            "korean_solution": "사과 한 개의 가격이 25원이므로 ... 따라서 총 비용은 80원입니다. " * 5,
+            "english_solution": "The price of one apple is 25 won, so ... the total cost is 80 won. " * 5,
+            "choices": {"A": "50원", "B": "57원", "C": "80원", "D": "110원"},
+            "answer": "ABCD"[i % 4],
+            "curriculum": {"대단원": "함수", "소단원": "일차함수", "학년": "중학교 3학년"},
+            "difficulty": ("Easy", "Medium", "Hard")[i % 3],
+        })
+    return out
+
+def legacy_check(data: dict) -> None:
+    # transform_problem 의 예전 검증 루프
+    for k in ["problem_id","korean_problem","english_problem","korean_solution",
+              "english_solution","choices","answer","curriculum","difficulty"]:
+        if k not in data:
+            raise ValueError(k)
+    for k in ["A","B","C","D"]:
+        if k not in data["choices"]:
+            raise ValueError(k)
+    for k in ["대단원","소단원","학년"]:
+        if k not in data["curriculum"]:
+            raise ValueError(k)
+
+def timeit(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+@bench(repeat=5)
+def validate_10k():
+    items = make_problems(size(10_000, 1_000))
+    yield lambda: {"valid": len(validate_many(items)[0])}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    items = make_problems(args.n)
+    validate_many(items[:10])  # 어댑터 워밍업
+
+    def io_roundtrip():
+        with tempfile.TemporaryDirectory() as d:
+            p = Path(d) / "converted_with_schema.json"
+            p.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+            json.loads(p.read_text(encoding="utf-8"))
+
+    rows = [
+        ("legacy key loop",        timeit(lambda: [legacy_check(d) for d in items], args.repeat)),
+        ("validate_many (bulk)",   timeit(lambda: validate_many(items), args.repeat)),
+        ("model_validate (each)",  timeit(lambda: [ConvertedProblem.model_validate(d) for d in items], args.repeat)),
+        ("json dump+write+read",   timeit(io_roundtrip, args.repeat)),
+    ]
+    io_cost = rows[-1][1]
+    print(f"n={args.n} (best of {args.repeat})")
+    for name, sec in rows:
+        print(f"  {name:<24} {sec*1000:9.2f} ms   {sec/io_cost:6.2f}x I/O")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_problems_api.py
+"""
+문제 조회 API(ProblemRepository / CachedProblemRepository) 지연시간.
+  python benchmarks/run.py -k problems_api
+  BENCH_MONGODB_URI=mongodb://localhost:27017/bench_problems python benchmarks/run.py -k problems_api
+
+인덱스 효과(필터/커서 페이지 vs skip)는 실제 mongod 로 재야 의미가 있다. mongomock 은 인덱스를 쓰지 않고
+전체를 훑으므로 기본 실행 값은 회귀 확인용 상대 비교로만 본다.
+BENCH_MONGODB_URI 의 DB 는 problems/generated_problems/meta 를 비우고 합성 문서를 넣으므로 운영 DB를 가리키지 말 것.
+"""
+from __future__ import annotations
+import json, random
+from fixtures import mongo
+from harness import bench, size
+
+UNITS = {
+    "수와 연산": ["소인수분해", "정수와 유리수", "제곱근과 실수"],
+    "문자와 식": ["일차방정식", "연립방정식", "일차부등식"],
+    "함수": ["일차함수", "이차함수", "정비례와 반비례"],
+    "기하": ["삼각형의 성질", "피타고라스 정리", "원의 성질"],
+    "확률과 통계": ["경우의 수", "확률", "대푯값과 산포도"],
+}
+GRADES = ["중학교 1학년", "중학교 2학년", "중학교 3학년"]
+DIFFS = ["Easy", "Medium", "Hard"]
+PAGE = 50
+
+def make_doc(i: int, rnd: random.Random) -> dict:
+    major = rnd.choice(list(UNITS))
+    return {
+        "problem_id": f"{i:08x}",
+        "type": "original",
+        "korean_problem": f"문항 {i}: 버스 요금이 1250원일 때 ... " * 4,
+        "english_problem": f"Problem {i}: when the bus fare is 1250 won ... " * 4,
+        "korean_solution": "풀이: ... 따라서 답은 C입니다. " * 30,
+        "english_solution": "Solution: ... therefore the answer is C. " * 30,
+        "choices": {"A": "1", "B": "2", "C": "3", "D": "4"},
+        "answer": "C",
+        "curriculum": {"대단원": major, "소단원": rnd.choice(UNITS[major]), "학년": rnd.choice(GRADES)},
+        "difficulty": rnd.choice(DIFFS),
+        "source_file": "bench.json",
+        "created_at": "2025-01-01T00:00:00Z",
+    }
+
+def _payload(items) -> dict:
+    return {"page_bytes": len(json.dumps(items, ensure_ascii=False).encode("utf-8"))}
+
+@bench(repeat=20, params={"query": ["first_page_summary", "first_page_full", "filter_major_difficulty",
+                                    "filter_minor_grade", "deep_page_cursor", "deep_page_skip",
+                                    "get_by_id", "get_json_cached"]})
+def lookup(query):
+    n = size(20_000, 1000)
+    depth = size(10, 2)   # 깊은 페이지 = depth + 1 번째
+    with mongo("bench_problems") as m:
+        from app.services.problem_cache import CachedProblemRepository, ProblemCache
+        from app.services.problem_repository import ProblemRepository
+
+        rnd = random.Random(0)
+        for s in range(0, n, 10_000):
+            m.problems.insert_many([make_doc(i, rnd) for i in range(s, min(s + 10_000, n))])
+        m.ensure_indexes()
+        repo = ProblemRepository(m.problems, m.generated)
+        cached = CachedProblemRepository(repo, ProblemCache(), version_fn=m.problems_version)
+        hot_id = f"{n // 2:08x}"
+        cursor = None
+        for _ in range(depth):
+            _, cursor = repo.list(major_unit="함수", limit=PAGE, cursor=cursor)
+
+        cases = {
+            "first_page_summary":      lambda: repo.list(limit=PAGE),
+            "first_page_full":         lambda: repo.list(limit=PAGE, summary=False),
+            "filter_major_difficulty": lambda: repo.list(major_unit="함수", difficulty="Hard", limit=PAGE),
+            "filter_minor_grade":      lambda: repo.list(minor_unit="이차함수", grade="중학교 3학년", limit=PAGE),
+            "deep_page_cursor":        lambda: repo.list(major_unit="함수", limit=PAGE, cursor=cursor),
+            # 비교 기준: 커서 도입 전의 skip/limit
+            "deep_page_skip":          lambda: list(m.problems.find({"curriculum.대단원": "함수"})
+                                                    .sort("_id", 1).skip(depth * PAGE).limit(PAGE)),
+            "get_by_id":               lambda: repo.get(hot_id),
+            "get_json_cached":         lambda: cached.get_json(hot_id),
+        }
+        fn = cases[query]
+        extra = {"docs": n}
+        if query.startswith("first_page"):
+            extra.update(_payload(fn()[0]))
+
+        def run():
+            fn()
+            return extra
+        yield run
@@ -0,0 +1,75 @@
+# benchmarks/bench_transform.py
+"""ai_transformer: 프롬프트 생성, call_chat_json/transform_problem (가짜 OpenAI 서버 상대)."""
+from __future__ import annotations
+from fixtures import FakeOpenAI, approx_tokens, import_mathpix_script, import_transformer, mathpix_corpus, split_questions
+from harness import bench, size
+
+def _items(n: int):
+    mp = import_mathpix_script()
+    return [mp.parse_single_question(md, problem_id=f"q{i:05d}", origin_pdf="bench.pdf")
+            for i, md in enumerate(split_questions(mathpix_corpus(n)))]
+
+@bench(repeat=5, params={"top_k": [0, 12]})
+def build_prompt(top_k):
+    # top_k=0: 전체 교육과정(기준선), 12: 문항별 후보만
+    tr = import_transformer()
+    items = _items(size(1000, 50))
+
+    def run():
+        tokens = sum(approx_tokens(s) + approx_tokens(u) for s, u in (tr.build_prompt(it, top_k) for it in items))
+        return {"prompts": len(items), "avg_prompt_tokens": tokens // len(items)}
+    yield run
+
+# mode -> (CURRICULUM_TOP_K, PREFILL_CURRICULUM)
+_PROMPT_MODES = {"full": (0, False), "pruned": (12, False), "prefill": (12, True)}
+
+@bench(repeat=3, params={"mode": list(_PROMPT_MODES)})
+def transform_prompt_size(mode):
+    # 실제 API처럼 입력 토큰에 비례하는 지연(0.2ms/token)을 주고
+    # 전체 교육과정 / 후보 top-k / 분류기 확신 시 교육과정 확정 세 경우의 종단 지연 비교
+    tr = import_transformer()
+    items = _items(size(30, 5))
+    with FakeOpenAI(base_latency=0.02, per_token_latency=0.0002) as fake:
+        orig = tr.client, tr.CURRICULUM_TOP_K, tr.PREFILL_CURRICULUM
+        tr.client = fake.client()
+        tr.CURRICULUM_TOP_K, tr.PREFILL_CURRICULUM = _PROMPT_MODES[mode]
+        try:
+            def run():
+                r0, t0 = fake.requests, fake.prompt_tokens
+                for it in items:
+                    tr.transform_problem(it)
+                return {"problems": len(items), "avg_prompt_tokens": (fake.prompt_tokens - t0) // (fake.requests - r0)}
+            yield run
+        finally:
+            tr.client, tr.CURRICULUM_TOP_K, tr.PREFILL_CURRICULUM = orig
+
+@bench(repeat=3, params={"latency": [0.0, 0.05]})
+def transform_problem(latency):
+    tr = import_transformer()
+    items = _items(size(50, 5))
+    with FakeOpenAI(base_latency=latency) as fake:
+        orig, tr.client = tr.client, fake.client()
+        try:
+            def run():
+                for it in items:
+                    tr.transform_problem(it)
+                return {"problems": len(items), "upstream_requests": fake.requests}
+            yield run
+        finally:
+            tr.client = orig
+
+@bench(repeat=3)
+def call_chat_json_with_errors():
+    # 오류율 20% → call_chat_json 재시도(0.8s 백오프) 비용 확인
+    tr = import_transformer()
+    items = _items(size(10, 3))
+    with FakeOpenAI(error_rate=0.2, seed=1) as fake:
+        orig, tr.client = tr.client, fake.client()
+        try:
+            def run():
+                for it in items:
+                    tr.call_chat_json(*tr.build_prompt(it))
+                return {"calls": len(items), "upstream_requests": fake.requests}
+            yield run
+        finally:
+            tr.client = orig
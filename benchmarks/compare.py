@@ -0,0 +1,38 @@
+# benchmarks/compare.py
+"""
+두 결과 파일 비교.
+  python benchmarks/compare.py benchmarks/results/abc123.json benchmarks/results/def456.json --threshold 0.1
+median 기준 new/base 비율을 출력하고, threshold 이상 느려진 케이스가 있으면 종료 코드 1.
+"""
+from __future__ import annotations
+import argparse, json, sys
+from pathlib import Path
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("base", type=Path)
+    ap.add_argument("new", type=Path)
+    ap.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 상대 증가율(0.1 = +10%%)")
+    args = ap.parse_args()
+
+    base = json.loads(args.base.read_text(encoding="utf-8"))
+    new = json.loads(args.new.read_text(encoding="utf-8"))
+    print(f"base={base['meta']['commit']}  new={new['meta']['commit']}")
+
+    regressions = 0
+    for name in sorted(set(base["results"]) | set(new["results"])):
+        b, n = base["results"].get(name), new["results"].get(name)
+        if not b or not n:
+            print(f"  {name:<48} {'(only in ' + ('new' if n else 'base') + ')':>24}")
+            continue
+        ratio = n["median"] / b["median"] if b["median"] else float("inf")
+        mark = ""
+        if ratio > 1 + args.threshold:
+            mark, regressions = "  REGRESSION", regressions + 1
+        elif ratio < 1 - args.threshold:
+            mark = "  faster"
+        print(f"  {name:<48} {b['median']*1000:10.2f} -> {n['median']*1000:10.2f} ms  x{ratio:5.2f}{mark}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
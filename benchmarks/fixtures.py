@@ -0,0 +1,328 @@
+# benchmarks/fixtures.py
+"""
+벤치마크용 합성 픽스처(외부 서비스 없이 재현 가능하도록).
+- mathpix_corpus(): 여러 문항이 이어 붙은 Mathpix 마크다운
+- FakeOpenAI: JSON 모드 chat.completions 를 흉내 내는 로컬 HTTP 서버(지연/오류율 주입)
+- mongo(): mongomock(기본) 또는 BENCH_MONGODB_URI 의 로컬 mongod
+- Flaky: pymongo 컬렉션/클라이언트에 지연·오류 주입
+- FakeNeo4jDriver: session().run() 호출 수를 세고 지연·오류를 주입하는 드라이버
+- synthetic_graph(): data/neo4j_*.csv 를 scale 배로 복제한 커리큘럼 그래프
+"""
+from __future__ import annotations
+import contextlib, csv, importlib, io, json, os, random, re, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = ROOT / "data"
+SCRIPTS_DIR = ROOT / "scripts"
+for p in (ROOT, SCRIPTS_DIR):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+# ==================== 모듈 임포트(환경변수 더미) ====================
+def import_mathpix_script():
+    os.environ.setdefault("MATHPIX_APP_ID", "bench-app-id")
+    os.environ.setdefault("MATHPIX_APP_KEY", "bench-app-key")
+    with contextlib.redirect_stdout(io.StringIO()):
+        return importlib.import_module("sat_mathpix_single")
+
+def import_transformer():
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    with contextlib.redirect_stdout(io.StringIO()):
+        return importlib.import_module("app.services.ai_transformer")
+
+# ==================== Mathpix 마크다운 코퍼스 ====================
+_STEMS = [
+    "The function $f$ is defined by $f(x)={a} x+{b}$. What is the value of $f(x)$ when $x={c}$ ?",
+    "A bus fare is ${a}$ dollars plus ${b}$ dollars per mile. How much does a {c}-mile ride cost?",
+    "If ${a} x-{b}={c}$, what is the value of $x$ ?",
+    "The line $y={a} x+{b}$ intersects the $y$-axis at which point when shifted up by {c} ?",
+    "A rectangle has length ${a}$ and width ${b}$. What is its area after adding {c} to each side?",
+]
+
+def mathpix_question(qid: str, rnd: random.Random, with_image: bool = False) -> str:
+    a, b, c = rnd.randint(2, 40), rnd.randint(1, 60), rnd.randint(1, 9)
+    stem = rnd.choice(_STEMS).format(a=a, b=b, c=c)
+    ans = a * c + b
+    opts = sorted({ans, ans + a, ans - b, ans + c + 7})
+    while len(opts) < 4:
+        opts.append(opts[-1] + 1)
+    letter = "ABCD"[opts.index(ans)]
+    img = f"\n![](images/{qid}_fig1.jpg)\n" if with_image else ""
+    diff = rnd.choice(["Easy", "Medium", "Hard"])
+    return (
+        "| Assessment | Test | Domain | Skill | Difficulty |\n"
+        "| :--- | :--- | :--- | :--- | :--- |\n"
+        "| SAT | Math | Algebra | Linear functions | $\\square$ |\n\n"
+        f"## ID: {qid}\n\n{stem}{img}\n\n"
+        + "".join(f"{l}. {v}\n" for l, v in zip("ABCD", opts))
+        + f"\n## ID: {qid} Answer\n\nCorrect Answer: {letter}\n\n"
+        f"## Rationale\n\nChoice {letter} is correct. Substituting {c} for $x$ yields {ans}.\n"
+        + "".join(f"Choice {l} is incorrect. This is the value of {v}.\n" for l, v in zip("ABCD", opts) if l != letter)
+        + f"\nQuestion Difficulty: {diff}\n"
+    )
+
+def mathpix_corpus(n: int, seed: int = 0, image_ratio: float = 0.2) -> str:
+    rnd = random.Random(seed)
+    return "\n\n".join(
+        mathpix_question(f"{rnd.getrandbits(32):08x}", rnd, with_image=rnd.random() < image_ratio)
+        for _ in range(n)
+    )
+
+_SPLIT_RE = re.compile(r"(?m)^(?=\| Assessment \|)")
+
+def split_questions(md: str) -> List[str]:
+    """코퍼스를 문항 단위 문서로 분리(sat_mathpix_single 은 한 문서 = 한 문항)."""
+    return [part for part in _SPLIT_RE.split(md) if part.strip()]
+
+# ==================== 가짜 OpenAI 서버 ====================
+_PID_RE = re.compile(r"\[문항 ID\]\s*(\S+)")
+
+def converted_problem(problem_id: str) -> dict:
+    return {
+        "problem_id": problem_id,
+        "korean_problem": "한 마트에서 사과 한 개의 가격은 25원이고, 포장 비용은 30원입니다. 사과 2개를 구매할 때 총 비용은 얼마입니까?",
+        "english_problem": "At a store, one apple costs 25 won and packaging costs 30 won. What is the total for 2 apples?",
+        "korean_solution": "사과 2개의 가격은 25원 × 2 = 50원이고, 포장 비용 30원을 더하면 80원입니다.",
+        "english_solution": "Two apples cost 25 × 2 = 50 won; adding 30 won packaging gives 80 won.",
+        "choices": {"A": "50원", "B": "57원", "C": "80원", "D": "110원"},
+        "answer": "C",
+        "curriculum": {"대단원": "3. 함수", "소단원": "3.5 일차함수의 뜻과 그래프", "학년": "2학년"},
+        "difficulty": "Easy",
+    }
+
+def approx_tokens(text: str) -> int:
+    # tiktoken 없이 쓰는 근사치: 영문 ~4자/토큰, 한글 ~1자/토큰
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+class _BurstHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256   # 기본 backlog(5)면 동시 요청 수십 개에서 연결이 리셋됨
+
+class FakeOpenAI:
+    """
+    POST /v1/chat/completions 만 구현한 로컬 서버.
+    latency = base_latency + per_token_latency * prompt_tokens (실제 API처럼 입력 길이에 비례)
+    error_rate 확률로 500 응답.
+    """
+
+    def __init__(self, base_latency: float = 0.0, per_token_latency: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0) -> None:
+        self.base_latency = base_latency
+        self.per_token_latency = per_token_latency
+        self.error_rate = error_rate
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *a):  # 조용히
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                messages = body.get("messages") or []
+                prompt = "\n".join(str(m.get("content", "")) for m in messages)
+                tokens = approx_tokens(prompt)
+                with fake._lock:
+                    fake.requests += 1
+                    fake.prompt_tokens += tokens
+                    fail = fake._rnd.random() < fake.error_rate
+                time.sleep(fake.base_latency + fake.per_token_latency * tokens)
+                if fail:
+                    self._send(500, {"error": {"message": "injected failure", "type": "server_error"}})
+                    return
+                m = _PID_RE.search(prompt)
+                content = json.dumps(converted_problem(m.group(1) if m else "unknown"), ensure_ascii=False)
+                self._send(200, {
+                    "id": "chatcmpl-bench", "object": "chat.completion", "created": 0,
+                    "model": body.get("model", "gpt-4o"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": tokens, "completion_tokens": approx_tokens(content),
+                              "total_tokens": tokens + approx_tokens(content)},
+                })
+
+            def _send(self, status: int, payload: dict):
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def __enter__(self) -> "FakeOpenAI":
+        self._server = _BurstHTTPServer(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def client(self):
+        from openai import OpenAI
+        # SDK 자체 재시도는 끄고 call_chat_json 의 재시도만 측정
+        return OpenAI(api_key="sk-bench", base_url=self.base_url, max_retries=0)
+
+# ==================== Mongo ====================
+@contextlib.contextmanager
+def mongo(db_name: str = "bench") -> Iterator[object]:
+    """app.db.mongo 모듈을 돌려준다. BENCH_MONGODB_URI 가 있으면 실제 mongod, 없으면 mongomock."""
+    uri = os.getenv("BENCH_MONGODB_URI")
+    if uri:
+        os.environ["MONGODB_URI"] = uri
+        patch = contextlib.nullcontext()
+    else:
+        import mongomock
+        os.environ["MONGODB_URI"] = f"mongodb://localhost:27017/{db_name}"
+        patch = mongomock.patch(servers=(("localhost", 27017),))
+    with patch:
+        from app.db import mongo as m
+        for coll in (m.problems, m.generated, m.meta):
+            coll.drop()
+        yield m
+
+class Flaky:
+    """
+    pymongo 객체(클라이언트/컬렉션) 프록시. methods 에 든 메서드 호출 시 latency 대기 + error_rate 확률로 실패.
+    wrap 에 든 속성(client.admin 등)은 같은 설정으로 다시 감싼다.
+    """
+
+    def __init__(self, target, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+                 methods=("find", "find_one", "command", "update_one", "insert_one", "find_one_and_update"),
+                 wrap=("admin",)) -> None:
+        self._target = target
+        self._latency = latency
+        self._error_rate = error_rate
+        self._rnd = random.Random(seed)
+        self._methods = frozenset(methods)
+        self._wrap = frozenset(wrap)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name in self._wrap:
+            return Flaky(attr, self._latency, self._error_rate, self._rnd.random(), self._methods, self._wrap)
+        if name not in self._methods:
+            return attr
+
+        def call(*a, **kw):
+            if self._latency:
+                time.sleep(self._latency)
+            if self._error_rate and self._rnd.random() < self._error_rate:
+                raise InjectedFailure(f"injected mongo failure: {name}")
+            return attr(*a, **kw)
+        return call
+
+# ==================== Neo4j ====================
+class InjectedFailure(RuntimeError):
+    pass
+
+class FakeNeo4jDriver:
+    """driver.session().run() / verify_connectivity() 만 흉내. 호출당 latency 초 대기, error_rate 확률로 실패."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.queries = 0
+        self._rnd = random.Random(seed)
+
+    def _call(self) -> None:
+        self.queries += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self._rnd.random() < self.error_rate:
+            raise InjectedFailure("injected neo4j failure")
+
+    def session(self):
+        return _FakeSession(self)
+
+    def verify_connectivity(self):
+        self._call()
+
+    def close(self):
+        pass
+
+class _FakeSession:
+    def __init__(self, driver: FakeNeo4jDriver) -> None:
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, params=None, **kw):
+        self.driver._call()
+        return _FakeResult()
+
+class _FakeResult:
+    def data(self):
+        return []
+
+def synthetic_graph(scale: int, seed: int = 0) -> Tuple[List[dict], List[Tuple[str, str]]]:
+    """
+    실제 커리큘럼(neo4j_nodes/edges.csv)을 scale 벌 복제하고, 복제본 사이를 느슨하게 연결.
+    반환: (nodes [{concept, unit, grade}], edges [(src, dst)])
+    """
+    base_nodes = _read_rows(DATA_DIR / "neo4j_nodes.csv")
+    base_edges = _read_rows(DATA_DIR / "neo4j_edges.csv")
+    names = [r["concept"] for r in base_nodes]
+    by_code = {n.split(" ", 1)[0]: n for n in names}
+    rnd = random.Random(seed)
+    nodes, edges = [], []
+    for k in range(scale):
+        suffix = "" if k == 0 else f" #{k}"
+        for r in base_nodes:
+            nodes.append({"concept": r["concept"] + suffix, "unit": r["unit"], "grade": r["grade"]})
+        for r in base_edges:
+            src = by_code.get(r["source"], r["source"])
+            edges.append((src + suffix, r["target"] + suffix))
+        if k:
+            prev = "" if k == 1 else f" #{k - 1}"
+            for _ in range(len(names) // 10):
+                edges.append((rnd.choice(names) + prev, rnd.choice(names) + suffix))
+    return nodes, edges
+
+def write_graph_csv(nodes: List[dict], edges: List[Tuple[str, str]], out_dir: Path,
+                    edges_encoding: str = "cp949") -> Tuple[Path, Path]:
+    """load_prereq_graph 입력 형식으로 저장(엣지는 실제 파일처럼 cp949)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_path, e_path = out_dir / "neo4j_nodes.csv", out_dir / "neo4j_edges.csv"
+    with open(n_path, "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["concept", "unit", "grade"])
+        for n in nodes:
+            w.writerow([n["concept"], n["unit"], n["grade"]])
+    with open(e_path, "w", encoding=edges_encoding, newline="", errors="replace") as f:
+        w = csv.writer(f)
+        w.writerow(["source", "target", "type"])
+        for s, d in edges:
+            w.writerow([s, d, "PRECEDES"])
+    return n_path, e_path
+
+def _read_rows(path: Path) -> List[Dict[str, str]]:
+    raw = path.read_bytes()
+    for enc in ("utf-8-sig", "cp949"):
+        try:
+            text = raw.decode(enc)
+            break
+        except UnicodeDecodeError:
+            continue
+    return list(csv.DictReader(io.StringIO(text)))
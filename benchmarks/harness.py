@@ -0,0 +1,70 @@
+# benchmarks/harness.py
+"""
+asv 스타일 미니 하니스.
+
+    @bench(repeat=5, params={"latency": [0.0, 0.05]})
+    def transform(latency):
+        ...준비...              # setup (측정 제외)
+        yield lambda: run()     # 측정 대상. dict 를 반환하면 extra 로 기록
+        ...정리...              # teardown (with 블록 종료 포함)
+
+run.py 가 benchmarks/bench_*.py 를 임포트해 CASES 를 실행하고 결과를 JSON 으로 남긴다.
+"""
+from __future__ import annotations
+import itertools, statistics, time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+QUICK = False  # run.py --quick: 입력 크기 축소
+
+def size(full: int, quick: int) -> int:
+    return quick if QUICK else full
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable
+    repeat: int = 5
+    warmup: int = 1
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+CASES: List[Case] = []
+
+def bench(name: Optional[str] = None, repeat: int = 5, warmup: int = 1,
+          params: Optional[Dict[str, list]] = None):
+    def deco(fn):
+        base = name or f"{fn.__module__.split('.')[-1].removeprefix('bench_')}.{fn.__name__}"
+        grid = params or {}
+        keys = list(grid)
+        for combo in itertools.product(*(grid[k] for k in keys)) if keys else [()]:
+            kwargs = dict(zip(keys, combo))
+            suffix = "(" + ",".join(f"{k}={v}" for k, v in kwargs.items()) + ")" if kwargs else ""
+            CASES.append(Case(base + suffix, fn, repeat, warmup, kwargs))
+        return fn
+    return deco
+
+def run_case(case: Case) -> Dict[str, Any]:
+    gen = case.fn(**case.kwargs)
+    target = next(gen) if hasattr(gen, "__next__") else gen
+    try:
+        extra = None
+        for _ in range(case.warmup):
+            target()
+        times = []
+        for _ in range(case.repeat):
+            t0 = time.perf_counter()
+            out = target()
+            times.append(time.perf_counter() - t0)
+            if isinstance(out, dict):
+                extra = out
+        return {
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.fmean(times),
+            "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "repeat": case.repeat,
+            "extra": extra,
+        }
+    finally:
+        if hasattr(gen, "close"):
+            gen.close()
@@ -0,0 +1,220 @@
+# benchmarks/loadtest.py
+"""
+FastAPI 앱 부하 테스트(외부 백엔드 없이).
+별도 프로세스에서 app.main 을 uvicorn 워커 1개로 띄우고 OpenAI / Mongo / Neo4j 를 그 프로세스 안의 대역으로 바꾼 뒤,
+라우트별 고정 RPS(open-loop)로 요청을 보내 처리량과 지연시간 분위수를 보고한다.
+
+  python benchmarks/loadtest.py --duration 30
+  python benchmarks/loadtest.py --rps chat=20,problem_get=200 --openai-latency 2.0 --threadpool 80
+  python benchmarks/loadtest.py --only chat,health --openai-error-rate 0.05 --json out/loadtest.json
+
+대역:
+  OpenAI  fixtures.FakeOpenAI (로컬 HTTP, --openai-latency/--openai-error-rate)
+  Mongo   mongomock + fixtures.Flaky (--mongo-latency/--mongo-error-rate)
+  Neo4j   fixtures.FakeNeo4jDriver (--neo4j-latency/--neo4j-error-rate)
+부하 생성기는 부모 프로세스에서 돌아 워커와 GIL을 나눠 쓰지 않는다. mongomock 은 실제 mongod 보다 CPU를 많이 쓰므로
+Mongo 위주 라우트의 절대값은 보수적으로 볼 것.
+"""
+from __future__ import annotations
+import argparse, asyncio, contextlib, json, multiprocessing, os, random, re, socket, sys, time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+from fixtures import FakeNeo4jDriver, FakeOpenAI, Flaky, converted_problem
+
+N_PROBLEMS = 1000
+
+# name -> (method, path 또는 path 생성 함수, JSON body)
+ROUTES = {
+    "health":        ("GET", "/health", None),
+    "mongo_health":  ("GET", "/api/health/mongo", None),
+    "neo4j_health":  ("GET", "/api/health/neo4j", None),
+    "problems_list": ("GET", "/api/v1/problems?limit=20", None),
+    "problem_get":   ("GET", lambda rnd: f"/api/v1/problems/p{rnd.randrange(N_PROBLEMS):06d}", None),
+    "learning_path": ("GET", "/api/v1/learning-path/recommend?target=3.5 일차함수의 뜻과 그래프", None),
+    "chat":          ("POST", "/api/v1/chat",
+                      {"messages": [{"role": "user", "content": "일차함수의 기울기는 어떻게 구하나요?"}]}),
+}
+DEFAULT_RPS = {
+    "health": 5, "mongo_health": 1, "neo4j_health": 1,
+    "problems_list": 5, "problem_get": 30, "learning_path": 5, "chat": 5,
+}
+
+# ==================== 앱 기동 ====================
+def boot(args, stack: contextlib.ExitStack):
+    import mongomock
+    os.environ["MONGODB_URI"] = "mongodb://localhost:27017/loadtest"
+    stack.enter_context(mongomock.patch(servers=(("localhost", 27017),)))
+
+    # Mongo: 시드 후 지연/오류 주입 프록시로 교체(v1_db_health 가 _client 를 이름으로 가져가므로 app.main 보다 먼저)
+    from app.db import mongo
+    mongo.problems.drop()
+    mongo.problems.insert_many([{**converted_problem(f"p{i:06d}"), "type": "original"} for i in range(N_PROBLEMS)])
+    mongo_kw = dict(latency=args.mongo_latency, error_rate=args.mongo_error_rate)
+    mongo._client = Flaky(mongo._client, **mongo_kw)
+    mongo.problems = Flaky(mongo.problems, seed=1, **mongo_kw)
+    mongo.generated = Flaky(mongo.generated, seed=2, **mongo_kw)
+    mongo.meta = Flaky(mongo.meta, seed=3, **mongo_kw)
+
+    from app.db import neo4j
+    neo4j._driver = FakeNeo4jDriver(latency=args.neo4j_latency, error_rate=args.neo4j_error_rate)
+
+    fake = stack.enter_context(FakeOpenAI(base_latency=args.openai_latency, error_rate=args.openai_error_rate))
+    from app.core.deps import get_chat_service
+    get_chat_service().client = fake.client()
+
+    from app.main import app
+    if args.threadpool:
+        async def _resize_threadpool():
+            import anyio.to_thread
+            anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+        app.add_event_handler("startup", _resize_threadpool)
+    return app, fake
+
+def _serve_child(args, port: int) -> None:
+    if str(BENCH_DIR) not in sys.path:
+        sys.path.insert(0, str(BENCH_DIR))
+    import uvicorn
+    with contextlib.ExitStack() as stack:
+        app, _ = boot(args, stack)
+        uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")).run()
+
+def serve(args) -> Tuple[str, multiprocessing.Process]:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    proc = multiprocessing.get_context("spawn").Process(target=_serve_child, args=(args, port), daemon=True)
+    proc.start()
+    deadline = time.time() + 30
+    while True:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            break
+        if time.time() > deadline or not proc.is_alive():
+            proc.terminate()
+            raise RuntimeError("app worker did not start")
+        time.sleep(0.1)
+    return f"http://127.0.0.1:{port}", proc
+
+def upstream_llm_calls(base_url: str) -> int:
+    import httpx
+    text = httpx.get(base_url + "/metrics", timeout=10).text
+    return int(sum(float(v) for v in re.findall(r"^llm_request_duration_seconds_count\{[^}]*\} (\S+)$", text, re.M)))
+
+# ==================== 부하 생성 ====================
+async def drive(base_url: str, rps: Dict[str, float], duration: float, timeout: float,
+                seed: int = 0) -> Dict[str, List[Tuple[float, Optional[int]]]]:
+    import httpx
+    results: Dict[str, List[Tuple[float, Optional[int]]]] = {name: [] for name in rps}
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        tasks: List[asyncio.Task] = []
+
+        async def one(name: str, method: str, path: str, body):
+            t0 = time.perf_counter()
+            try:
+                r = await client.request(method, path, json=body)
+                status: Optional[int] = r.status_code
+            except Exception:
+                status = None  # 타임아웃/연결 오류
+            results[name].append((time.perf_counter() - t0, status))
+
+        async def schedule(name: str, rate: float):
+            rnd = random.Random(f"{seed}-{name}")
+            method, path, body = ROUTES[name]
+            start = time.perf_counter()
+            i = 0
+            while True:
+                due = start + i / rate   # open-loop: 응답 지연과 무관하게 일정 간격으로 발사
+                if due - start >= duration:
+                    return
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                p = path(rnd) if callable(path) else path
+                tasks.append(asyncio.create_task(one(name, method, p, body)))
+                i += 1
+
+        await asyncio.gather(*(schedule(n, r) for n, r in rps.items() if r > 0))
+        await asyncio.gather(*tasks)
+    return results
+
+def percentile(xs: List[float], q: float) -> float:
+    if not xs:
+        return float("nan")
+    k = max(0, min(len(xs) - 1, int(round(q / 100 * len(xs) + 0.5)) - 1))
+    return xs[k]
+
+def summarize(results, duration: float) -> Dict[str, dict]:
+    out = {}
+    for name, rows in results.items():
+        lat = sorted(t for t, st in rows if st is not None and st < 500)
+        errors = sum(1 for _, st in rows if st is None or st >= 500)
+        out[name] = {
+            "sent": len(rows),
+            "ok": len(lat),
+            "errors": errors,
+            "throughput_rps": len(lat) / duration,
+            "p50_ms": percentile(lat, 50) * 1000,
+            "p90_ms": percentile(lat, 90) * 1000,
+            "p99_ms": percentile(lat, 99) * 1000,
+            "max_ms": (lat[-1] * 1000) if lat else float("nan"),
+        }
+    return out
+
+def parse_rps(spec: Optional[str]) -> Dict[str, float]:
+    out = {}
+    for part in filter(None, (spec or "").split(",")):
+        name, _, val = part.partition("=")
+        if name not in ROUTES:
+            raise SystemExit(f"unknown route '{name}' (choices: {', '.join(ROUTES)})")
+        out[name] = float(val)
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--duration", type=float, default=20.0, help="부하 구간(초)")
+    ap.add_argument("--rps", default=None, help="라우트별 RPS 덮어쓰기, 예: chat=10,problem_get=100")
+    ap.add_argument("--only", default=None, help="이 라우트들만(쉼표 구분)")
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--threadpool", type=int, default=0, help="anyio 스레드풀 크기(0이면 기본 40)")
+    ap.add_argument("--openai-latency", type=float, default=1.0)
+    ap.add_argument("--openai-error-rate", type=float, default=0.0)
+    ap.add_argument("--mongo-latency", type=float, default=0.003)
+    ap.add_argument("--mongo-error-rate", type=float, default=0.0)
+    ap.add_argument("--neo4j-latency", type=float, default=0.005)
+    ap.add_argument("--neo4j-error-rate", type=float, default=0.0)
+    ap.add_argument("--json", type=Path, default=None, help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    rps = {**DEFAULT_RPS, **parse_rps(args.rps)}
+    if args.only:
+        keep = set(args.only.split(","))
+        rps = {k: v for k, v in rps.items() if k in keep}
+
+    base_url, proc = serve(args)
+    try:
+        results = asyncio.run(drive(base_url, rps, args.duration, args.timeout))
+        upstream = upstream_llm_calls(base_url)
+    finally:
+        proc.terminate()
+        proc.join(5)
+
+    summary = summarize(results, args.duration)
+    print(f"duration={args.duration}s threadpool={args.threadpool or 40} "
+          f"openai={args.openai_latency}s/{args.openai_error_rate:.0%} upstream_llm_requests={upstream}")
+    print(f"{'route':<14} {'rps':>6} {'sent':>6} {'ok':>6} {'err':>5} {'thr/s':>7} "
+          f"{'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for name, s in summary.items():
+        print(f"{name:<14} {rps[name]:>6g} {s['sent']:>6} {s['ok']:>6} {s['errors']:>5} {s['throughput_rps']:>7.1f} "
+              f"{s['p50_ms']:>8.1f}ms {s['p90_ms']:>8.1f}ms {s['p99_ms']:>8.1f}ms {s['max_ms']:>8.1f}ms")
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps({"args": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+                                         "rps": rps, "routes": summary}, indent=2), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/run.py
+"""
+벤치마크 스위트 실행.
+  python benchmarks/run.py                 # 전체
+  python benchmarks/run.py -k ingest       # 이름 필터
+  python benchmarks/run.py --quick         # 입력 축소(스모크)
+결과: benchmarks/results/<commit>.json  → compare.py 로 커밋 간 비교
+실제 mongod 로 재려면 BENCH_MONGODB_URI 를 지정(기본 mongomock).
+"""
+from __future__ import annotations
+import argparse, importlib, json, platform, subprocess, sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / "results"
+for p in (ROOT, BENCH_DIR):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import harness
+
+def git_commit() -> str:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except Exception:
+        return "unknown"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-k", dest="filter", default=None, help="이름에 이 문자열이 포함된 케이스만")
+    ap.add_argument("--quick", action="store_true")
+    ap.add_argument("--out", type=Path, default=None)
+    args = ap.parse_args()
+
+    harness.QUICK = args.quick
+    for mod in sorted(BENCH_DIR.glob("bench_*.py")):
+        importlib.import_module(mod.stem)
+
+    cases = [c for c in harness.CASES if not args.filter or args.filter in c.name]
+    commit = git_commit()
+    results = {}
+    for case in cases:
+        r = harness.run_case(case)
+        results[case.name] = r
+        extra = f"  {r['extra']}" if r["extra"] else ""
+        print(f"{case.name:<48} median {r['median']*1000:10.2f} ms  min {r['min']*1000:10.2f} ms{extra}", flush=True)
+
+    doc = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    out = args.out or RESULTS_DIR / f"{commit}{'-quick' if args.quick else ''}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"-> {out}")
+
+if __name__ == "__main__":
+    main()
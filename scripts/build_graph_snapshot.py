@@ -0,0 +1,35 @@
+# scripts/build_graph_snapshot.py
+"""
+data/neo4j_nodes.csv + neo4j_edges.csv → 교육과정 그래프 스냅샷(app/services/graph_snapshot.py 형식).
+  python scripts/build_graph_snapshot.py                      # out/graph/curriculum_graph.snap
+  python scripts/build_graph_snapshot.py --out /srv/graph.snap
+--out 은 포인터 파일: 본문은 같은 폴더의 버전 파일(<stem>.<version>-<checksum12>.snap)에 쓰고 포인터만 원자적으로 바꾼다.
+실행 중인 워커는 GRAPH_SNAPSHOT_CHECK 초 안에 포인터 변경을 감지해 새 버전 파일을 mmap 한다.
+"""
+from __future__ import annotations
+import argparse, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # app.* 임포트
+
+from app.services.curriculum import EDGES_CSV, NODES_CSV
+from app.services.graph_snapshot import DEFAULT_PATH, GraphSnapshot, build_from_csv, write_snapshot
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", type=Path, default=NODES_CSV)
+    ap.add_argument("--edges", type=Path, default=EDGES_CSV)
+    ap.add_argument("--out", type=Path, default=DEFAULT_PATH)
+    args = ap.parse_args()
+
+    blob, info = build_from_csv(args.nodes, args.edges)
+    target = write_snapshot(args.out, blob)
+    snap = GraphSnapshot.open(args.out)  # 검증 겸 헤더 확인
+    print(f"[OK] snapshot: {args.out} -> {target.name} ({len(blob):,} bytes)")
+    print(f"   nodes={info['nodes']} edges={snap.n_edges} skipped_edges={info['skipped_edges']} "
+          f"version={snap.version} checksum={snap.checksum[:12]}")
+
+if __name__ == "__main__":
+    main()
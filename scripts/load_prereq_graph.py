@@ -1,6 +1,6 @@
 # scripts/load_prereq_graph.py
 from __future__ import annotations
-import os, sys, csv, io, glob
+import os, sys
 from pathlib import Path
 from dotenv import load_dotenv
 from neo4j import GraphDatabase, exceptions as neo4j_exc
@@ -10,59 +10,41 @@ ROOT_DIR = Path(__file__).resolve().parents[1]        # .../AI
 ENV_PATH = ROOT_DIR / ".env"
 DATA_DIR = ROOT_DIR / "data"
 
-# ── 1) .env 로드 ──────────────────────────────────────────────────
-if not ENV_PATH.exists():
-    print(f"❌ .env not found: {ENV_PATH}")
-    sys.exit(1)
-load_dotenv(ENV_PATH)
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))  # app.* 임포트
+from app.services.curriculum import read_csv
 
-AURA_URI  = (os.getenv("AURA_URI") or "").strip()
-AURA_USER = (os.getenv("AURA_USER") or "").strip()
-AURA_PASS = (os.getenv("AURA_PASS") or "").strip()
+# ── 1) .env 로드 + 2) Neo4j 드라이버 & 연결 확인 ─────────────────
+# import 시점에는 연결하지 않음(벤치마크 등에서 함수만 재사용) → __main__ 에서 connect()
+driver = None
 
 def _require_env(k, v):
     if not v:
         print(f"❌ Missing env: {k}")
         sys.exit(1)
 
-_require_env("AURA_URI", AURA_URI)
-_require_env("AURA_USER", AURA_USER)
-_require_env("AURA_PASS", AURA_PASS)
-
-# ── 2) Neo4j 드라이버 & 연결 확인 ────────────────────────────────
-driver = GraphDatabase.driver(AURA_URI, auth=(AURA_USER, AURA_PASS))
-try:
-    driver.verify_connectivity()
-    print("✅ Connected to Neo4j Aura")
-except neo4j_exc.Neo4jError as e:
-    print("❌ Neo4j connectivity error:", e)
-    sys.exit(1)
+def connect():
+    global driver
+    if not ENV_PATH.exists():
+        print(f"❌ .env not found: {ENV_PATH}")
+        sys.exit(1)
+    load_dotenv(ENV_PATH)
 
-# ── 유틸: CSV 인코딩 자동 판별 + DictReader 생성 ────────────────
-def _open_csv_flex(path: Path):
-    encodings = ["utf-8-sig", "utf-8", "cp949", "euc-kr", "latin1"]
-    last_err = None
-    for enc in encodings:
-        try:
-            f = open(path, "r", encoding=enc, newline="")
-            reader = csv.DictReader(f)
-            # fieldnames 평가(헤더 확인)
-            if not reader.fieldnames:
-                raise ValueError("No header found")
-            # BOM 제거/정규화 재시작
-            f.seek(0)
-            return f, enc
-        except Exception as e:
-            last_err = e
-            try:
-                f.close()
-            except:
-                pass
-    raise RuntimeError(f"CSV 인코딩 판별 실패: {path} ({last_err})")
+    aura_uri  = (os.getenv("AURA_URI") or "").strip()
+    aura_user = (os.getenv("AURA_USER") or "").strip()
+    aura_pass = (os.getenv("AURA_PASS") or "").strip()
+    _require_env("AURA_URI", aura_uri)
+    _require_env("AURA_USER", aura_user)
+    _require_env("AURA_PASS", aura_pass)
 
-def _norm_row_keys(d: dict):
-    return { (k.lstrip("\ufeff").strip().lower() if isinstance(k, str) else k): v
-             for k, v in d.items() }
+    driver = GraphDatabase.driver(aura_uri, auth=(aura_user, aura_pass))
+    try:
+        driver.verify_connectivity()
+        print("✅ Connected to Neo4j Aura")
+    except neo4j_exc.Neo4jError as e:
+        print("❌ Neo4j connectivity error:", e)
+        sys.exit(1)
+    return driver
 
 # ── 3) 스키마 제약 ────────────────────────────────────────────────
 def create_constraints():
@@ -78,13 +60,12 @@ def load_nodes(csv_path: Path):
     if not csv_path.exists():
         print(f"❌ nodes CSV not found: {csv_path}")
         sys.exit(1)
-    f, enc_used = _open_csv_flex(csv_path)
+    # 파일을 한 번 읽어 인코딩 후보를 메모리에서 판별(키는 BOM 제거 + 소문자)
+    rows, enc_used = read_csv(csv_path)
     print(f"📄 Nodes CSV encoding detected: {enc_used}")
-    with driver.session() as s, f:
-        reader = csv.DictReader(f)
+    with driver.session() as s:
         cnt = 0
-        for raw in reader:
-            row = _norm_row_keys(raw)
+        for row in rows:
             name  = row.get("concept") or row.get("name")
             unit  = row.get("unit") or ""
             grade = row.get("grade") or ""
@@ -108,13 +89,11 @@ def load_edges(csv_path: Path):
         else:
             print(f"❌ edges CSV not found: {csv_path}")
             sys.exit(1)
-    f, enc_used = _open_csv_flex(csv_path)
+    rows, enc_used = read_csv(csv_path)
     print(f"📄 Edges CSV encoding detected: {enc_used} ({csv_path.name})")
-    with driver.session() as s, f:
-        reader = csv.DictReader(f)
+    with driver.session() as s:
         cnt = 0
-        for raw in reader:
-            row = _norm_row_keys(raw)
+        for row in rows:
             src = row.get("source") or row.get("src")
             dst = row.get("target") or row.get("dst")
             if not src or not dst:
@@ -132,6 +111,7 @@ if __name__ == "__main__":
     nodes_csv = DATA_DIR / "neo4j_nodes.csv"
     edges_csv = DATA_DIR / "neo4j_edges.csv"  # 기본 이름. 없으면 glob로 대체됨
 
+    connect()
     create_constraints()
     load_nodes(nodes_csv)
     load_edges(edges_csv)
@@ -1,35 +1,33 @@
 # scripts/load_to_mongo.py
 from __future__ import annotations
-import os, json, glob, datetime
+import sys, json, glob, datetime
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
-from pymongo import MongoClient, ASCENDING, errors
+from pymongo import errors
 
 # ── 경로 & .env 로드 (AI/.env) ─────────────────────────────
 ROOT = Path(__file__).resolve().parents[1]
 load_dotenv(ROOT / ".env")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # scripts/에서 직접 실행해도 app.* 임포트 가능
 
-MONGODB_URI = os.getenv("MONGODB_URI")
-if not MONGODB_URI:
-    raise RuntimeError("MONGODB_URI가 .env에 없습니다")
-
-client = MongoClient(MONGODB_URI)
-db = client.get_default_database()  # URI에 DB명이 들어있으면 그걸로 선택됨
-
-problems = db["problems"]
-generated = db["generated_problems"]
-
-# ── 인덱스 ────────────────────────────────────────────────
-# 문제 ID 기준 중복 방지
-problems.create_index([("problem_id", ASCENDING)], unique=True, name="u_problem_id")
-# 생성문항은 (origin_problem_id, problem_id) 조합으로 유니크 추천
-generated.create_index([("origin_problem_id", ASCENDING), ("problem_id", ASCENDING)],
-                       unique=True, name="u_origin_problem")
+from app.models.problem import StoredProblem, validate_many
+from app.db.mongo import problems, generated, ensure_indexes, bump_problems_version  # MONGODB_URI 확인/클라이언트 생성 포함
 
 def load_json(p: Path):
     with open(p, "r", encoding="utf-8") as f:
         return json.load(f)
 
+# out/ 에 함께 있지만 문항 파일이 아닌 것(Mathpix 작업 상태, ai_transformer 의 라벨 거부 목록)
+NON_PROBLEM_FILES = {"mathpix_jobs.json", "_rejected.json"}
+
+def is_raw_mathpix(docs: list) -> bool:
+    """변환 전 Mathpix 파싱 결과(question_text 만 있고 korean_problem 없음)."""
+    return bool(docs) and all(
+        isinstance(d, dict) and "question_text" in d and "korean_problem" not in d for d in docs
+    )
+
 def now_iso():
     return datetime.datetime.utcnow().isoformat() + "Z"
 
@@ -40,10 +38,11 @@ def upsert_problem(doc: dict, source_file: str, is_generated: bool):
         # 파일명 기반 fallback 키(권장하지 않지만 임시)
         problem_id = source_file.replace(".json","")
 
+    # 재적재(문서에 이미 있는 값)면 출처/생성 시각 유지
     base = {
         "problem_id": problem_id,
-        "source_file": source_file,
-        "created_at": now_iso(),
+        "source_file": doc.get("source_file") or source_file,
+        "created_at": doc.get("created_at") or now_iso(),
     }
     if is_generated:
         # 원본 참조 키 추출(없으면 problem_id를 그대로 origin으로)
@@ -61,27 +60,49 @@ def upsert_problem(doc: dict, source_file: str, is_generated: bool):
             upsert=True
         )
     else:
-        payload = {**doc, **base, "type": "original"}
+        payload = {**doc, **base, "type": doc.get("type") or "original"}
         problems.update_one(
             {"problem_id": problem_id},
             {"$set": payload},
             upsert=True
         )
 
-def main():
-    out_dir = ROOT / "out"
+def main(out_dir: Optional[Path] = None):
+    ensure_indexes()
+    out_dir = out_dir or ROOT / "out"
     files = sorted(glob.glob(str(out_dir / "*.json")))
     if not files:
         print(f"out 폴더에 JSON이 없습니다: {out_dir}")
         return
 
-    inserted, updated = 0, 0
+    inserted, updated, skipped = 0, 0, 0
+    skipped_files = []
     for fp in files:
         p = Path(fp)
+        if p.name in NON_PROBLEM_FILES:
+            skipped_files.append((p.name, "문항 파일 아님"))
+            continue
         data = load_json(p)
 
         # 파일 형식이 배열/단일 객체 모두 가능
-        docs = data if isinstance(data, list) else [data]
+        raw_docs = data if isinstance(data, list) else [data]
+        if is_raw_mathpix(raw_docs):
+            skipped_files.append((p.name, f"변환 전 Mathpix 결과 {len(raw_docs)}건"))
+            continue
+
+        # 스키마 검증(파일 단위 일괄) → 통과한 문항만 적재
+        valid, bad = validate_many(raw_docs, StoredProblem)
+        if bad:
+            skipped += len(bad)
+            print(f"[WARN] 스키마 불일치 {len(bad)}건 건너뜀: {p.name} (첫 오류: #{bad[0][0]} {bad[0][1].errors()[0]['loc']})")
+        bad_idx = {i for i, _ in bad}
+        # 검증·정규화된 필드를 원본 위에 덮어씀 → 모델에 없는 키(origin/base_problem_id, 기타 메타)도 보존.
+        # exclude_unset: 원본에 없던 기본값(type="original" 등)이 원래 값을 덮지 않도록
+        docs = [
+            {**d, **v.model_dump(by_alias=True, exclude_unset=True)}
+            for d, v in zip((d for i, d in enumerate(raw_docs) if i not in bad_idx), valid)
+        ]
+        print(f"· {p.name}: 유효 {len(docs)}건, 불일치 {len(bad)}건")
 
         # 파일명으로 원본/생성 추정 규칙(원하면 바꾸세요)
         is_generated = p.name.startswith("problem_") or "generated" in p.name.lower()
@@ -108,7 +129,11 @@ def main():
                 upsert_problem(d, p.name, is_generated=is_generated)
                 updated += 1
 
-    print(f"✅ 완료: inserted={inserted}, updated={updated}")
+    # API 프로세스의 문제 캐시 무효화(버전 스탬프 증가)
+    version = bump_problems_version() if inserted or updated else None
+    for name, why in skipped_files:
+        print(f"⏭️ 파일 건너뜀: {name} ({why})")
+    print(f"[OK] 완료: inserted={inserted}, updated={updated}, skipped={skipped}, skipped_files={len(skipped_files)}, version={version}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,33 @@
+# scripts/optimize_images.py
+"""
+out/images 의 문제 그림 전체를 폭별 WebP/PNG 변형으로 최적화하고 out/images/opt/manifest.json 을 다시 쓴다.
+(새로 받는 그림은 sat_mathpix_single 이 바로 처리하므로, 기존 그림 백필/폭 변경 시에 사용)
+
+  python scripts/optimize_images.py
+  python scripts/optimize_images.py --dir out/images --widths 480,960,1440
+"""
+import argparse, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # app.* 임포트
+
+from app.services import images
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dir", type=Path, default=images.IMAGE_DIR)
+    ap.add_argument("--widths", default=",".join(map(str, images.WIDTHS)))
+    args = ap.parse_args()
+    if images.Image is None:
+        raise SystemExit("Pillow 가 설치되어 있지 않습니다: pip install Pillow")
+    widths = [int(w) for w in args.widths.split(",") if w.strip()]
+    manifest = images.optimize_dir(args.dir, widths)
+    src_bytes = sum(e["bytes"] for e in manifest.values())
+    webp_bytes = sum(max((v for v in e["variants"] if v["format"] == "webp"), key=lambda v: v["width"])["bytes"]
+                     for e in manifest.values() if e["variants"])
+    print(f"[OK] {len(manifest)} images, originals {src_bytes:,} B -> largest WebP {webp_bytes:,} B")
+
+if __name__ == "__main__":
+    main()
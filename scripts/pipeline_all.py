@@ -1,5 +1,5 @@
 # AI/scripts/pipeline_all.py
-import os, sys, subprocess
+import os, sys, json, time, subprocess
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, List
@@ -10,6 +10,12 @@ SCRIPTS_DIR = Path(__file__).resolve().parent
 ROOT        = SCRIPTS_DIR.parent
 APP_DIR     = ROOT / "app"
 OUT_ROOT    = ROOT / "out"
+REPORT_PATH = OUT_ROOT / "pipeline_report.json"   # 단계별 소요시간/메트릭 리포트
+METRICS_DIR = OUT_ROOT / "metrics"                # 하위 스크립트 메트릭 스냅샷(METRICS_DUMP_PATH)
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # app.* 임포트
+from app.core.profiling import cprofile_cmd, pipeline_profile_enabled
 
 # .env: 루트 우선 → app/.env
 if (ROOT/".env").exists():
@@ -21,9 +27,24 @@ OPENAI_API_KEY  = os.getenv("OPENAI_API_KEY")
 MATHPIX_APP_ID  = os.getenv("MATHPIX_APP_ID")
 MATHPIX_APP_KEY = os.getenv("MATHPIX_APP_KEY")
 
+def stage_env(stage: str) -> dict:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(ROOT)  # 모듈 임포트 보장
+    # 캡처 파이프 인코딩 고정: Windows(cp949)에서 이모지 print가 UnicodeEncodeError로 죽던 문제
+    env["PYTHONIOENCODING"] = "utf-8"
+    env["METRICS_DUMP_PATH"] = str(METRICS_DIR / f"{stage}.json")
+    return env
+
+def py_cmd(stage: str, *args: str) -> List[str]:
+    """[python, *args]. PIPELINE_PROFILE=1 이면 cProfile로 감싸 out/profiles/pipeline-<stage>-*.prof 생성."""
+    if pipeline_profile_enabled():
+        return cprofile_cmd(sys.executable, stage, list(args))
+    return [sys.executable, *args]
+
 def run(cmd: List[str], cwd: Path = ROOT, env: Optional[dict] = None) -> None:
     print("+", " ".join(cmd))
-    proc = subprocess.run(cmd, cwd=str(cwd), env=env, capture_output=True, text=True)
+    proc = subprocess.run(cmd, cwd=str(cwd), env=env, capture_output=True,
+                          text=True, encoding="utf-8", errors="replace")
     if proc.stdout:
         print(proc.stdout.rstrip())
     if proc.returncode != 0:
@@ -33,15 +54,14 @@ def step_mathpix() -> None:
     if not (MATHPIX_APP_ID and MATHPIX_APP_KEY):
         raise RuntimeError("MATHPIX_APP_ID / MATHPIX_APP_KEY가 .env에 없습니다.")
     # sat_mathpix_single.py가 out/problem.json 또는 out/<PDF>/problems.json 생성한다고 가정
-    run([sys.executable, str(SCRIPTS_DIR / "sat_mathpix_single.py")], cwd=ROOT)
+    run(py_cmd("mathpix", str(SCRIPTS_DIR / "sat_mathpix_single.py")), cwd=ROOT, env=stage_env("mathpix"))
 
 def step_transform() -> None:
     if not OPENAI_API_KEY:
         raise RuntimeError("OPENAI_API_KEY가 .env에 없습니다.")
-    env = os.environ.copy()
-    env["PYTHONPATH"] = str(ROOT)  # 모듈 임포트 보장
+    env = stage_env("transform")
     # ai_transformer는 무인자 실행 시 out/problem(s).json 자동 탐색 → out/converted_with_schema.json 저장
-    run([sys.executable, "-m", "app.services.ai_transformer"], cwd=ROOT, env=env)
+    run(py_cmd("transform", "-m", "app.services.ai_transformer"), cwd=ROOT, env=env)
 
 def ensure_outputs() -> None:
     """최소 산출물 점검: out/problem.json 또는 out/**/problems.json, 그리고 out/converted_with_schema.json"""
@@ -55,8 +75,39 @@ def ensure_outputs() -> None:
     if not (p3.exists() or p3_list):
         raise FileNotFoundError("변환 산출물이 없습니다. out/converted_with_schema.json 또는 out/**/converted_with_schema.json 이 생성되어야 합니다.")
 
+def run_stage(report: dict, name: str, fn) -> None:
+    """fn 실행 시간을 재고, 하위 스크립트가 남긴 메트릭 스냅샷을 리포트에 붙인다."""
+    snap = METRICS_DIR / f"{name}.json"
+    if snap.exists():
+        snap.unlink()
+    entry = {"stage": name, "started_at": datetime.now(timezone.utc).isoformat(), "ok": False}
+    report["stages"].append(entry)
+    t0 = time.perf_counter()
+    try:
+        fn()
+        entry["ok"] = True
+    except Exception as e:
+        entry["error"] = repr(e)[:500]
+        raise
+    finally:
+        entry["seconds"] = round(time.perf_counter() - t0, 3)
+        if snap.exists():
+            try:
+                entry["metrics"] = json.loads(snap.read_text(encoding="utf-8"))
+            except ValueError:
+                pass
+
+def write_report(report: dict) -> None:
+    report["total_seconds"] = round(sum(s["seconds"] for s in report["stages"]), 3)
+    REPORT_PATH.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[timing] {'stage':<10} {'seconds':>9}  ok")
+    for st in report["stages"]:
+        print(f"[timing] {st['stage']:<10} {st['seconds']:>9.3f}  {st['ok']}")
+    print(f"[timing] report -> {REPORT_PATH}")
+
 def main() -> None:
     OUT_ROOT.mkdir(parents=True, exist_ok=True)
+    report = {"started_at": datetime.now(timezone.utc).isoformat(), "stages": []}
 
     # 간단한 락으로 중복 실행 방지
     lock = OUT_ROOT / ".pipeline.lock"
@@ -68,15 +119,17 @@ def main() -> None:
         lock.write_text("running", encoding="utf-8")
 
         print("=== [1/2] Mathpix 변환 ===")
-        step_mathpix()
+        run_stage(report, "mathpix", step_mathpix)
 
         print("=== [2/2] OpenAI 변환 ===")
-        step_transform()
+        run_stage(report, "transform", step_transform)
 
-        ensure_outputs()
+        run_stage(report, "check", ensure_outputs)
         print("✅ 파이프라인 완료 (out/problem.json & out/converted_with_schema.json)")
         print("ok")
     finally:
+        if report["stages"]:
+            write_report(report)
         try:
             if lock.exists():
                 lock.unlink()
@@ -84,4 +137,6 @@ def main() -> None:
             pass
 
 if __name__ == "__main__":
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(errors="replace")  # cp949 콘솔에서 출력 불가 문자는 치환
     main()
@@ -1,9 +1,13 @@
 # sat_mathpix_single.py
-import os, time, re, json
+import os, sys, time, re, json, hashlib, tempfile
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 
@@ -14,6 +18,11 @@ BASE_DIR = Path(__file__).resolve().parent
 
 ROOT = Path(__file__).resolve().parent.parent
 load_dotenv(ROOT / ".env")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # app.* 임포트
+
+from app.core.metrics import MATHPIX_POLL, MATHPIX_WAIT
+from app.services import images as image_opt
 
 APP_ID  = os.getenv("MATHPIX_APP_ID")
 APP_KEY = os.getenv("MATHPIX_APP_KEY")
@@ -30,6 +39,59 @@ OUT_DIR.mkdir(parents=True, exist_ok=True)
 IMG_DIR.mkdir(parents=True, exist_ok=True)
 
 HEADERS = {"app_id": APP_ID.strip(), "app_key": APP_KEY.strip()}
+API_URL = "https://api.mathpix.com/v3/pdf"
+
+# 모든 Mathpix/이미지 요청은 keep-alive 세션 하나로(연결 재사용).
+# GET 은 일시 오류(429/5xx/연결 끊김)에 백오프 재시도, 업로드(POST)는 재시도하지 않음.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                       max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                                         allowed_methods=frozenset({"GET"}), raise_on_status=False))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+
+# 작업 상태 저장소: PDF SHA-256 → {pdf, pdf_id, status, markdown, images, updated_at}
+# status: submitted(업로드 완료, 변환 대기) → completed(변환 완료) → downloaded(마크다운 저장)
+#         error(Mathpix 처리 오류 또는 빈 마크다운, 다음 실행에서 재업로드)
+# 재실행 시 downloaded 면 저장된 마크다운을 바로 쓰고, submitted/completed 면 같은 pdf_id 로 이어서 진행
+# (그 pdf_id 가 Mathpix 에서 만료돼 404 면 재업로드).
+JOBS_PATH = OUT_DIR / "mathpix_jobs.json"
+MD_DIR    = OUT_DIR / "mathpix"
+
+def pdf_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_jobs() -> dict:
+    try:
+        return json.loads(JOBS_PATH.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        print(f"[jobs] {JOBS_PATH.name} 손상 → 새로 시작")
+        return {}
+
+def save_job(sha: str, **fields) -> dict:
+    """sha 의 작업 상태를 갱신하고 파일 전체를 원자적으로 다시 쓴다(중간에 죽어도 이전 상태 유지)."""
+    jobs = load_jobs()
+    job = {**jobs.get(sha, {}), **fields, "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    jobs[sha] = job
+    fd, tmp = tempfile.mkstemp(dir=OUT_DIR, prefix=JOBS_PATH.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(jobs, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, JOBS_PATH)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return job
 
 
 # 업로드 / 폴링 / 다운로드
@@ -45,39 +107,93 @@ def submit_pdf_for_markdown(pdf_path: Path) -> str:
     with pdf_path.open("rb") as f:
         files = {"file": (pdf_path.name, f, "application/pdf")}
         data  = {"options_json": json.dumps(options)}
-        r = requests.post("https://api.mathpix.com/v3/pdf",
-                          headers=HEADERS, files=files, data=data, timeout=120)
+        r = SESSION.post(API_URL, headers=HEADERS, files=files, data=data, timeout=120)
     print("[upload]", r.status_code, r.text[:300])
     r.raise_for_status()
     return r.json()["pdf_id"]
 
 def poll_result(pdf_id: str, interval=4, timeout=900) -> None:
-    url = f"https://api.mathpix.com/v3/pdf/{pdf_id}"
+    url = f"{API_URL}/{pdf_id}"
     t0 = time.time()
     while True:
-        r = requests.get(url, headers=HEADERS, timeout=30)
+        tp = time.perf_counter()
+        r = SESSION.get(url, headers=HEADERS, timeout=30)
+        MATHPIX_POLL.observe(time.perf_counter() - tp, status=str(r.status_code))
         r.raise_for_status()
         st = r.json().get("status")
         if st in ("completed", "error"):
+            MATHPIX_WAIT.observe(time.time() - t0, outcome=st)
             if st == "error":
                 raise RuntimeError(f"Mathpix 처리 오류: {r.text[:300]}")
             return
         if time.time() - t0 > timeout:
+            MATHPIX_WAIT.observe(time.time() - t0, outcome="timeout")
             raise TimeoutError(f" 변환 대기 초과(pdf_id={pdf_id})")
         print(f"[poll] status={st} ...")
         time.sleep(interval)
 
 def get_pdf_markdown(pdf_id: str) -> str:
     # .md 우선, 없으면 .mmd
-    url_md = f"https://api.mathpix.com/v3/pdf/{pdf_id}.md"
-    r = requests.get(url_md, headers=HEADERS, timeout=120)
+    r = SESSION.get(f"{API_URL}/{pdf_id}.md", headers=HEADERS, timeout=120)
     if r.status_code == 200 and r.text.strip():
         return r.text
-    url_mmd = f"https://api.mathpix.com/v3/pdf/{pdf_id}.mmd"
-    r = requests.get(url_mmd, headers=HEADERS, timeout=120)
+    r = SESSION.get(f"{API_URL}/{pdf_id}.mmd", headers=HEADERS, timeout=120)
     r.raise_for_status()
     return r.text
 
+def convert_pdf(pdf_path: Path) -> tuple:
+    """
+    PDF → (마크다운, sha256). 작업 상태 저장소를 보고
+    저장된 마크다운 재사용 > 기존 pdf_id 로 폴링/다운로드 재개 > 새로 업로드 순으로 진행.
+    """
+    sha = pdf_sha256(pdf_path)
+    job = load_jobs().get(sha, {})
+    md_rel = job.get("markdown")
+    if job.get("status") == "downloaded" and md_rel and (OUT_DIR / md_rel).exists():
+        print(f"[resume] 변환된 마크다운 재사용: {md_rel} (pdf_id={job.get('pdf_id')})")
+        return (OUT_DIR / md_rel).read_text(encoding="utf-8"), sha
+
+    pdf_id: Optional[str] = job.get("pdf_id") if job.get("status") in ("submitted", "completed") else None
+    md_text: Optional[str] = None
+    if pdf_id:
+        print(f"[resume] pdf_id={pdf_id} status={job['status']} → 이어서 진행")
+        try:
+            if job["status"] == "submitted":
+                try:
+                    poll_result(pdf_id)
+                except RuntimeError:
+                    save_job(sha, status="error")
+                    raise
+                save_job(sha, status="completed")
+            md_text = get_pdf_markdown(pdf_id)
+        except requests.HTTPError as e:
+            # 폴링이든 다운로드든 pdf_id 가 Mathpix 에서 만료됐으면 처음부터
+            if e.response is None or e.response.status_code != 404:
+                raise
+            print(f"[resume] pdf_id={pdf_id} 를 찾을 수 없음(만료) → 재업로드")
+            save_job(sha, pdf_id=None, status="error")
+            pdf_id = None
+    if not pdf_id:
+        pdf_id = submit_pdf_for_markdown(pdf_path)
+        save_job(sha, pdf=pdf_path.name, pdf_id=pdf_id, status="submitted", markdown=None)
+        try:
+            poll_result(pdf_id)   # 타임아웃이면 submitted 로 남아 다음 실행에서 이어서 폴링
+        except RuntimeError:
+            save_job(sha, status="error")
+            raise
+        save_job(sha, status="completed")
+        md_text = get_pdf_markdown(pdf_id)
+
+    if not md_text.strip():
+        # 빈 결과로 completed 에 머물면 매번 같은 빈 마크다운만 받으므로 다음 실행에서 재업로드
+        save_job(sha, status="error", markdown=None)
+        return md_text, sha
+    MD_DIR.mkdir(parents=True, exist_ok=True)
+    md_path = MD_DIR / f"{sha}.md"
+    md_path.write_text(md_text, encoding="utf-8")
+    save_job(sha, status="downloaded", markdown=_to_rel_from_out(md_path))
+    return md_text, sha
+
 
 # 파싱 유틸 (정규식/도우미)
 IMG_MD_RE   = re.compile(r'!\[(?P<alt>[^\]]*)\]\((?P<src>[^)]+)\)')
@@ -97,7 +213,9 @@ def _to_rel_from_out(p: Path) -> str:
 def download_image(url: str, dst_dir: Path) -> Path:
     name = os.path.basename(urlparse(url).path) or f"img_{int(time.time()*1000)}.png"
     out = dst_dir / name
-    r = requests.get(url, timeout=60)
+    if out.exists() and out.stat().st_size > 0:   # 재실행: 이미 받은 이미지
+        return out
+    r = SESSION.get(url, timeout=60)
     r.raise_for_status()
     out.write_bytes(r.content)
     return out
@@ -110,8 +228,20 @@ def strip_meta(md: str) -> str:
     md = re.sub(r'(?mi)^\s*##\s*Question Difficulty\s*:[^\n]*\n?', '', md)  # 헤더형 난이도 제거(본문용)
     return md.strip()
 
+def optimize_figure(local: Path) -> list:
+    """받은 그림 → 폭별 WebP/PNG 변형(메타데이터 제거) + manifest 등록. Pillow 없거나 실패하면 []."""
+    try:
+        variants = image_opt.optimize_image(local, IMG_DIR / image_opt.OPT_SUBDIR)
+    except OSError as e:
+        print(f"[images] 최적화 실패 {local.name}: {e}")
+        return []
+    if variants:
+        image_opt.update_manifest(IMG_DIR, {local.name: {"bytes": local.stat().st_size, "variants": variants}})
+    return [{"src": _to_rel_from_out(IMG_DIR / image_opt.OPT_SUBDIR / v["file"]),
+             **{k: v[k] for k in ("format", "width", "height", "bytes")}} for v in variants]
+
 def extract_images(md: str):
-    """마크다운에서 이미지 수집(중복 제거), 로컬 저장, question_text에서는 모두 제거."""
+    """마크다운에서 이미지 수집(중복 제거), 로컬 저장(+ 최적화 변형), question_text에서는 모두 제거."""
     seen = set()
     imgs = []
     for m in IMG_MD_RE.finditer(md):
@@ -123,7 +253,11 @@ def extract_images(md: str):
         if src.startswith("http"):
             try:
                 local = download_image(src, IMG_DIR)
-                imgs.append({"alt": alt, "src": _to_rel_from_out(local)})
+                img = {"alt": alt, "src": _to_rel_from_out(local)}
+                variants = optimize_figure(local)
+                if variants:
+                    img["variants"] = variants
+                imgs.append(img)
             except Exception:
                 pass
     # 본문에서 모든 이미지 태그 제거
@@ -198,15 +332,14 @@ def parse_single_question(md_text: str, problem_id: str, origin_pdf: str):
 def main():
     if not PDF_PATH.exists():
         raise FileNotFoundError(f"❌ PDF가 없습니다: {PDF_PATH}")
-    pdf_id = submit_pdf_for_markdown(PDF_PATH)
-    poll_result(pdf_id)
-    md_text = get_pdf_markdown(pdf_id)
+    md_text, sha = convert_pdf(PDF_PATH)
     if not md_text.strip():
         raise RuntimeError("변환된 마크다운이 비어 있습니다.")
     # 한 문서 = 한 문항
     obj = parse_single_question(md_text, problem_id="6d99b141", origin_pdf=PDF_PATH.name)
     out_path = OUT_DIR / "problem.json"
     out_path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_job(sha, images=[img["src"] for img in obj["images"]], output=_to_rel_from_out(out_path))
     print(f"[OK] Saved 1 problem to {out_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+# tests/conftest.py
+"""app.db.mongo 는 임포트 시점에 접속하므로 수집 전에 mongomock 으로 바꿔 둔다(.env 의 실제 DB를 쓰지 않음)."""
+import os
+
+import mongomock
+import pytest
+
+os.environ["MONGODB_URI"] = "mongodb://localhost:27017/test"
+_patch = mongomock.patch(servers=(("localhost", 27017),))
+_patch.start()
+
+def pytest_unconfigure(config):
+    _patch.stop()
+
+@pytest.fixture
+def mongo():
+    """app.db.mongo 모듈(컬렉션을 비운 상태)."""
+    from app.db import mongo as m
+    for coll in (m.problems, m.generated, m.meta, m.student_mastery):
+        coll.drop()
+    yield m
@@ -0,0 +1,73 @@
+# tests/test_admission.py
+
+import asyncio, threading
+
+import anyio.to_thread
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1_db_health import router as health_router
+from app.core import admission
+from app.core.admission import AdmissionMiddleware
+from app.core.metrics import ADMISSION_REQUESTS
+
+def _client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+def test_saturated_route_is_shed_with_retry_after():
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.post("/api/v1/chat")
+    async def chat():
+        await release.wait()
+        return {"ok": True}
+
+    app.add_middleware(AdmissionMiddleware, limits={"/api/v1/chat": 1}, queues={"/api/v1/chat": 0})
+
+    async def main():
+        before = ADMISSION_REQUESTS.value(route="/api/v1/chat", outcome="queue_full")
+        async with _client(app) as c:
+            first = asyncio.create_task(c.post("/api/v1/chat"))
+            await asyncio.sleep(0.05)    # 첫 요청이 슬롯을 잡고 대기
+            shed = await c.post("/api/v1/chat")
+            release.set()
+            ok = await first
+        return before, shed, ok
+
+    before, shed, ok = asyncio.run(main())
+    assert ok.status_code == 200
+    assert shed.status_code == 503
+    assert int(shed.headers["retry-after"]) >= 1
+    detail = shed.json()["detail"]
+    assert detail["code"] == "OVERLOADED" and "queue_full" in detail["message"]
+    assert ADMISSION_REQUESTS.value(route="/api/v1/chat", outcome="queue_full") == before + 1
+
+def test_priority_lane_works_while_default_pool_is_exhausted(monkeypatch, mongo):
+    monkeypatch.setattr(admission, "_priority", None)
+    release = threading.Event()
+    app = FastAPI()
+    app.include_router(health_router)
+
+    @app.get("/block")
+    def block():          # sync → 기본 스레드풀 스레드를 잡고 있음
+        release.wait(5)
+        return {}
+
+    async def main():
+        admission.configure(threadpool=1, priority_threads=1)
+        async with _client(app) as c:
+            blocked = asyncio.create_task(c.get("/block"))
+            await asyncio.sleep(0.05)
+            try:
+                with pytest.raises(asyncio.TimeoutError):   # 기본 풀은 꽉 참
+                    await asyncio.wait_for(anyio.to_thread.run_sync(lambda: None), 0.2)
+                health = await asyncio.wait_for(c.get("/api/health/mongo"), 2)
+            finally:
+                release.set()
+            await blocked
+        return health
+
+    health = asyncio.run(main())
+    assert health.status_code == 200 and health.json() == {"ok": True}
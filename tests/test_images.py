@@ -0,0 +1,21 @@
+# tests/test_images.py
+
+import os
+
+from app.services.images import ImageStore
+
+def test_etag_cache_keeps_one_entry_per_file_and_is_bounded(tmp_path):
+    store = ImageStore(tmp_path, etag_cache=2)
+    a = tmp_path / "a.png"
+    a.write_bytes(b"old")
+    old = store.content_etag(a)
+    a.write_bytes(b"new!")
+    os.utime(a, ns=(0, a.stat().st_mtime_ns + 1))   # mtime 해상도가 거친 파일시스템에서도 바뀌도록
+    new = store.content_etag(a)
+    assert new != old and len(store._etags) == 1        # 교체된 파일은 항목을 덮어씀
+
+    for name in ("b.png", "c.png"):
+        (tmp_path / name).write_bytes(name.encode())
+        store.content_etag(tmp_path / name)
+    assert list(store._etags) == [str(tmp_path / "b.png"), str(tmp_path / "c.png")]
+    assert store.content_etag(a) == new                  # 밀려난 뒤에도 다시 계산해 같은 값
@@ -0,0 +1,79 @@
+# tests/test_mastery_store.py
+
+import mongomock
+import numpy as np
+import pytest
+
+from app.services.graph_snapshot import SnapshotHandle
+from app.services.learning_path import LearningPathService
+from app.services.mastery_store import MasteryConflict, MasteryStore
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+@pytest.fixture
+def graph(tmp_path):
+    return SnapshotHandle(tmp_path / "graph.snap", check_interval=3600)
+
+def _store(db):
+    return MasteryStore(db.student_mastery, db.meta)
+
+def test_save_is_compare_and_set(db):
+    store = _store(db)
+    row = np.zeros((1, 2), dtype=np.float32)
+    assert store.save("c", ["a", "b"], ["s1"], row, {}) == []
+    groups, versions = store.load(["s1"])
+    assert versions == {"s1": 1}
+
+    other = _store(db)   # 다른 워커가 먼저 씀
+    assert other.save("c", ["a", "b"], ["s1"], row + 0.5, versions) == []
+    assert store.save("c", ["a", "b"], ["s1"], row + 0.9, versions) == ["s1"]
+    assert store.save("c", ["a", "b"], ["s1"], row + 0.9, {}) == ["s1"]   # 새 학생 insert 경합도 충돌
+
+    groups, versions = store.load(["s1"])
+    (sids, values), = groups.values()
+    assert versions == {"s1": 2} and values[0, 0] == pytest.approx(0.5)
+
+def test_legacy_document_without_version(db):
+    db.student_mastery.insert_one({"_id": "s1", "graph": "c", "values": np.zeros(2, "<f4").tobytes()})
+    store = _store(db)
+    _, versions = store.load(["s1"])
+    assert versions == {"s1": None}
+    assert store.save("c", ["a", "b"], ["s1"], np.ones((1, 2), np.float32), versions) == []
+    assert db.student_mastery.find_one({"_id": "s1"})["version"] == 1
+
+def test_concurrent_worker_update_is_not_lost(db, graph):
+    concept = graph.get().name(0)
+    other = LearningPathService(graph=graph, store=_store(db))
+
+    class Racing(MasteryStore):
+        """첫 save 직전에 다른 워커가 같은 학생 답안을 반영."""
+        raced = False
+
+        def save(self, *args, **kw):
+            if not self.raced:
+                self.raced = True
+                other.record_answers([("s1", concept, True)])
+            return super().save(*args, **kw)
+
+    svc = LearningPathService(graph=graph, store=Racing(db.student_mastery, db.meta))
+    svc.record_answers([("s1", concept, True)])
+
+    both = LearningPathService(graph=graph)   # 저장소 없이 같은 답안 두 개를 순서대로
+    both.record_answers([("s1", concept, True)])
+    both.record_answers([("s1", concept, True)])
+    assert svc.mastery("s1") == both.mastery("s1")
+    assert db.student_mastery.find_one({"_id": "s1"})["version"] == 2
+
+def test_conflict_gives_up_after_retries(db, graph):
+    concept = graph.get().name(0)
+
+    class AlwaysStale(MasteryStore):
+        def save(self, checksum, names, student_ids, values, versions):
+            return list(student_ids)
+
+    svc = LearningPathService(graph=graph, store=AlwaysStale(db.student_mastery, db.meta))
+    with pytest.raises(MasteryConflict) as e:
+        svc.record_answers([("s1", concept, True)])
+    assert e.value.student_ids == ["s1"]
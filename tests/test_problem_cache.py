@@ -0,0 +1,69 @@
+# tests/test_problem_cache.py
+
+import json
+
+from app.services.problem_cache import CachedProblemRepository, ProblemCache
+from app.services.problem_repository import ProblemRepository
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def _doc(problem_id: str, text: str = "문항") -> dict:
+    return {
+        "problem_id": problem_id,
+        "type": "original",
+        "korean_problem": text,
+        "english_problem": "problem",
+        "korean_solution": "풀이",
+        "english_solution": "solution",
+        "choices": {"A": "1", "B": "2", "C": "3", "D": "4"},
+        "answer": "C",
+        "curriculum": {"대단원": "함수", "소단원": "일차함수", "학년": "중학교 2학년"},
+        "difficulty": "Easy",
+    }
+
+def test_max_bytes_evicts_least_recently_used():
+    cache = ProblemCache(max_items=100, max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"     # a 를 최근 사용으로
+    cache.put("c", b"cccc")              # 12 bytes > 10 → 가장 오래 안 쓴 b 제거
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    stats = cache.stats()
+    assert stats["bytes"] == 8 and stats["evictions"] == 1
+
+def test_item_larger_than_max_bytes_is_not_cached():
+    cache = ProblemCache(max_bytes=4)
+    cache.put("a", b"aaaaa")
+    assert cache.get("a") is None and cache.stats()["bytes"] == 0
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = ProblemCache(ttl=5.0, clock=clock)
+    cache.put("a", b"x")
+    clock.now = 5.0
+    assert cache.get("a") == b"x"
+    clock.now = 5.1
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1 and stats["items"] == 0
+
+def test_version_bump_invalidates(mongo):
+    clock = Clock()
+    mongo.problems.insert_one(_doc("p1", "옛 문항"))
+    repo = CachedProblemRepository(ProblemRepository(mongo.problems, mongo.generated), ProblemCache(),
+                                   version_fn=mongo.problems_version, version_check_interval=5.0, clock=clock)
+    assert json.loads(repo.get_json("p1"))["korean_problem"] == "옛 문항"
+
+    mongo.problems.replace_one({"problem_id": "p1"}, _doc("p1", "새 문항"))
+    mongo.bump_problems_version()
+    clock.now = 1.0      # 확인 주기 전: 캐시된 값
+    assert json.loads(repo.get_json("p1"))["korean_problem"] == "옛 문항"
+    clock.now = 5.0      # 버전 스탬프가 바뀐 것을 보고 비움
+    assert json.loads(repo.get_json("p1"))["korean_problem"] == "새 문항"
+    assert repo.cache.stats()["invalidations"] == 1
@@ -0,0 +1,39 @@
+# tests/test_profiling.py
+
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.profiling import SamplingProfiler
+
+def _spin(seconds: float) -> None:
+    t = time.perf_counter()
+    while time.perf_counter() - t < seconds:
+        pass
+
+def test_sync_endpoint_is_sampled_in_worker_thread():
+    profiler = SamplingProfiler(0.001)
+    sessions = []
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def profile(request: Request, call_next):
+        session, token = profiler.begin()
+        try:
+            return await call_next(request)
+        finally:
+            profiler.end(session, token)
+            sessions.append(session)
+
+    @app.get("/busy")
+    def busy_endpoint():
+        _spin(0.1)
+        return {}
+
+    with TestClient(app) as c:
+        assert c.get("/busy").status_code == 200
+    doc = sessions[0].to_speedscope("busy")
+    names = {f["name"] for f in doc["shared"]["frames"]}
+    assert "busy_endpoint" in names
+    assert any("worker" in p["name"].lower() for p in doc["profiles"])
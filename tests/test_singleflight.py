@@ -0,0 +1,102 @@
+# tests/test_singleflight.py
+
+import asyncio, threading, time
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+class Boom(RuntimeError):
+    pass
+
+def test_exception_reaches_every_waiter():
+    sf = SingleFlight("test")
+    gate = threading.Event()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        gate.wait(5)
+        raise Boom("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            sf.do("k", fail)
+        except Boom as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for t in threads:
+        t.start()
+        time.sleep(0.01)   # 첫 스레드가 리더가 된 뒤 나머지가 합류
+    gate.set()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert len(errors) == 4 and all(e is errors[0] for e in errors)
+
+def test_async_exception_reaches_every_waiter():
+    sf = SingleFlight("test")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise Boom("upstream down")
+
+    async def main():
+        return await asyncio.gather(*(sf.do_async("k", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(calls) == 1 and all(isinstance(r, Boom) for r in results)
+
+def test_entry_is_cleared_after_the_leader_finishes():
+    sf = SingleFlight("test")
+    calls = []
+
+    def ok():
+        calls.append(1)
+        return len(calls)
+
+    assert sf.do("k", ok) == 1
+    assert sf.in_flight() == 0
+    assert sf.do("k", ok) == 2          # 결과를 캐시하지 않음 → 다시 실행
+
+    def fail():
+        raise Boom()
+
+    with pytest.raises(Boom):
+        sf.do("e", fail)
+    assert sf.in_flight() == 0
+    assert sf.do("e", ok) == 3          # 실패한 키도 다음 호출은 새로 실행
+
+def test_cancelled_waiter_does_not_cancel_the_leader():
+    sf = SingleFlight("test")
+    calls = []
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def upstream():
+            calls.append(1)
+            await gate.wait()
+            return "done"
+
+        leader = asyncio.create_task(sf.do_async("k", upstream))
+        waiter = asyncio.create_task(sf.do_async("k", upstream))
+        late = asyncio.create_task(sf.do_async("k", upstream))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        leader.cancel()                 # 리더 요청이 끊겨도 업스트림 호출은 계속
+        await asyncio.sleep(0.01)
+        gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await late
+
+    assert asyncio.run(main()) == "done"
+    assert len(calls) == 1 and sf.in_flight() == 0